@@ -0,0 +1,14 @@
+"""
+Benchmark suite for the rainfall and pool modules.
+
+Builds seeded synthetic databases (1-100 years of daily rainfall,
+thousands of pool tests) in a temp directory and times the DB methods,
+moisture recompute, dashboard/table paths, classification, app startup
+(time to first paint) and the migration scripts. Results are written as JSON so runs from different
+commits can be compared:
+
+    python -m benchmarks --out before.json
+    python -m benchmarks --out after.json --compare before.json
+
+UI benchmarks are recorded as skipped when no display is available.
+"""
@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from core.db_connection import close_all
+
+from . import (bench_backup, bench_charts, bench_migrations, bench_pool, bench_rainfall,
+               bench_search, bench_startup)
+from .harness import BenchmarkRun, compare, tk_root
+from .synthetic import create_database, pool_test_rows, rainfall_rows
+
+GROUPS = ["rainfall", "pool", "migration", "startup", "charts", "search", "backup"]
+
+
+def parse_args(argv):
+    p = argparse.ArgumentParser(prog="python -m benchmarks")
+    p.add_argument("--years", type=int, nargs="+", default=[1, 10, 100],
+                   help="rainfall history lengths to benchmark (default: 1 10 100)")
+    p.add_argument("--pool-tests", type=int, nargs="+", default=[1000, 5000],
+                   help="pool test counts to benchmark (default: 1000 5000)")
+    p.add_argument("--chart-points", type=int, nargs="+", default=[100_000, 1_000_000],
+                   help="synthetic series lengths for the chart benchmarks (default: 100000 1000000)")
+    p.add_argument("--notes", type=int, nargs="+", default=[10_000, 100_000],
+                   help="note corpus sizes for the search benchmarks (default: 10000 100000)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--only", nargs="+", choices=GROUPS,
+                   help="run only these groups")
+    p.add_argument("--out", default="benchmark_results.json")
+    p.add_argument("--compare", metavar="BASELINE_JSON",
+                   help="print the ratio of each result against an earlier run")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    groups = set(args.only or GROUPS)
+    run = BenchmarkRun(repeat=args.repeat, seed=args.seed)
+    root = tk_root() if groups & {"rainfall", "pool", "startup", "charts"} else None
+
+    with tempfile.TemporaryDirectory(prefix="hm_bench_") as tmp:
+        for years in args.years:
+            rows = rainfall_rows(years, seed=args.seed)
+            print(f"Rainfall: {years} years ({len(rows)} days)")
+            db_path = create_database(os.path.join(tmp, f"rain_{years}y.db"), rows, [])
+            if "rainfall" in groups:
+                bench_rainfall.run_all(run, db_path, len(rows), root)
+            if "migration" in groups:
+                bench_migrations.run_rainfall(run, tmp, rows, len(rows))
+            if "startup" in groups:
+                bench_startup.run_startup(run, db_path, len(rows), root is not None)
+            if "backup" in groups:
+                bench_backup.run_all(run, db_path, tmp, len(rows))
+
+        for count in args.pool_tests:
+            rows = pool_test_rows(count, seed=args.seed)
+            print(f"Pool: {count} tests")
+            db_path = create_database(os.path.join(tmp, f"pool_{count}.db"), [], rows)
+            if "pool" in groups:
+                bench_pool.run_all(run, db_path, count, root)
+            if "migration" in groups:
+                bench_migrations.run_pool(run, tmp, rows, count)
+
+        if "charts" in groups:
+            for points in args.chart_points:
+                print(f"Charts: {points} points")
+                bench_charts.run_all(run, points, root)
+
+        if "search" in groups:
+            for count in args.notes:
+                print(f"Search: {count} notes")
+                bench_search.run_all(run, tmp, count)
+
+        # Release the temp databases before the directory is removed
+        close_all()
+
+    if root is not None:
+        root.destroy()
+
+    run.write(args.out)
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(baseline, run.to_json())))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
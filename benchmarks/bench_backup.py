@@ -0,0 +1,56 @@
+#---------------------------------------------------------------------
+# BACKUP BENCHMARKS
+# core.backup copies of a rainfall database, and how long writes from
+# another thread wait while a backup runs.
+#---------------------------------------------------------------------
+
+import itertools
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from core.backup import backup_database, check_integrity
+from core.db_connection import get_connection
+
+from .harness import BenchmarkRun
+
+GROUP = "backup"
+WRITE_PAUSE = 0.002   # seconds between the concurrent writer's commits
+
+
+def run_all(run: BenchmarkRun, db_path: str, tmp: str, size: int):
+    backup_dir = os.path.join(tmp, f"backups_{size}")
+    stamps = (datetime(2000, 1, 1) + timedelta(seconds=i) for i in itertools.count())
+
+    def backup(**kwargs):
+        return backup_database(db_path, backup_dir, keep=1, now=next(stamps), **kwargs)
+
+    run.time(GROUP, "backup_database (page-stepped)", backup, size)
+    run.time(GROUP, "backup_database (one step)", lambda: backup(pages=-1, sleep=0), size)
+    result = backup()
+    run.time(GROUP, "integrity_check", lambda: check_integrity(result.db_file), size)
+
+    # Commits from another thread while a backup runs
+    waits = []
+    stop = threading.Event()
+
+    def writer():
+        conn = get_connection(db_path)
+        i = 0
+        while not stop.is_set():
+            t = time.perf_counter()
+            with conn:
+                conn.execute("UPDATE rainfall SET notes = ? WHERE id = ?",
+                             (f"bench {i}", 1 + i % 100))
+            waits.append(time.perf_counter() - t)
+            i += 1
+            time.sleep(WRITE_PAUSE)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    concurrent = backup()
+    stop.set()
+    thread.join()
+    run.record(GROUP, "write during backup (max)", max(waits), size)
+    run.record(GROUP, "backup with concurrent writes", concurrent.seconds, size)
@@ -0,0 +1,102 @@
+#---------------------------------------------------------------------
+# CHART BENCHMARKS
+# LTTB, decimation levels and TimeSeriesChart pan/zoom frames over a
+# synthetic daily series.
+#---------------------------------------------------------------------
+
+import math
+import random
+from array import array
+from datetime import date
+
+from modules.charts.lttb import lttb
+from modules.charts.series import BARS, LINE, DecimatedSeries
+
+from .harness import BenchmarkRun
+
+GROUP = "charts"
+PLOT_WIDTH = 1000     # pixels
+FRAMES = 50
+
+
+def _series(points: int, seed: int):
+    rng = random.Random(seed)
+    start = date(1000, 1, 1).toordinal()
+    days = array("d", range(start, start + points))
+    rain = array("d", (rng.expovariate(1 / 6.0) if rng.random() < 0.35 else 0.0
+                       for _ in range(points)))
+    moisture = array("d", (10 + 5 * math.sin(i / 300) + rng.random() for i in range(points)))
+    return days, rain, moisture
+
+
+def _gestures(series: DecimatedSeries, rng: random.Random):
+    """FRAMES views of a zoom-in sweep followed by pans at a close zoom."""
+    lo, hi = series.x_range
+    views = []
+    span = hi - lo
+    for _ in range(FRAMES // 2):
+        span = max(span * 0.8, 30.0)
+        mid = lo + (hi - lo) / 2
+        views.append((mid - span / 2, mid + span / 2))
+    x0 = lo + rng.random() * (hi - lo - span)
+    for _ in range(FRAMES - FRAMES // 2):
+        x0 = min(max(lo, x0 + rng.choice((-0.05, 0.05)) * span), hi - span)
+        views.append((x0, x0 + span))
+    return views
+
+
+def run_all(run: BenchmarkRun, points: int, root=None):
+    days, rain, moisture = _series(points, run.seed)
+    rng = random.Random(run.seed)
+
+    run.time(GROUP, "lttb (to plot width)", lambda: lttb(days, moisture, PLOT_WIDTH * 2),
+             points, repeat=1)
+
+    def build(mode, ys):
+        s = DecimatedSeries(days, ys, mode)
+        s.build_levels()
+        return s
+
+    run.time(GROUP, "build_levels (line)", lambda: build(LINE, moisture), points, repeat=1)
+    run.time(GROUP, "build_levels (bars)", lambda: build(BARS, rain), points, repeat=1)
+
+    line = build(LINE, moisture)
+    bars = build(BARS, rain)
+    lo, hi = line.x_range
+    run.time(GROUP, "window (all)", lambda: (line.window(lo, hi, PLOT_WIDTH),
+                                             bars.window(lo, hi, PLOT_WIDTH)), points)
+    views = _gestures(line, rng)
+
+    def windows():
+        for x0, x1 in views:
+            line.window(x0, x1, PLOT_WIDTH)
+            bars.window(x0, x1, PLOT_WIDTH)
+
+    run.time(GROUP, "window (pan/zoom frame)", windows, points, ops=len(views))
+
+    # Whole frames on a real canvas
+    names = ["render (pan/zoom frame)", "render (worst frame)"]
+    if root is None:
+        for name in names:
+            run.skip(GROUP, name, "no display", points)
+        return
+    from modules.charts.chart import ChartLayer, TimeSeriesChart
+
+    chart = TimeSeriesChart(root)
+    chart.canvas.configure(width=PLOT_WIDTH + 112, height=300)
+    chart.pack()
+    root.update()
+    chart.set_layers([ChartLayer(bars, "#1E90FF", "Rain"),
+                      ChartLayer(line, "#8B4513", "Moisture", axis="right")])
+    worst = []
+
+    def frames():
+        for x0, x1 in views:
+            chart.set_view(x0, x1)
+            chart.render()
+            worst.append(chart.ms_per_frame())
+        root.update_idletasks()
+
+    run.time(GROUP, names[0], frames, points, ops=len(views))
+    run.record(GROUP, names[1], max(worst) / 1000, points)
+    chart.destroy()
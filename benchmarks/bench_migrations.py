@@ -0,0 +1,64 @@
+#---------------------------------------------------------------------
+# MIGRATION BENCHMARKS
+# scripts/migration_*.py against synthetic CSV / Excel sources.
+#---------------------------------------------------------------------
+
+import contextlib
+import importlib.util
+import io
+import itertools
+import os
+
+from .harness import BenchmarkRun
+from .synthetic import PROJECT_ROOT, write_pool_workbook, write_rainfall_csv
+
+GROUP = "migration"
+
+
+def load_script(name: str):
+    """Import scripts/<name>.py as a module (scripts/ is not a package)."""
+    path = os.path.join(PROJECT_ROOT, "scripts", f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_rainfall(run: BenchmarkRun, tmp: str, rain_rows, size: int):
+    script = load_script("migration_rainfall")
+    csv_path = os.path.join(tmp, f"rain_data_{size}.csv")
+    write_rainfall_csv(csv_path, rain_rows)
+    counter = itertools.count()
+
+    def fresh_db():
+        # New file per repeat: connections are shared per path
+        script.DB_PATH = os.path.join(tmp, f"migrate_rain_{size}_{next(counter)}.db")
+        script.ensure_tables()
+
+    def migrate():
+        with contextlib.redirect_stdout(io.StringIO()):
+            script.migrate_rainfall(csv_path)
+
+    run.time(GROUP, "migrate_rainfall", migrate, size, ops=len(rain_rows), setup=fresh_db)
+
+
+def run_pool(run: BenchmarkRun, tmp: str, pool_rows, size: int):
+    try:
+        script = load_script("migration_pool_tests")
+    except ImportError as exc:
+        run.skip(GROUP, "migrate_pool_tests", f"import failed: {exc}", size)
+        return
+
+    script.EXCEL_PATH = os.path.join(tmp, f"pool_{size}.xlsx")
+    write_pool_workbook(script.EXCEL_PATH, pool_rows, script.SHEET_NAME)
+    counter = itertools.count()
+
+    def fresh_db():
+        script.DB_PATH = os.path.join(tmp, f"migrate_pool_{size}_{next(counter)}.db")
+        script.ensure_pool_tests_table()
+
+    def migrate():
+        with contextlib.redirect_stdout(io.StringIO()):
+            script.migrate_pool_tests()
+
+    run.time(GROUP, "migrate_pool_tests", migrate, size, ops=len(pool_rows), setup=fresh_db)
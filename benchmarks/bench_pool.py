@@ -0,0 +1,174 @@
+#---------------------------------------------------------------------
+# POOL BENCHMARKS
+# PoolTestDB methods, DesiredRanges, classification and PoolTestsTab.
+#---------------------------------------------------------------------
+
+import random
+from datetime import date, timedelta
+
+from core.db_connection import get_connection
+from modules.pool.classifier import CompiledClassifier
+from modules.pool.desired_ranges import DesiredRanges
+from modules.pool.pool_test import PoolTest
+from modules.pool.pool_test_db import PoolTestDB
+from modules.pool.schedule import next_planned_test_date, planned_calendar
+
+from .harness import BenchmarkRun, drain
+
+GROUP = "pool"
+WRITE_OPS = 100
+LOAD_OPS = 1000
+
+
+def _new_tests(n: int):
+    start = date(2200, 1, 6)
+    return [
+        PoolTest(start + timedelta(days=7 * i), 2.0, 0.1, 2.1, 5000, 100, 7.5,
+                 40, 200, 0.1, 0.1, "bench", "")
+        for i in range(n)
+    ]
+
+
+def run_db(run: BenchmarkRun, db_path: str, size: int):
+    db = PoolTestDB(db_path)
+    rng = random.Random(run.seed)
+
+    ids = [r[0] for r in get_connection(db_path).execute("SELECT id FROM pool_tests")]
+    sample_ids = [rng.choice(ids) for _ in range(LOAD_OPS)]
+    sample_tests = [db.load(i) for i in rng.sample(ids, min(WRITE_OPS, len(ids)))]
+    new_tests = _new_tests(WRITE_OPS)
+
+    run.time(GROUP, "list_all", db.list_all, size)
+    run.time(GROUP, "load", lambda: [db.load(i) for i in sample_ids], size, ops=LOAD_OPS)
+    run.time(GROUP, "list_page (first)", db.list_page, size)
+    mid = db.list_page(limit=max(1, len(ids) // 2))[-1]
+    run.time(GROUP, "list_page (middle)", lambda: db.list_page((mid.test_date, mid.id)), size)
+    run.time(GROUP, "list_page_with_status (first)", db.list_page_with_status, size)
+    run.time(GROUP, "iter_range (1 year)",
+             lambda: list(db.iter_range(mid.test_date - timedelta(days=365), mid.test_date)),
+             size)
+    tests = db.list_all()
+    run.time(GROUP, "packed_statuses (stored)", lambda: db.packed_statuses(tests), size,
+             ops=len(tests))
+    run.time(GROUP, "list_out_of_range", db.list_out_of_range, size)
+    run.time(GROUP, "list_out_of_range (pH)", lambda: db.list_out_of_range("pH"), size)
+    run.time(GROUP, "next_due_date", db.next_due_date, size)
+    run.time(GROUP, "list_due_between (1 week)",
+             lambda: db.list_due_between(mid.test_date, mid.test_date + timedelta(days=6)), size)
+
+    inserted = []
+
+    def insert_new():
+        inserted[:] = [db.insert(t) for t in new_tests]
+
+    def delete_inserted():
+        for i in inserted:
+            db.delete(i)
+        inserted.clear()
+
+    run.time(GROUP, "insert", insert_new, size, ops=WRITE_OPS, setup=delete_inserted)
+    run.time(GROUP, "update", lambda: [db.update(t.id, t) for t in sample_tests],
+             size, ops=len(sample_tests))
+
+    def reinsert():
+        delete_inserted()
+        insert_new()
+
+    run.time(GROUP, "delete", delete_inserted, size, ops=WRITE_OPS, setup=reinsert)
+
+    # Bulk writes: one transaction each
+    def clear_future():
+        with get_connection(db_path) as conn:
+            conn.execute("DELETE FROM pool_tests WHERE test_date >= ?",
+                         (new_tests[0].test_date.isoformat(),))
+
+    run.time(GROUP, "insert_many", lambda: db.insert_many(new_tests), size,
+             ops=WRITE_OPS, setup=clear_future)
+    run.time(GROUP, "upsert_many (all new)", lambda: db.upsert_many(new_tests), size,
+             ops=WRITE_OPS, setup=clear_future)
+    run.time(GROUP, "upsert_many (all existing)", lambda: db.upsert_many(new_tests), size,
+             ops=WRITE_OPS)
+    clear_future()
+
+
+def run_classification(run: BenchmarkRun, db_path: str, size: int):
+    run.time(GROUP, "DesiredRanges.load", lambda: DesiredRanges(db_path).load(), size)
+
+    ranges = DesiredRanges(db_path).load()
+    tests = PoolTestDB(db_path).list_all()
+
+    def classify():
+        for t in tests:
+            t.apply_ranges(ranges)
+
+    run.time(GROUP, "apply_ranges (all tests)", classify, size, ops=len(tests))
+    run.time(GROUP, "CompiledClassifier()", lambda: CompiledClassifier(ranges), size)
+    classifier = CompiledClassifier(ranges)
+    run.time(GROUP, "classify_tests (all tests)", lambda: classifier.classify_tests(tests),
+             size, ops=len(tests))
+
+    dates = [t.test_date for t in tests]
+    run.time(GROUP, "PoolTest() (next_test_date)",
+             lambda: [PoolTest(d, 2.0, 0.1, 2.1, 5000, 100, 7.5, 40, 200, 0.1, 0.1) for d in dates],
+             size, ops=len(dates))
+
+    def next_dates_uncached():
+        next_planned_test_date.cache_clear()
+        for d in dates:
+            next_planned_test_date(d)
+
+    run.time(GROUP, "next_planned_test_date (uncached)", next_dates_uncached, size,
+             ops=len(dates))
+    run.time(GROUP, "planned_calendar (10 years)",
+             lambda: planned_calendar(date(2025, 1, 7), date(2034, 12, 31)), size)
+
+
+def run_tab(run: BenchmarkRun, db_path: str, size: int, root):
+    names = ["PoolTestsTab()", "_refresh_table", "grid render (per row)"]
+    if root is None:
+        for name in names:
+            run.skip(GROUP, name, "no display", size)
+        return
+    try:
+        from modules.pool.pool_tab import PoolTestsTab
+    except ImportError as exc:
+        for name in names:
+            run.skip(GROUP, name, f"import failed: {exc}", size)
+        return
+
+    db = PoolTestDB(db_path)
+    ranges = DesiredRanges(db_path).load()
+    tabs = []
+
+    def build():
+        tabs.append(PoolTestsTab(root, db, ranges))
+        drain(root, tabs[-1].bridge)
+        root.update_idletasks()
+
+    run.time(GROUP, names[0], build, size, repeat=1)
+    tab = tabs[-1]
+
+    def refresh():
+        tab._refresh_table()
+        drain(root, tab.bridge)
+        root.update_idletasks()
+
+    run.time(GROUP, names[1], refresh, size)
+
+    # Per-row cost of drawing the visible window, and proof that repeated
+    # refreshes reuse the same canvas items
+    grid = tab.grid_view
+    items = grid.item_count()
+    refresh()
+    run.record(GROUP, names[2], grid.ms_per_row() / 1000, size)
+    if grid.item_count() != items:
+        print(f"  warning: grid canvas items grew from {items} to {grid.item_count()}")
+
+    for t in tabs:
+        t.destroy()
+
+
+def run_all(run: BenchmarkRun, db_path: str, size: int, root=None):
+    run_db(run, db_path, size)
+    run_classification(run, db_path, size)
+    run_tab(run, db_path, size, root)
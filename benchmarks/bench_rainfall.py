@@ -0,0 +1,210 @@
+#---------------------------------------------------------------------
+# RAINFALL BENCHMARKS
+# RainfallDB methods, rollups, moisture recompute and the RainFallTab paths.
+#---------------------------------------------------------------------
+
+import math
+import random
+from datetime import date, timedelta
+
+from core.db_connection import get_connection
+from modules.rainfall.dashboard_state import DashboardState
+from modules.rainfall.moisture import MoistureEngine
+from modules.rainfall.rainfall_db import RainfallDB, RainfallRecord
+from modules.rainfall.rainfall_store import RainfallStore
+from modules.rainfall.rollups import RainfallRollupDB, rebuild_rollups
+
+from .harness import BenchmarkRun, drain
+
+GROUP = "rainfall"
+WRITE_OPS = 100
+LOAD_OPS = 1000
+
+FUTURE = date(2200, 1, 1)   # dates the write benchmarks add and remove
+
+
+def _future_records(n: int):
+    return [
+        RainfallRecord(FUTURE + timedelta(days=i), 1.0, None, "bench", "No", 5.0)
+        for i in range(n)
+    ]
+
+
+def run_db(run: BenchmarkRun, db_path: str, size: int):
+    db = RainfallDB(db_path)
+    rng = random.Random(run.seed)
+
+    ids = [r[0] for r in get_connection(db_path).execute("SELECT id FROM rainfall")]
+    sample_ids = [rng.choice(ids) for _ in range(LOAD_OPS)]
+    records = db.list_all()
+    sample_records = [rng.choice(records) for _ in range(WRITE_OPS)]
+    future = _future_records(WRITE_OPS)
+
+    # --- Reads ---
+    run.time(GROUP, "RainfallDB()", lambda: RainfallDB(db_path), size)
+    run.time(GROUP, "list_all", db.list_all, size)
+    run.time(GROUP, "list_rows", db.list_rows, size)
+    run.time(GROUP, "load", lambda: [db.load(i) for i in sample_ids], size, ops=LOAD_OPS)
+    run.time(GROUP, "missing_ranges", db.missing_ranges, size)
+    run.time(GROUP, "compute_missing_dates", db.compute_missing_dates, size)
+    run.time(GROUP, "missing_day_count", db.missing_day_count, size)
+    run.time(GROUP, "last_rain_date", db.last_rain_date, size)
+    run.time(GROUP, "last_watering_date", db.last_watering_date, size)
+    # The indexed SQL equivalent of the dashboard figures
+    run.time(GROUP, "dashboard queries",
+             lambda: (db.last_watering_date(), db.last_rain_date(), db.missing_day_count()),
+             size)
+
+    # --- Writes (each leaves the table as it found it) ---
+    def clear_future():
+        db.apply_changes([], [r.date for r in future])
+
+    def insert_future():
+        return [db.insert(r) for r in future]
+
+    run.time(GROUP, "insert", insert_future, size, ops=WRITE_OPS, setup=clear_future)
+    run.time(GROUP, "upsert_by_date",
+             lambda: [db.upsert_by_date(r) for r in sample_records], size, ops=WRITE_OPS)
+    run.time(GROUP, "update",
+             lambda: [db.update(r.id, r) for r in sample_records], size, ops=WRITE_OPS)
+
+    inserted = []
+
+    def setup_delete():
+        clear_future()
+        inserted[:] = insert_future()
+
+    run.time(GROUP, "delete", lambda: [db.delete(i) for i in inserted],
+             size, ops=WRITE_OPS, setup=setup_delete)
+    run.time(GROUP, "delete_by_date", lambda: [db.delete_by_date(r.date) for r in future],
+             size, ops=WRITE_OPS, setup=setup_delete)
+    run.time(GROUP, "apply_changes (1y edit)",
+             lambda: db.apply_changes(records[-365:], [r.date for r in future]),
+             size, ops=len(records[-365:]) + WRITE_OPS, setup=setup_delete)
+    run.time(GROUP, "sync_records", lambda: db.sync_records(records), size,
+             setup=setup_delete)
+
+
+def run_rollups(run: BenchmarkRun, db_path: str, size: int):
+    rollups = RainfallRollupDB(db_path)
+    first, last = get_connection(db_path).execute(
+        "SELECT MIN(date), MAX(date) FROM rainfall"
+    ).fetchone()
+    first, last = date.fromisoformat(first), date.fromisoformat(last)
+
+    run.time(GROUP, "rollups monthly (all)", rollups.monthly, size)
+    run.time(GROUP, "rollups weekly (last year)",
+             lambda: rollups.weekly(last - timedelta(days=365), last), size)
+    run.time(GROUP, "rollups span (all, ragged ends)",
+             lambda: rollups.span(first + timedelta(days=3), last - timedelta(days=3)), size)
+    run.time(GROUP, "rollups span (90 days)",
+             lambda: rollups.span(last - timedelta(days=90), last), size)
+
+    # The Python sum the rollups replace
+    def python_total():
+        return sum(r.effective_mm() or 0.0 for r in RainfallDB(db_path).list_all())
+
+    run.time(GROUP, "list_all + sum (no rollups)", python_total, size)
+
+    def rebuild_all():
+        with get_connection(db_path) as conn:
+            rebuild_rollups(conn)
+
+    run.time(GROUP, "rebuild_rollups (all)", rebuild_all, size)
+
+
+def run_moisture(run: BenchmarkRun, db_path: str, size: int):
+    rows = RainfallDB(db_path).list_rows()
+    engine = MoistureEngine(10.0, 7)
+
+    run.time(GROUP, "RainfallStore.from_rows", lambda: RainfallStore.from_rows(rows), size)
+
+    store = RainfallStore.from_rows(rows)
+    run.time(GROUP, "engine.compute", lambda: engine.compute(store.eff, store.watered), size)
+
+    def invalidate():
+        for i in range(len(store)):
+            store.moisture[i] = math.nan
+
+    run.time(GROUP, "engine.recompute_all", lambda: engine.recompute_all(store), size,
+             setup=invalidate)
+
+    # A single edit in the middle of a fully computed history
+    engine.recompute_all(store)
+    mid = len(store) // 2
+
+    def edit_mid():
+        store.eff[mid] = 0.0 if store.eff[mid] else 25.0
+
+    run.time(GROUP, "engine.propagate (1 edit)", lambda: engine.propagate(store, mid), size,
+             setup=edit_mid)
+
+    # What _update_dashboard reads (runs without a display)
+    run.time(GROUP, "DashboardState()", lambda: DashboardState(store), size)
+    state = DashboardState(store)
+    run.time(GROUP, "DashboardState.facts", state.facts, size)
+
+    def edit_and_refresh():
+        edit_mid()
+        state.row_changed(mid)
+        return state.facts()
+
+    run.time(GROUP, "DashboardState (1 edit + facts)", edit_and_refresh, size)
+
+
+def run_tab(run: BenchmarkRun, db_path: str, size: int, root):
+    names = ["RainFallTab()", "_update_dashboard", "_update_dashboard (params)",
+             "_recompute_all", "_refresh_table"]
+    if root is None:
+        for name in names:
+            run.skip(GROUP, name, "no display", size)
+        return
+    try:
+        import modules.rainfall.rainfall_tab as rainfall_tab
+    except ImportError as exc:
+        for name in names:
+            run.skip(GROUP, name, f"import failed: {exc}", size)
+        return
+
+    import tkinter as tk
+
+    tabs = []
+
+    def build():
+        tab = rainfall_tab.RainFallTab(root, db_path)
+        drain(root, tab.bridge)   # rows load on a DB thread
+        root.update_idletasks()
+        tabs.append(tab)
+
+    run.time(GROUP, names[0], build, size, repeat=1)
+    tab = tabs[-1]
+
+    def dashboard():
+        tab._update_dashboard()
+        drain(root, tab.bridge)
+
+    run.time(GROUP, names[1], dashboard, size)
+
+    def toggle_threshold():
+        value = 12.0 if float(tab.entry_threshold.get()) != 12.0 else 10.0
+        tab.entry_threshold.delete(0, tk.END)
+        tab.entry_threshold.insert(0, str(value))
+
+    run.time(GROUP, names[2], dashboard, size, setup=toggle_threshold)
+    run.time(GROUP, names[3], tab._recompute_all, size)
+
+    def refresh():
+        tab._refresh_table()
+        root.update_idletasks()
+
+    run.time(GROUP, names[4], refresh, size)
+
+    for t in tabs:
+        t.destroy()
+
+
+def run_all(run: BenchmarkRun, db_path: str, size: int, root=None):
+    run_db(run, db_path, size)
+    run_rollups(run, db_path, size)
+    run_moisture(run, db_path, size)
+    run_tab(run, db_path, size, root)
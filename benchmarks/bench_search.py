@@ -0,0 +1,70 @@
+#---------------------------------------------------------------------
+# SEARCH BENCHMARKS
+# NotesSearchDB queries and the notes_fts trigger cost, over rainfall
+# histories where every day carries a note.
+#---------------------------------------------------------------------
+
+import random
+from datetime import date, timedelta
+
+from core.db_connection import get_connection
+from modules.search.notes_search import NotesSearchDB
+
+from .harness import BenchmarkRun
+from .synthetic import create_database
+
+GROUP = "search"
+QUERY_OPS = 100
+WRITE_OPS = 100
+
+COMMON = ["watered", "garden", "lawn", "rain", "storm", "heavy", "light", "drizzle",
+          "morning", "evening", "overnight", "gutters", "tank", "full", "dry", "hot"]
+RARE_WORD = "hailstones"     # on ~1 row in 10,000
+
+
+def _note(rng: random.Random) -> str:
+    words = rng.sample(COMMON, 6)
+    if rng.random() < 0.0001:
+        words[rng.randrange(6)] = RARE_WORD
+    return " ".join(words)
+
+
+def notes_rows(count: int, seed: int):
+    """`count` consecutive days of rainfall rows, each with a note."""
+    rng = random.Random(seed)
+    start = date(1900, 1, 1)
+    return [((start + timedelta(days=i)).isoformat(), rng.random() * 5, None,
+             _note(rng), "No", None) for i in range(count)]
+
+
+def run_all(run: BenchmarkRun, tmp: str, count: int):
+    db_path = create_database(f"{tmp}/notes_{count}.db", notes_rows(count, run.seed), [])
+    db = NotesSearchDB(db_path)
+    conn = get_connection(db_path)
+
+    def repeat(fn, *args):
+        return lambda: [fn(*args) for _ in range(QUERY_OPS)]
+
+    run.time(GROUP, "search (rare word)", repeat(db.search, RARE_WORD), count, ops=QUERY_OPS)
+    run.time(GROUP, "search (two words)", repeat(db.search, "storm gutters"), count,
+             ops=QUERY_OPS)
+    run.time(GROUP, "search (prefix as typed)", repeat(db.search, "overn"), count,
+             ops=QUERY_OPS)
+
+    # The scan it replaces
+    like = "SELECT id, notes FROM rainfall WHERE notes LIKE ? LIMIT 50"
+    run.time(GROUP, "LIKE scan (rare word)",
+             repeat(lambda: conn.execute(like, (f"%{RARE_WORD}%",)).fetchall()),
+             count, ops=QUERY_OPS)
+
+    # Trigger cost per edited note
+    ids = [r[0] for r in conn.execute("SELECT id FROM rainfall")]
+    rng = random.Random(run.seed)
+    sample = rng.sample(ids, min(WRITE_OPS, len(ids)))
+
+    def edit_notes():
+        with conn:
+            for i in sample:
+                conn.execute("UPDATE rainfall SET notes = ? WHERE id = ?", (_note(rng), i))
+
+    run.time(GROUP, "edit note (trigger)", edit_notes, count, ops=len(sample))
@@ -0,0 +1,40 @@
+#---------------------------------------------------------------------
+# STARTUP BENCHMARK
+# HomeMaintenanceApp time-to-first-paint and first-tab build.
+#---------------------------------------------------------------------
+
+from core.timing import PhaseTimer
+
+from .harness import BenchmarkRun
+
+GROUP = "startup"
+NAMES = ["time to first paint", "build tab: Rainfall", "first paint + first tab"]
+
+
+def run_startup(run: BenchmarkRun, db_path: str, size: int, has_display: bool):
+    if not has_display:
+        for name in NAMES:
+            run.skip(GROUP, name, "no display", size)
+        return
+    try:
+        import main
+    except ImportError as exc:
+        for name in NAMES:
+            run.skip(GROUP, name, f"import failed: {exc}", size)
+        return
+
+    timer = PhaseTimer()
+
+    def start():
+        app = main.HomeMaintenanceApp(timer, db_path=db_path)
+        while timer.first_paint_ms is None:   # first tab is built in the same callback
+            app.update()
+        app.destroy()
+
+    result = run.time(GROUP, NAMES[2], start, size, repeat=1)
+    if timer.first_paint_ms is not None:
+        run.record(GROUP, NAMES[0], timer.first_paint_ms / 1000, size)
+    for name, _start, duration in timer.phases:
+        if name == NAMES[1]:
+            run.record(GROUP, name, duration / 1000, size)
+    return result
@@ -0,0 +1,162 @@
+#---------------------------------------------------------------------
+# BENCHMARK HARNESS
+# Timing, result collection and JSON output / comparison.
+#---------------------------------------------------------------------
+
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .synthetic import PROJECT_ROOT
+
+
+class BenchmarkRun:
+    """
+    Collects timings as flat result dicts:
+
+        {"group", "name", "size", "ops", "repeat", "best_s", "mean_s", "per_op_us"}
+
+    Skipped benchmarks are recorded with "skipped": <reason> so a missing
+    display or optional dependency shows up in the JSON instead of
+    silently shrinking it.
+    """
+
+    def __init__(self, repeat: int = 3, seed: int = 42, verbose: bool = True):
+        self.repeat = repeat
+        self.seed = seed
+        self.verbose = verbose
+        self.results: List[dict] = []
+
+    # ------------------------------------------------------------
+    # Timing
+    # ------------------------------------------------------------
+    def time(self, group: str, name: str, fn: Callable[[], object],
+             size: Optional[int] = None, ops: int = 1,
+             repeat: Optional[int] = None,
+             setup: Optional[Callable[[], object]] = None) -> dict:
+        """
+        Time fn() `repeat` times (setup() runs untimed before each call)
+        and record the best and mean wall time. `ops` is how many logical
+        operations one call performs, for the per-op figure.
+        """
+        timings = []
+        for _ in range(repeat or self.repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        result = {
+            "group": group,
+            "name": name,
+            "size": size,
+            "ops": ops,
+            "repeat": len(timings),
+            "best_s": best,
+            "mean_s": statistics.fmean(timings),
+            "per_op_us": best / ops * 1e6,
+        }
+        self.results.append(result)
+        if self.verbose:
+            print(f"  {group:<10} {name:<34} size={size!s:<8} "
+                  f"best {best * 1000:10.3f} ms  ({result['per_op_us']:10.2f} us/op)")
+        return result
+
+    def record(self, group: str, name: str, seconds: float, size: Optional[int] = None) -> dict:
+        """Record a duration measured elsewhere (e.g. a startup phase)."""
+        result = {
+            "group": group, "name": name, "size": size, "ops": 1, "repeat": 1,
+            "best_s": seconds, "mean_s": seconds, "per_op_us": seconds * 1e6,
+        }
+        self.results.append(result)
+        if self.verbose:
+            print(f"  {group:<10} {name:<34} size={size!s:<8} "
+                  f"      {seconds * 1000:10.3f} ms")
+        return result
+
+    def skip(self, group: str, name: str, reason: str, size: Optional[int] = None):
+        self.results.append({"group": group, "name": name, "size": size, "skipped": reason})
+        if self.verbose:
+            print(f"  {group:<10} {name:<34} size={size!s:<8} skipped: {reason}")
+
+    # ------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------
+    def meta(self) -> dict:
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": self.seed,
+            "repeat": self.repeat,
+        }
+
+    def to_json(self) -> dict:
+        return {"meta": self.meta(), "results": self.results}
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, indent=2)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _key(result: dict) -> tuple:
+    return (result["group"], result["name"], result["size"])
+
+
+def compare(baseline: dict, current: dict, threshold: float = 1.10) -> List[str]:
+    """
+    Lines comparing best times of two result files (baseline first);
+    entries slower than `threshold` x baseline are flagged.
+    """
+    old: Dict[tuple, dict] = {_key(r): r for r in baseline["results"] if "best_s" in r}
+    lines = [
+        f"baseline {baseline['meta'].get('commit')}  ->  current {current['meta'].get('commit')}"
+    ]
+    for r in current["results"]:
+        if "best_s" not in r or _key(r) not in old:
+            continue
+        ratio = r["best_s"] / old[_key(r)]["best_s"] if old[_key(r)]["best_s"] else float("inf")
+        flag = "  SLOWER" if ratio > threshold else ""
+        lines.append(
+            f"  {r['group']:<10} {r['name']:<34} size={r['size']!s:<8} x{ratio:6.2f}{flag}"
+        )
+    return lines
+
+
+def tk_root():
+    """A withdrawn Tk root for the UI benchmarks, or None without a display."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.withdraw()
+    return root
+
+
+def drain(root, bridge):
+    """Pump the Tk loop until every DB result queued on a TkBridge has landed."""
+    while bridge.busy:
+        root.update()
+        time.sleep(0.001)
@@ -0,0 +1,194 @@
+#---------------------------------------------------------------------
+# SYNTHETIC DATA
+# Seeded, reproducible rainfall and pool-test datasets for benchmarks.
+#---------------------------------------------------------------------
+
+import csv
+import os
+import random
+from datetime import date, datetime, timedelta
+from typing import List
+
+from core.db_connection import get_connection
+from core.migrations import ensure_schema
+from modules.pool.next_test_date import next_planned_test_date
+from modules.rainfall.rollups import deferred_rollups
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+END_DATE = date(2025, 12, 31)
+
+# Same values as scripts/insert_ranges.py
+DEFAULT_RANGES = [
+    ("Free Chlorine (ppm)", 1.0, 3.0, 0.10),
+    ("Combined Chlorine (ppm)", 0.0, 0.2, 0.10),
+    ("Total Chlorine (ppm)", 1.0, 3.2, 0.10),
+    ("Salt Level (ppm)", 4000, 6000, 0.10),
+    ("Alkalinity (ppm)", 80, 120, 0.10),
+    ("pH", 7.2, 7.8, 0.10),
+    ("Sunscreen (Stabiliser) (ppm)", 30, 50, 0.10),
+    ("Total Hardness (ppm)", 150, 250, 0.10),
+    ("Phosphates (ppm)", 0, 0.2, 0.20),
+    ("Copper Total (ppm)", 0, 0.2, 0.10),
+]
+
+POOL_INSERT_SQL = """
+    INSERT INTO pool_tests (
+        test_date, free_chlorine, combined_chlorine, total_chlorine,
+        salt_level, alkalinity, ph, sunscreen, hardness, phosphates, copper,
+        clarity_notes, actions_taken, next_test_date
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Header row expected by scripts/migration_pool_tests.py
+POOL_SHEET_HEADERS = [
+    "Date",
+    "Free Chlorine (ppm)",
+    "Combined Chlorine (ppm)",
+    "Total Chlorine (ppm)",
+    "Salt Level (ppm)",
+    "Alkalinity (ppm)",
+    "pH",
+    "Sunscreen (Stabiliser) (ppm)",
+    "Total Hardness (ppm)",
+    "Phosphates (ppm)",
+    "Copper Total (ppm)",
+    "Water Clarity Notes",
+    "Actions Taken (Chemicals Added, Adjustments, etc.)",
+    "Next Planned Test Date",
+]
+
+
+# ------------------------------------------------------------
+# Rainfall
+# ------------------------------------------------------------
+def rainfall_rows(years: int, seed: int = 42, end: date = END_DATE,
+                  gap_rate: float = 0.01) -> List[tuple]:
+    """
+    Daily (date, rain_mm, bom_mm, notes, watered, moisture) rows covering
+    `years` years up to `end`. About `gap_rate` of days are left out, a
+    few rows have no readings at all, and moisture is left uncomputed.
+    """
+    rng = random.Random(seed)
+    start = end - timedelta(days=round(years * 365.25) - 1)
+    rows = []
+    day = start
+    while day <= end:
+        if rng.random() >= gap_rate:
+            r = rng.random()
+            if r < 0.02:
+                rain = None
+            elif r < 0.65:
+                rain = 0.0
+            else:
+                rain = round(rng.expovariate(1 / 6.0), 1)
+            bom = round(rng.expovariate(1 / 6.0), 1) if rng.random() < 0.3 else None
+            notes = "synthetic" if rng.random() < 0.01 else ""
+            watered = "Yes" if rng.random() < 0.08 else "No"
+            rows.append((day.isoformat(), rain, bom, notes, watered, None))
+        day += timedelta(days=1)
+    return rows
+
+
+def write_rainfall_csv(path: str, rows: List[tuple]):
+    """Write rows in the legacy rain_data.csv layout."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Date", "Rain_mm", "BOM_mm", "Notes", "Watered", "Moisture"])
+        for d_str, rain, bom, notes, watered, moisture in rows:
+            w.writerow([
+                d_str,
+                "" if rain is None else rain,
+                "" if bom is None else bom,
+                notes,
+                watered,
+                "" if moisture is None else moisture,
+            ])
+
+
+# ------------------------------------------------------------
+# Pool tests
+# ------------------------------------------------------------
+def pool_test_rows(count: int, seed: int = 42, end: date = END_DATE) -> List[tuple]:
+    """
+    `count` pool tests, every 3-10 days back from `end`, as tuples in
+    POOL_INSERT_SQL column order. Readings scatter around the desired
+    ranges so every classification band is hit.
+    """
+    rng = random.Random(seed)
+
+    def around(low, high, spread=0.3):
+        span = (high - low) or 0.1
+        return round(rng.uniform(low - spread * span, high + spread * span), 2)
+
+    days = []
+    day = end
+    for _ in range(count):
+        days.append(day)
+        day -= timedelta(days=rng.randint(3, 10))
+    days.reverse()
+
+    rows = []
+    for d in days:
+        rows.append((
+            d.isoformat(),
+            around(1.0, 3.0),
+            max(0.0, around(0.0, 0.2)),
+            around(1.0, 3.2),
+            around(4000, 6000),
+            around(80, 120),
+            around(7.2, 7.8),
+            around(30, 50),
+            around(150, 250),
+            max(0.0, around(0.0, 0.2)),
+            max(0.0, around(0.0, 0.2)),
+            "Clear" if rng.random() < 0.9 else "Cloudy",
+            "Added chlorine" if rng.random() < 0.3 else "",
+            next_planned_test_date(d).isoformat(),
+        ))
+    return rows
+
+
+def write_pool_workbook(path: str, rows: List[tuple], sheet_name: str = "Pool Test Log"):
+    """Write rows as the Excel pool test log (requires openpyxl)."""
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = sheet_name
+    ws.append(POOL_SHEET_HEADERS)
+    for row in rows:
+        ws.append([
+            datetime.fromisoformat(row[0]),
+            *row[1:13],
+            datetime.fromisoformat(row[13]),
+        ])
+    wb.save(path)
+
+
+# ------------------------------------------------------------
+# Database
+# ------------------------------------------------------------
+def create_database(path: str, rain_rows: List[tuple], pool_rows: List[tuple]) -> str:
+    """Create a complete home_maintenance.db at `path` filled with the given rows."""
+    ensure_schema(path)
+
+    conn = get_connection(path)
+    with conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO desired_ranges (item_name, low_value, high_value, factor_warn)
+            VALUES (?, ?, ?, ?)
+        """, DEFAULT_RANGES)
+        with deferred_rollups(conn):
+            conn.executemany("""
+                INSERT INTO rainfall (date, rain_mm, bom_mm, notes, watered, moisture)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rain_rows)
+        conn.executemany(POOL_INSERT_SQL, pool_rows)
+        conn.executemany("""
+            INSERT INTO settings (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value=excluded.value
+        """, [("threshold_mm", "10.0"), ("period_days", "7")])
+    return path
@@ -0,0 +1,238 @@
+#---------------------------------------------------------------------
+# ONLINE BACKUPS
+# Page-stepped SQLite backups into timestamped folders under backups/,
+# each checked with PRAGMA integrity_check, rotated to a retention count.
+#---------------------------------------------------------------------
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+from core.db_connection import open_connection
+
+
+BACKUP_DIR_NAME = "backups"
+STAMP_FORMAT = "%Y-%m-%d_%H%M%S"   # same names as the hand-made backups
+PARTIAL_SUFFIX = ".partial"
+
+PAGES_PER_STEP = 256     # pages copied per backup step (1 MB at 4 KB pages)
+STEP_SLEEP = 0.005       # seconds between steps; lets other writers in
+MAX_RESTARTS = 3         # then copy the rest of the snapshot in one step
+DEFAULT_KEEP = 10        # backups kept by rotation
+BACKUP_INTERVAL = timedelta(days=1)
+
+# Files next to the database copied into each backup when present
+EXTRA_FILES = ("settings.json",)
+
+
+class BackupError(Exception):
+    pass
+
+
+class BackupResult(NamedTuple):
+    folder: str          # backups/<timestamp>
+    db_file: str         # the checked database copy inside it
+    pages: int           # database pages copied
+    restarts: int        # times a concurrent write restarted the copy
+    seconds: float
+    removed: List[str]   # folders dropped by rotation
+
+
+def backup_dir_for(db_path: str) -> str:
+    """The backups/ folder next to a database file."""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), BACKUP_DIR_NAME)
+
+
+def _stamp_of(name: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(name, STAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def list_backups(backup_dir: str) -> List[str]:
+    """Timestamped backup folders in backup_dir, oldest first."""
+    if not os.path.isdir(backup_dir):
+        return []
+    stamped = []
+    for name in os.listdir(backup_dir):
+        stamp = _stamp_of(name)
+        if stamp is not None and os.path.isdir(os.path.join(backup_dir, name)):
+            stamped.append((stamp, os.path.join(backup_dir, name)))
+    return [path for _stamp, path in sorted(stamped)]
+
+
+def latest_backup_time(backup_dir: str) -> Optional[datetime]:
+    backups = list_backups(backup_dir)
+    return _stamp_of(os.path.basename(backups[-1])) if backups else None
+
+
+def rotate_backups(backup_dir: str, keep: int = DEFAULT_KEEP) -> List[str]:
+    """
+    Delete all but the newest `keep` timestamped folders. Anything else
+    in backup_dir is left alone.
+    """
+    backups = list_backups(backup_dir)
+    removed = backups[:-keep] if keep > 0 else backups
+    for path in removed:
+        shutil.rmtree(path)
+    return removed
+
+
+def check_integrity(db_file: str) -> List[str]:
+    """Problems reported by PRAGMA integrity_check ([] = the file is sound)."""
+    conn = sqlite3.connect(db_file)
+    try:
+        rows = [r[0] for r in conn.execute("PRAGMA integrity_check")]
+    except sqlite3.DatabaseError as exc:
+        return [str(exc)]
+    finally:
+        conn.close()
+    return [] if rows == ["ok"] else rows
+
+
+# ------------------------------------------------------------
+# Backup
+# ------------------------------------------------------------
+def _copy_database(db_path: str, dest: str, pages: int, sleep: float):
+    """Backup API copy of db_path into dest; returns (pages, restarts)."""
+    # A write through another connection between two steps restarts the
+    # copy. After MAX_RESTARTS the rest is copied in one step: in WAL
+    # mode that holds only a read snapshot, so writers still carry on.
+    restarts = 0
+    last_remaining = None
+    total_pages = 0
+
+    class _Busy(Exception):
+        pass
+
+    def progress(status, remaining, total):
+        nonlocal restarts, last_remaining, total_pages
+        total_pages = total
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts > MAX_RESTARTS:
+                raise _Busy
+        last_remaining = remaining
+
+    src = open_connection(db_path)
+    try:
+        dst = sqlite3.connect(dest)
+        try:
+            try:
+                src.backup(dst, pages=pages, progress=progress, sleep=sleep)
+            except _Busy:
+                src.backup(dst, pages=-1)
+            # A self-contained single file, like a hand-made copy
+            dst.execute("PRAGMA journal_mode=DELETE")
+            total_pages = dst.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            dst.close()
+    finally:
+        src.close()
+    return total_pages, min(restarts, MAX_RESTARTS + 1)
+
+
+def backup_database(db_path: str, backup_dir: Optional[str] = None,
+                    keep: int = DEFAULT_KEEP, pages: int = PAGES_PER_STEP,
+                    sleep: float = STEP_SLEEP, now: Optional[datetime] = None) -> BackupResult:
+    """
+    Back up db_path (and EXTRA_FILES) into backup_dir/<timestamp>/ while
+    the app keeps using the database, then rotate to `keep` backups.
+
+    The copy is written as <name>.partial and only renamed into place
+    once integrity_check passes; a failed backup leaves no folder behind
+    and raises BackupError. Older backups are only rotated out after a
+    good one exists.
+    """
+    backup_dir = backup_dir or backup_dir_for(db_path)
+    folder = os.path.join(backup_dir, (now or datetime.now()).strftime(STAMP_FORMAT))
+    try:
+        os.makedirs(folder)
+    except FileExistsError:
+        raise BackupError(f"Backup folder already exists: {folder}") from None
+
+    db_file = os.path.join(folder, os.path.basename(db_path))
+    partial = db_file + PARTIAL_SUFFIX
+    start = time.perf_counter()
+    try:
+        page_count, restarts = _copy_database(db_path, partial, pages, sleep)
+        problems = check_integrity(partial)
+        if problems:
+            raise BackupError("Backup failed integrity check: " + "; ".join(problems[:5]))
+        os.replace(partial, db_file)
+
+        source_dir = os.path.dirname(os.path.abspath(db_path))
+        for name in EXTRA_FILES:
+            path = os.path.join(source_dir, name)
+            if os.path.isfile(path):
+                shutil.copy2(path, os.path.join(folder, name))
+    except BaseException:
+        shutil.rmtree(folder, ignore_errors=True)
+        raise
+    seconds = time.perf_counter() - start
+
+    removed = rotate_backups(backup_dir, keep)
+    return BackupResult(folder, db_file, page_count, restarts, seconds, removed)
+
+
+# ------------------------------------------------------------
+# Background
+# ------------------------------------------------------------
+# One backup at a time, on its own thread: a long copy never holds up
+# the DB worker's reader or writer threads.
+_backup_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-backup")
+
+
+def start_backup(db_path: str, **kwargs) -> Future:
+    """Run backup_database() in the background; the Future holds its BackupResult."""
+    return _backup_thread.submit(backup_database, db_path, **kwargs)
+
+
+def backup_if_due(db_path: str, interval: timedelta = BACKUP_INTERVAL,
+                  **kwargs) -> Optional[Future]:
+    """start_backup() if the newest backup is older than `interval`, else None."""
+    latest = latest_backup_time(kwargs.get("backup_dir") or backup_dir_for(db_path))
+    if latest is not None and datetime.now() - latest < interval:
+        return None
+    return start_backup(db_path, **kwargs)
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python -m core.backup")
+    p.add_argument("db_path", nargs="?", default="home_maintenance.db")
+    p.add_argument("--dir", help=f"backup folder (default: {BACKUP_DIR_NAME}/ next to the database)")
+    p.add_argument("--keep", type=int, default=DEFAULT_KEEP,
+                   help=f"backups to keep (default: {DEFAULT_KEEP})")
+    p.add_argument("--check", action="store_true",
+                   help="only run integrity_check on every existing backup")
+    args = p.parse_args(argv)
+    backup_dir = args.dir or backup_dir_for(args.db_path)
+
+    if args.check:
+        failed = 0
+        for folder in list_backups(backup_dir):
+            db_file = os.path.join(folder, os.path.basename(args.db_path))
+            problems = check_integrity(db_file) if os.path.isfile(db_file) else ["missing"]
+            failed += bool(problems)
+            print(f"{os.path.basename(folder)}: {'; '.join(problems[:5]) or 'ok'}")
+        return 1 if failed else 0
+
+    try:
+        result = backup_database(args.db_path, backup_dir, keep=args.keep)
+    except (BackupError, sqlite3.Error) as exc:
+        print(f"Backup failed: {exc}", file=sys.stderr)
+        return 1
+    print(f"Backed up {result.pages} pages to {result.folder} in {result.seconds:.2f} s "
+          f"({result.restarts} restarts, {len(result.removed)} old backups removed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import atexit
+import os
+import sqlite3
+import threading
+
+
+# ------------------------------------------------------------
+# Connection tuning
+# ------------------------------------------------------------
+# WAL lets readers run alongside the writer and turns most commits into an
+# append to the -wal file; synchronous=NORMAL drops the fsync on every commit
+# (WAL is still durable across application crashes).
+PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -16000),          # negative = KiB, i.e. ~16 MB page cache
+    ("mmap_size", 256 * 1024 * 1024),
+    ("temp_store", "MEMORY"),
+)
+
+# sqlite3 keeps compiled statements per connection keyed by SQL text, so a
+# long-lived connection reuses every prepared statement the DB classes issue.
+STATEMENT_CACHE_SIZE = 256
+
+_local = threading.local()
+_registry_lock = threading.Lock()
+_open_connections = []
+_generation = 0   # bumped by close_all() so every thread reopens lazily
+
+
+def _key(db_path: str) -> str:
+    if db_path == ":memory:" or db_path.startswith("file:"):
+        return db_path
+    return os.path.abspath(db_path)
+
+
+def open_connection(db_path: str) -> sqlite3.Connection:
+    """
+    Open a new tuned connection. Most callers want get_connection() instead.
+    """
+    conn = sqlite3.connect(
+        db_path,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+        uri=db_path.startswith("file:"),
+    )
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def get_connection(db_path: str) -> sqlite3.Connection:
+    """
+    Return the shared connection for db_path on the calling thread.
+
+    Connections are opened on first use and kept for the life of the
+    process, one per database file per thread.
+    """
+    conns = getattr(_local, "connections", None)
+    if conns is None or getattr(_local, "generation", None) != _generation:
+        conns = _local.connections = {}
+        _local.generation = _generation
+
+    key = _key(db_path)
+    conn = conns.get(key)
+    if conn is None:
+        conn = open_connection(db_path)
+        conns[key] = conn
+        with _registry_lock:
+            _open_connections.append(conn)
+    return conn
+
+
+def close_all():
+    """Close every shared connection (all threads). Safe to call twice."""
+    global _generation
+
+    with _registry_lock:
+        conns = list(_open_connections)
+        _open_connections.clear()
+        _generation += 1
+
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+atexit.register(close_all)
@@ -0,0 +1,146 @@
+#---------------------------------------------------------------------
+# DB WORKER
+# Off-main-thread SQLite execution for the Tk UI: one writer thread fed
+# by a FIFO queue, a small pool of reader threads, and futures delivered
+# back onto the Tk thread with after().
+#---------------------------------------------------------------------
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_READERS = 2
+
+
+class DBExecutor:
+    """
+    Runs DB work for one database file off the Tk thread.
+
+    - submit_write(): every write goes through a single worker thread, so
+      writes run (and commit) strictly in submission order.
+    - submit_read(): runs on a small reader pool. Readers use their own
+      WAL connections and never block on, or wait for, the writer.
+      Pass consistent=True for a read that must see every write submitted
+      before it; it is queued behind them on the writer thread.
+
+    The submitted callables just use the normal DB classes: get_connection()
+    hands each worker thread its own shared connection.
+    """
+
+    def __init__(self, db_path: str, readers: int = DEFAULT_READERS):
+        self.db_path = db_path
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-read")
+
+    def submit_write(self, fn: Callable, *args, **kwargs) -> Future:
+        return self._writer.submit(fn, *args, **kwargs)
+
+    def submit_read(self, fn: Callable, *args, consistent: bool = False, **kwargs) -> Future:
+        pool = self._writer if consistent else self._readers
+        return pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True):
+        """Finish queued work (writes first) and stop the threads."""
+        self._writer.shutdown(wait=wait)
+        self._readers.shutdown(wait=wait)
+
+
+_executors: Dict[str, DBExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(db_path: str) -> DBExecutor:
+    """The process-wide DBExecutor for db_path (created on first use)."""
+    key = os.path.abspath(db_path)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = _executors[key] = DBExecutor(db_path)
+        return executor
+
+
+# ------------------------------------------------------------
+# Tk delivery
+# ------------------------------------------------------------
+class TkBridge:
+    """
+    Delivers Future results to callbacks on the Tk thread.
+
+    Worker threads must not touch Tk, so instead of done-callbacks the
+    bridge polls its pending futures with widget.after() while any are
+    outstanding (and not at all when idle).
+
+        bridge = TkBridge(self)
+        bridge.deliver(executor.submit_read(db.list_all), self._fill_table)
+    """
+
+    def __init__(self, widget, poll_ms: int = 15,
+                 on_error: Optional[Callable[[BaseException], None]] = None):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.on_error = on_error
+        self._pending: List[Tuple[Future, Callable, Optional[Callable]]] = []
+        self._after_id = None
+
+    def deliver(self, future: Future, on_done: Callable,
+                on_error: Optional[Callable[[BaseException], None]] = None) -> Future:
+        """Call on_done(result) (or on_error(exc)) on the Tk thread when done."""
+        self._pending.append((future, on_done, on_error or self.on_error))
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.poll_ms, self._poll)
+        return future
+
+    @property
+    def busy(self) -> bool:
+        """True while any delivered future has not been handed over yet."""
+        return bool(self._pending)
+
+    def _poll(self):
+        self._after_id = None
+        ready, waiting = [], []
+        for p in self._pending:
+            (ready if p[0].done() else waiting).append(p)
+        self._pending = waiting
+
+        # Completed futures are handed over in submission order. A failing
+        # callback is reported on its own and never costs the others
+        # their hand-over, nor stops the polling for futures still due.
+        unhandled = None
+        try:
+            for future, on_done, on_error in ready:
+                exc = self._hand_over(future, on_done, on_error)
+                if exc is not None and unhandled is None:
+                    unhandled = exc
+        finally:
+            if self._pending and self._after_id is None:
+                self._after_id = self.widget.after(self.poll_ms, self._poll)
+        if unhandled is not None:
+            raise unhandled
+
+    @staticmethod
+    def _hand_over(future: Future, on_done: Callable,
+                   on_error: Optional[Callable[[BaseException], None]]) -> Optional[BaseException]:
+        """Run on_done (or on_error); returns an error nothing handled."""
+        exc = future.exception()
+        if exc is None:
+            try:
+                on_done(future.result())
+                return None
+            except Exception as callback_exc:
+                exc = callback_exc
+        if on_error is None:
+            return exc
+        try:
+            on_error(exc)
+        except Exception as handler_exc:
+            return handler_exc
+        return None
+
+    def cancel(self):
+        """Stop polling (e.g. when the widget is destroyed)."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._pending.clear()
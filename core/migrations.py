@@ -0,0 +1,580 @@
+#---------------------------------------------------------------------
+# SCHEMA MIGRATIONS
+# Ordered, run-once schema steps for home_maintenance.db, tracked by
+# PRAGMA user_version.
+#---------------------------------------------------------------------
+
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from core.db_connection import get_connection
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable   # apply(conn), runs inside the migration transaction
+
+
+# ------------------------------------------------------------
+# Steps
+# ------------------------------------------------------------
+# Every step is written to also succeed on databases created before this
+# framework existed (user_version 0 but tables already present).
+def _create_settings(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+
+
+def _create_rainfall(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rainfall (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            rain_mm REAL,
+            bom_mm REAL,
+            notes TEXT,
+            watered TEXT NOT NULL DEFAULT 'No',
+            moisture REAL
+        )
+    """)
+
+
+def _normalize_rainfall_watered(conn):
+    conn.execute("""
+        UPDATE rainfall
+        SET watered = 'No'
+        WHERE watered IS NULL OR watered NOT IN ('Yes', 'No')
+    """)
+
+
+def _dedupe_rainfall_dates(conn):
+    # Keep the newest row per date, then make date unique.
+    conn.execute("""
+        DELETE FROM rainfall
+        WHERE id NOT IN (
+            SELECT MAX(id)
+            FROM rainfall
+            GROUP BY date
+        )
+    """)
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_rainfall_date
+        ON rainfall(date)
+    """)
+
+
+def _add_rainfall_eff_mm(conn):
+    # Effective rainfall (Rain_mm first, then BOM_mm) as a generated
+    # column, so "last rain" style questions can be answered by an index.
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(rainfall)")}
+    if "eff_mm" not in columns:
+        conn.execute("""
+            ALTER TABLE rainfall ADD COLUMN eff_mm REAL
+            GENERATED ALWAYS AS (
+                CASE
+                    WHEN rain_mm >= 0 THEN rain_mm
+                    WHEN bom_mm >= 0 THEN bom_mm
+                END
+            ) VIRTUAL
+        """)
+
+    # Partial indexes: MAX(date) over rain days / watering days is a
+    # single index seek.
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_rainfall_rain_date
+        ON rainfall(date) WHERE eff_mm > 0
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_rainfall_watered_date
+        ON rainfall(date) WHERE watered = 'Yes'
+    """)
+
+
+def _add_rainfall_triggers(conn):
+    # Enforce key domain rules for legacy schemas that cannot add CHECK easily.
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rainfall_validate_insert
+        BEFORE INSERT ON rainfall
+        WHEN (NEW.rain_mm IS NOT NULL AND NEW.rain_mm < 0)
+          OR (NEW.bom_mm IS NOT NULL AND NEW.bom_mm < 0)
+          OR NEW.watered NOT IN ('Yes', 'No')
+        BEGIN
+            SELECT RAISE(ABORT, 'Invalid rainfall row');
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rainfall_validate_update
+        BEFORE UPDATE ON rainfall
+        WHEN (NEW.rain_mm IS NOT NULL AND NEW.rain_mm < 0)
+          OR (NEW.bom_mm IS NOT NULL AND NEW.bom_mm < 0)
+          OR NEW.watered NOT IN ('Yes', 'No')
+        BEGIN
+            SELECT RAISE(ABORT, 'Invalid rainfall row');
+        END
+    """)
+
+
+def _create_pool_tables(conn):
+    # Same layout as scripts/create_pool_tests_table.py and init_db.sql
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pool_tests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            test_date TEXT NOT NULL,
+            free_chlorine REAL NOT NULL,
+            combined_chlorine REAL NOT NULL,
+            total_chlorine REAL NOT NULL,
+            salt_level REAL NOT NULL,
+            alkalinity REAL NOT NULL,
+            ph REAL NOT NULL,
+            sunscreen REAL NOT NULL,
+            hardness REAL NOT NULL,
+            phosphates REAL NOT NULL,
+            copper REAL NOT NULL,
+            clarity_notes TEXT,
+            actions_taken TEXT,
+            next_test_date TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS desired_ranges (
+            item_name      TEXT PRIMARY KEY,
+            low_value      REAL NOT NULL,
+            high_value     REAL NOT NULL,
+            factor_warn    REAL NOT NULL
+        )
+    """)
+
+
+# Status codes as in modules/pool/classifier.py: 0 unknown, 1 in_range,
+# 2 slightly_high, 3 high, 4 slightly_low, 5 low.
+_POOL_PARAMETERS = (
+    (0, "Free Chlorine (ppm)", "free_chlorine"),
+    (1, "Combined Chlorine (ppm)", "combined_chlorine"),
+    (2, "Total Chlorine (ppm)", "total_chlorine"),
+    (3, "Salt Level (ppm)", "salt_level"),
+    (4, "Alkalinity (ppm)", "alkalinity"),
+    (5, "pH", "ph"),
+    (6, "Sunscreen (Stabiliser) (ppm)", "sunscreen"),
+    (7, "Total Hardness (ppm)", "hardness"),
+    (8, "Phosphates (ppm)", "phosphates"),
+    (9, "Copper Total (ppm)", "copper"),
+)
+
+
+def _create_pool_test_status(conn):
+    # Materialized classify_value() result per (test, parameter), kept
+    # current by triggers: pool_tests writes refresh that test's rows,
+    # desired_ranges writes refresh that parameter's column.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pool_parameters (
+            param INTEGER PRIMARY KEY,
+            item_name TEXT NOT NULL UNIQUE,
+            column_name TEXT NOT NULL
+        )
+    """)
+    conn.executemany(
+        "INSERT OR IGNORE INTO pool_parameters (param, item_name, column_name) VALUES (?, ?, ?)",
+        _POOL_PARAMETERS,
+    )
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pool_test_status (
+            test_id INTEGER NOT NULL,
+            param INTEGER NOT NULL,
+            status INTEGER NOT NULL,
+            PRIMARY KEY (test_id, param)
+        ) WITHOUT ROWID
+    """)
+    # "Out of range" = any status other than unknown/in_range
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_pool_test_status_out
+        ON pool_test_status(test_id, param) WHERE status >= 2
+    """)
+
+    # Same comparisons, order and margin arithmetic as classify_value();
+    # a parameter without a desired_ranges row compares NULL -> unknown.
+    value = "\n".join(
+        f"                WHEN {param} THEN t.{column}" for param, _name, column in _POOL_PARAMETERS
+    )
+    conn.execute(f"""
+        CREATE VIEW IF NOT EXISTS pool_test_status_calc AS
+        SELECT test_id, param, item_name,
+            CASE
+                WHEN v >= lo AND v <= hi THEN 1
+                WHEN v > hi AND v <= hi + (fw * hi) THEN 2
+                WHEN v > hi + (fw * hi) THEN 3
+                WHEN v >= lo - (fw * lo) AND v < lo THEN 4
+                WHEN v < lo - (fw * lo) THEN 5
+                ELSE 0
+            END AS status
+        FROM (
+            SELECT t.id AS test_id, p.param, p.item_name,
+                CASE p.param
+{value}
+                END AS v,
+                r.low_value AS lo, r.high_value AS hi, r.factor_warn AS fw
+            FROM pool_tests t
+            CROSS JOIN pool_parameters p
+            LEFT JOIN desired_ranges r ON r.item_name = p.item_name
+        )
+    """)
+
+    refresh_test = """
+        INSERT OR REPLACE INTO pool_test_status (test_id, param, status)
+        SELECT test_id, param, status FROM pool_test_status_calc WHERE test_id = NEW.id;
+    """
+    refresh_param = """
+        INSERT OR REPLACE INTO pool_test_status (test_id, param, status)
+        SELECT test_id, param, status FROM pool_test_status_calc WHERE item_name = {}.item_name;
+    """
+    columns = ", ".join(column for _param, _name, column in _POOL_PARAMETERS)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pool_status_insert
+        AFTER INSERT ON pool_tests
+        BEGIN {refresh_test} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pool_status_update
+        AFTER UPDATE OF {columns} ON pool_tests
+        BEGIN {refresh_test} END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_pool_status_delete
+        AFTER DELETE ON pool_tests
+        BEGIN
+            DELETE FROM pool_test_status WHERE test_id = OLD.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pool_status_ranges_insert
+        AFTER INSERT ON desired_ranges
+        BEGIN {refresh_param.format("NEW")} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pool_status_ranges_update
+        AFTER UPDATE ON desired_ranges
+        BEGIN {refresh_param.format("OLD")} {refresh_param.format("NEW")} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pool_status_ranges_delete
+        AFTER DELETE ON desired_ranges
+        BEGIN {refresh_param.format("OLD")} END
+    """)
+
+    # Backfill existing tests
+    conn.execute("""
+        INSERT OR REPLACE INTO pool_test_status (test_id, param, status)
+        SELECT test_id, param, status FROM pool_test_status_calc
+    """)
+
+
+def _index_pool_tests_date(conn):
+    # Newest-first listing and keyset pages: ORDER BY test_date DESC, id DESC
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_pool_tests_date_id
+        ON pool_tests(test_date, id)
+    """)
+
+
+def _index_pool_tests_next_date(conn):
+    # "When is the next test due" is MAX(next_test_date): one index seek
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_pool_tests_next_test_date
+        ON pool_tests(next_test_date)
+    """)
+
+
+# Rollup buckets keyed by their first day: weeks start on Monday.
+_ROLLUP_PERIODS = (
+    ("rainfall_weekly", "date({}, '-6 days', 'weekday 1')", "'+6 days'"),
+    ("rainfall_monthly", "date({}, 'start of month')", "'+1 month', '-1 day'"),
+)
+
+
+def _create_rainfall_rollups(conn):
+    # Weekly / monthly / yearly aggregates of rainfall, kept current by
+    # triggers. A write recomputes just the buckets holding that date:
+    # the week (<= 7 rows) and month (<= 31 rows) from rainfall by the
+    # date index, then the year from its (<= 12) monthly rows. Sums are
+    # recomputed rather than adjusted, so they never drift, and min/max
+    # stay correct after deletes. Empty buckets are removed.
+    # Mean moisture = moisture_sum / moisture_count.
+    # Bulk writers set the settings key 'rainfall_rollups_deferred' for
+    # the length of their transaction and rebuild the touched buckets in
+    # one pass instead (modules/rainfall/rollups.deferred_rollups).
+    for table in ("rainfall_weekly", "rainfall_monthly", "rainfall_yearly"):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                period_start TEXT PRIMARY KEY,
+                days INTEGER NOT NULL,
+                rain_mm REAL NOT NULL,
+                rain_days INTEGER NOT NULL,
+                watering_days INTEGER NOT NULL,
+                moisture_min REAL,
+                moisture_max REAL,
+                moisture_sum REAL NOT NULL,
+                moisture_count INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+    daily_aggregates = """
+        COUNT(*), TOTAL(eff_mm),
+        COUNT(CASE WHEN eff_mm > 0 THEN 1 END),
+        COUNT(CASE WHEN watered = 'Yes' THEN 1 END),
+        MIN(moisture), MAX(moisture), TOTAL(moisture), COUNT(moisture)
+    """
+    rollup_aggregates = """
+        SUM(days), TOTAL(rain_mm), SUM(rain_days), SUM(watering_days),
+        MIN(moisture_min), MAX(moisture_max), TOTAL(moisture_sum), SUM(moisture_count)
+    """
+
+    def refresh(row):
+        """Trigger statements that rebuild the buckets holding {row}.date."""
+        d = f"{row}.date"
+        statements = []
+        for table, start_expr, end_offset in _ROLLUP_PERIODS:
+            start = start_expr.format(d)
+            statements.append(f"""
+                DELETE FROM {table} WHERE period_start = {start};
+                INSERT INTO {table}
+                SELECT {start}, {daily_aggregates}
+                FROM rainfall
+                WHERE date BETWEEN {start} AND date({start}, {end_offset})
+                HAVING COUNT(*) > 0;
+            """)
+        year = f"date({d}, 'start of year')"
+        statements.append(f"""
+                DELETE FROM rainfall_yearly WHERE period_start = {year};
+                INSERT INTO rainfall_yearly
+                SELECT {year}, {rollup_aggregates}
+                FROM rainfall_monthly
+                WHERE period_start BETWEEN {year} AND date({year}, '+11 months')
+                HAVING COUNT(*) > 0;
+        """)
+        return "".join(statements)
+
+    live = "NOT EXISTS (SELECT 1 FROM settings WHERE key = 'rainfall_rollups_deferred')"
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rainfall_rollup_insert
+        AFTER INSERT ON rainfall
+        WHEN {live}
+        BEGIN {refresh("NEW")} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rainfall_rollup_update
+        AFTER UPDATE OF date, rain_mm, bom_mm, watered, moisture ON rainfall
+        WHEN {live}
+        BEGIN {refresh("NEW")} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rainfall_rollup_move
+        AFTER UPDATE OF date ON rainfall
+        WHEN OLD.date IS NOT NEW.date AND {live}
+        BEGIN {refresh("OLD")} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rainfall_rollup_delete
+        AFTER DELETE ON rainfall
+        WHEN {live}
+        BEGIN {refresh("OLD")} END
+    """)
+
+    # Backfill
+    for table, start_expr, _end_offset in _ROLLUP_PERIODS:
+        start = start_expr.format("date")
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(f"""
+            INSERT INTO {table}
+            SELECT {start} AS period, {daily_aggregates}
+            FROM rainfall
+            WHERE period IS NOT NULL
+            GROUP BY period
+        """)
+    conn.execute("DELETE FROM rainfall_yearly")
+    conn.execute(f"""
+        INSERT INTO rainfall_yearly
+        SELECT date(period_start, 'start of year') AS period, {rollup_aggregates}
+        FROM rainfall_monthly
+        GROUP BY period
+    """)
+
+
+def _create_notes_fts(conn):
+    # Full-text index over rainfall.notes and pool_tests.clarity_notes /
+    # actions_taken. One FTS5 table serves both: rowid = id * 2 for a
+    # rainfall row and id * 2 + 1 for a pool test, so every trigger below
+    # is a rowid seek. Rows without any text are not indexed.
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+            notes, clarity_notes, actions_taken,
+            tokenize = 'porter unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_notes_fts_rainfall_insert
+        AFTER INSERT ON rainfall
+        WHEN NEW.notes <> ''
+        BEGIN
+            INSERT INTO notes_fts (rowid, notes) VALUES (NEW.id * 2, NEW.notes);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_notes_fts_rainfall_update
+        AFTER UPDATE OF notes ON rainfall
+        WHEN OLD.notes IS NOT NEW.notes
+        BEGIN
+            DELETE FROM notes_fts WHERE rowid = OLD.id * 2;
+            INSERT INTO notes_fts (rowid, notes)
+            SELECT NEW.id * 2, NEW.notes WHERE NEW.notes <> '';
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_notes_fts_rainfall_delete
+        AFTER DELETE ON rainfall
+        WHEN OLD.notes <> ''
+        BEGIN
+            DELETE FROM notes_fts WHERE rowid = OLD.id * 2;
+        END
+    """)
+
+    has_pool_text = "(COALESCE({0}.clarity_notes, '') <> '' OR COALESCE({0}.actions_taken, '') <> '')"
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_notes_fts_pool_insert
+        AFTER INSERT ON pool_tests
+        WHEN {has_pool_text.format("NEW")}
+        BEGIN
+            INSERT INTO notes_fts (rowid, clarity_notes, actions_taken)
+            VALUES (NEW.id * 2 + 1, NEW.clarity_notes, NEW.actions_taken);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_notes_fts_pool_update
+        AFTER UPDATE OF clarity_notes, actions_taken ON pool_tests
+        WHEN OLD.clarity_notes IS NOT NEW.clarity_notes
+          OR OLD.actions_taken IS NOT NEW.actions_taken
+        BEGIN
+            DELETE FROM notes_fts WHERE rowid = OLD.id * 2 + 1;
+            INSERT INTO notes_fts (rowid, clarity_notes, actions_taken)
+            SELECT NEW.id * 2 + 1, NEW.clarity_notes, NEW.actions_taken
+            WHERE {has_pool_text.format("NEW")};
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_notes_fts_pool_delete
+        AFTER DELETE ON pool_tests
+        WHEN {has_pool_text.format("OLD")}
+        BEGIN
+            DELETE FROM notes_fts WHERE rowid = OLD.id * 2 + 1;
+        END
+    """)
+
+    # Backfill
+    conn.execute("DELETE FROM notes_fts")
+    conn.execute("""
+        INSERT INTO notes_fts (rowid, notes)
+        SELECT id * 2, notes FROM rainfall WHERE notes <> ''
+    """)
+    conn.execute(f"""
+        INSERT INTO notes_fts (rowid, clarity_notes, actions_taken)
+        SELECT id * 2 + 1, clarity_notes, actions_taken FROM pool_tests AS NEW
+        WHERE {has_pool_text.format("NEW")}
+    """)
+
+
+# Append only: never renumber or edit a step that has shipped.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create settings", _create_settings),
+    Migration(2, "create rainfall", _create_rainfall),
+    Migration(3, "normalize rainfall.watered", _normalize_rainfall_watered),
+    Migration(4, "dedupe rainfall dates + unique index", _dedupe_rainfall_dates),
+    Migration(5, "rainfall eff_mm + partial indexes", _add_rainfall_eff_mm),
+    Migration(6, "rainfall validation triggers", _add_rainfall_triggers),
+    Migration(7, "create pool tables", _create_pool_tables),
+    Migration(8, "materialized pool_test_status", _create_pool_test_status),
+    Migration(9, "pool_tests (test_date, id) index", _index_pool_tests_date),
+    Migration(10, "pool_tests next_test_date index", _index_pool_tests_next_date),
+    Migration(11, "rainfall weekly/monthly/yearly rollups", _create_rainfall_rollups),
+    Migration(12, "notes_fts full-text index", _create_notes_fts),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ------------------------------------------------------------
+# Runner
+# ------------------------------------------------------------
+_lock = threading.Lock()
+_checked: Dict[str, object] = {}   # db_path -> connection already verified
+
+
+def schema_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db_path: str) -> List[Tuple[int, str, float]]:
+    """
+    Apply every pending migration, each in its own transaction together
+    with its user_version bump and a row in schema_migrations.
+    Returns (version, name, seconds) for the steps that ran.
+    """
+    conn = get_connection(db_path)
+    applied = []
+
+    if schema_version(conn) >= LATEST_VERSION:
+        return applied
+
+    for migration in MIGRATIONS:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock: another connection may have
+            # applied this step since we looked.
+            if schema_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+
+            start = time.perf_counter()
+            migration.apply(conn)
+            elapsed = time.perf_counter() - start
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TEXT NOT NULL,
+                    duration_ms REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                INSERT OR REPLACE INTO schema_migrations (version, name, applied_at, duration_ms)
+                VALUES (?, ?, datetime('now'), ?)
+            """, (migration.version, migration.name, elapsed * 1000))
+            conn.execute(f"PRAGMA user_version = {migration.version:d}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append((migration.version, migration.name, elapsed))
+
+    return applied
+
+
+def ensure_schema(db_path: str):
+    """
+    Bring db_path up to LATEST_VERSION. After the first call for a given
+    shared connection this returns without touching the database.
+    """
+    conn = get_connection(db_path)
+    if _checked.get(db_path) is conn:
+        return
+    with _lock:
+        if _checked.get(db_path) is not conn:
+            migrate(db_path)
+            _checked[db_path] = conn
@@ -1,4 +1,11 @@
-import sqlite3
+import atexit
+import os
+import sys
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from core.db_connection import get_connection, open_connection
+from core.migrations import ensure_schema
 
 
 class SettingsDB:
@@ -12,29 +19,16 @@ class SettingsDB:
         self._ensure_table()
 
     def _connect(self):
-        return sqlite3.connect(self.db_path)
+        return get_connection(self.db_path)
 
     def _ensure_table(self):
-        conn = self._connect()
-        cur = conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        """)
-        conn.commit()
-        conn.close()
+        ensure_schema(self.db_path)
 
     # ------------------------------------------------------------
     # Load all settings into a dict
     # ------------------------------------------------------------
     def load_all(self) -> dict:
-        conn = self._connect()
-        cur = conn.cursor()
-        cur.execute("SELECT key, value FROM settings")
-        rows = cur.fetchall()
-        conn.close()
+        rows = self._connect().execute("SELECT key, value FROM settings").fetchall()
 
         settings = {}
         for k, v in rows:
@@ -45,11 +39,9 @@ class SettingsDB:
     # Get a single setting
     # ------------------------------------------------------------
     def get(self, key: str, default=None):
-        conn = self._connect()
-        cur = conn.cursor()
-        cur.execute("SELECT value FROM settings WHERE key=?", (key,))
-        row = cur.fetchone()
-        conn.close()
+        row = self._connect().execute(
+            "SELECT value FROM settings WHERE key=?", (key,)
+        ).fetchone()
         if row is None:
             return default
         return row[0]
@@ -58,12 +50,238 @@ class SettingsDB:
     # Set a setting
     # ------------------------------------------------------------
     def set(self, key: str, value):
-        conn = self._connect()
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO settings (key, value)
-            VALUES (?, ?)
-            ON CONFLICT(key) DO UPDATE SET value=excluded.value
-        """, (key, str(value)))
-        conn.commit()
-        conn.close()
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO settings (key, value)
+                VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value=excluded.value
+            """, (key, str(value)))
+
+
+# ------------------------------------------------------------
+# Process-wide settings cache
+# ------------------------------------------------------------
+class SettingsCache:
+    """
+    Typed, in-memory view of the settings table, shared by the whole
+    process (see get_settings()).
+
+    - The table is read once; get() is a dict lookup.
+    - set()/update() change memory immediately and queue the write; queued
+      writes are coalesced into one transaction `debounce_s` after the
+      last change (or on flush(), and at exit).
+    - Subscribers are called with {key: (old, new)} only for keys whose
+      typed value actually changed.
+
+    Keys registered with a type are cast on load and on set (falling back
+    to the default when the stored text doesn't parse); other keys are
+    served as the raw stored strings.
+
+    A failed write keeps its changes queued. flush() raises the error;
+    a debounced flush reports it to `on_error` (stderr by default) and
+    retries with a growing delay, up to RETRY_MAX_S.
+    """
+
+    DEFAULT_DEBOUNCE_S = 0.5
+    RETRY_MAX_S = 30.0
+
+    def __init__(self, db_path: str, debounce_s: float = DEFAULT_DEBOUNCE_S):
+        self.db_path = db_path
+        self.debounce_s = debounce_s
+
+        self._lock = threading.RLock()
+        self._raw = SettingsDB(db_path).load_all()
+        self._values = dict(self._raw)
+        self._types = {}
+        self._defaults = {}
+        self._pending = {}
+        self._timer = None
+        self._subscribers = []
+        self._failures = 0   # debounced flushes failed in a row
+        self.last_error: Optional[BaseException] = None
+        self.on_error: Optional[Callable[[BaseException], None]] = None
+
+    # ------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------
+    def register(self, key: str, type_: Callable, default):
+        """Declare a typed key. A missing key is seeded with its default."""
+        with self._lock:
+            if key in self._types:
+                return
+            self._types[key] = type_
+            self._defaults[key] = default
+            if key in self._raw:
+                self._values[key] = self._cast(key, self._raw[key])
+            else:
+                self._values[key] = default
+                self._queue(key, default)
+
+    def register_many(self, spec: Dict[str, Tuple[Callable, object]]):
+        for key, (type_, default) in spec.items():
+            self.register(key, type_, default)
+
+    def _cast(self, key: str, value):
+        type_ = self._types.get(key)
+        if type_ is None:
+            return value
+        try:
+            return type_(value)
+        except (TypeError, ValueError):
+            return self._defaults[key]
+
+    # ------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------
+    def get(self, key: str, default=None):
+        return self._values.get(key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+    # ------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------
+    def set(self, key: str, value) -> bool:
+        """Set one key. Returns True if the value changed."""
+        return bool(self.update({key: value}))
+
+    def update(self, values: dict) -> Dict[str, tuple]:
+        """
+        Set several keys at once. Subscribers are notified once, with only
+        the keys that changed. Returns {key: (old, new)}.
+        """
+        changes = {}
+        with self._lock:
+            for key, value in values.items():
+                value = self._cast(key, value)
+                old = self._values.get(key)
+                if key in self._values and old == value:
+                    continue
+                self._values[key] = value
+                self._queue(key, value)
+                changes[key] = (old, value)
+
+            subscribers = list(self._subscribers)
+
+        if changes:
+            for keys, callback in subscribers:
+                relevant = changes if keys is None else {k: v for k, v in changes.items() if k in keys}
+                if relevant:
+                    callback(relevant)
+        return changes
+
+    def _queue(self, key: str, value):
+        self._pending[key] = str(value)
+        if self._timer is not None:
+            self._timer.cancel()
+        self._start_timer(self.debounce_s)
+
+    def _start_timer(self, delay: float):
+        self._timer = threading.Timer(delay, self._flush_from_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """
+        Write all queued changes in one transaction. If the write fails
+        the changes stay queued and the error is raised.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+
+            # Flushes may run on the debounce timer's thread, so use a
+            # short-lived connection rather than a per-thread shared one.
+            try:
+                conn = open_connection(self.db_path)
+                try:
+                    with conn:
+                        conn.executemany("""
+                            INSERT INTO settings (key, value)
+                            VALUES (?, ?)
+                            ON CONFLICT(key) DO UPDATE SET value=excluded.value
+                        """, list(pending.items()))
+                finally:
+                    conn.close()
+            except Exception:
+                # Re-queue, without overwriting anything set since
+                for key, value in pending.items():
+                    self._pending.setdefault(key, value)
+                raise
+            self._raw.update(pending)
+
+    def _flush_from_timer(self):
+        """Debounced flush: errors are reported and the flush retried."""
+        try:
+            self.flush()
+        except Exception as exc:
+            with self._lock:
+                self._failures += 1
+                self.last_error = exc
+                if self._timer is None and self._pending:
+                    delay = min(self.RETRY_MAX_S, self.debounce_s * 2 ** self._failures)
+                    self._start_timer(delay)
+            self._report_error(exc)
+        else:
+            with self._lock:
+                self._failures = 0
+                self.last_error = None
+
+    def _report_error(self, exc: BaseException):
+        if self.on_error is not None:
+            self.on_error(exc)
+        else:
+            print(f"Settings not saved yet (will retry): {exc}", file=sys.stderr)
+
+    # ------------------------------------------------------------
+    # Notifications
+    # ------------------------------------------------------------
+    def subscribe(self, callback: Callable[[Dict[str, tuple]], None],
+                  keys: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """
+        Call callback({key: (old, new)}) after changes to `keys` (all keys
+        if None). Returns a function that unsubscribes.
+        """
+        entry = (None if keys is None else frozenset(keys), callback)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return unsubscribe
+
+
+_caches: Dict[str, SettingsCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_settings(db_path: str) -> SettingsCache:
+    """The process-wide SettingsCache for db_path (created on first use)."""
+    key = os.path.abspath(db_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = SettingsCache(db_path)
+        return cache
+
+
+def flush_all():
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.flush()
+
+
+atexit.register(flush_all)
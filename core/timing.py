@@ -0,0 +1,88 @@
+#---------------------------------------------------------------------
+# STARTUP TIMING
+# Named phases from process start to first paint, checked against a budget.
+#---------------------------------------------------------------------
+
+import os
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+# Time-to-first-paint budget (ms); override with HM_STARTUP_BUDGET_MS.
+DEFAULT_BUDGET_MS = 1000.0
+
+# Set HM_STARTUP_REPORT=1 to always print the report (it is printed
+# anyway when the budget is exceeded).
+REPORT_ENV = "HM_STARTUP_REPORT"
+BUDGET_ENV = "HM_STARTUP_BUDGET_MS"
+
+
+class PhaseTimer:
+    """
+    Records startup phases as (name, start_ms, duration_ms), measured from
+    `origin` (a time.perf_counter() value, e.g. taken at the top of
+    main.py before the heavy imports).
+
+        timer = PhaseTimer(origin)
+        with timer.phase("window"):
+            ...
+        timer.mark("first paint")     # instant event
+    """
+
+    def __init__(self, origin: Optional[float] = None, budget_ms: Optional[float] = None):
+        self.origin = time.perf_counter() if origin is None else origin
+        if budget_ms is None:
+            try:
+                budget_ms = float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MS))
+            except ValueError:
+                budget_ms = DEFAULT_BUDGET_MS
+        self.budget_ms = budget_ms
+        self.phases: List[Tuple[str, float, float]] = []
+        self.first_paint_ms: Optional[float] = None
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self.origin) * 1000
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self._now_ms()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start, self._now_ms() - start))
+
+    def mark(self, name: str) -> float:
+        at = self._now_ms()
+        self.phases.append((name, at, 0.0))
+        return at
+
+    def mark_first_paint(self) -> float:
+        self.first_paint_ms = self.mark("first paint")
+        return self.first_paint_ms
+
+    # ------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------
+    def over_budget(self) -> bool:
+        return self.first_paint_ms is not None and self.first_paint_ms > self.budget_ms
+
+    def report(self) -> str:
+        lines = ["Startup phases (ms since process start):"]
+        for name, start, duration in self.phases:
+            if duration:
+                lines.append(f"  {start:8.1f}  {name:<28} {duration:8.1f}")
+            else:
+                lines.append(f"  {start:8.1f}  {name}")
+        if self.first_paint_ms is not None:
+            verdict = "OVER BUDGET" if self.over_budget() else "ok"
+            lines.append(
+                f"Time to first paint: {self.first_paint_ms:.1f} ms "
+                f"(budget {self.budget_ms:.0f} ms, {verdict})"
+            )
+        return "\n".join(lines)
+
+    def print_report(self, force: bool = False):
+        """Print the report if asked for (env/force) or over budget."""
+        if force or self.over_budget() or os.environ.get(REPORT_ENV) == "1":
+            print(self.report())
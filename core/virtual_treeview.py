@@ -0,0 +1,213 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+DEFAULT_ROW_HEIGHT = 20
+
+
+class VirtualTreeview(ttk.Frame):
+    """
+    A ttk.Treeview that only materializes the rows currently in view
+    (plus a small overscan buffer) instead of one item per data row.
+
+    Data stays with the owner, which supplies:
+        row_count()          -> int
+        row_provider(index)  -> (values tuple, tags tuple)
+
+    A fixed pool of Treeview items is reused as the window scrolls, so
+    refresh cost depends on the window height, not the history length.
+    User selection is reported with the <<RowSelected>> virtual event;
+    call selected_index() to get the data row. The selection is a row
+    number, so owners that insert or remove rows must move it with
+    set_selected_index().
+    """
+
+    def __init__(self, parent, columns, row_count, row_provider, buffer_rows=2, **tree_kw):
+        super().__init__(parent)
+
+        self.row_count = row_count
+        self.row_provider = row_provider
+        self.buffer_rows = buffer_rows
+
+        self._first = 0           # data index shown in the top slot
+        self._visible = 20        # rows that fit in the viewport
+        self._slots = []          # reusable Treeview item ids, top to bottom
+        self._selected = None     # selected data index (survives scrolling)
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings",
+                                 selectmode="browse", **tree_kw)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible))
+        self.tree.bind("<Home>", lambda e: self._move_selection(-self.row_count()))
+        self.tree.bind("<End>", lambda e: self._move_selection(self.row_count()))
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def refresh(self):
+        """Re-render the visible window (call after rows are added/removed)."""
+        count = self.row_count()
+        if self._selected is not None and self._selected >= count:
+            self._selected = None
+        self._first = self._clamp_first(self._first, count)
+        self._render(count)
+
+    def refresh_row(self, index: int):
+        """Update one data row in place if it is currently materialized."""
+        slot = index - self._first
+        if 0 <= slot < len(self._slots):
+            values, tags = self.row_provider(index)
+            self.tree.item(self._slots[slot], values=values, tags=tags)
+
+    def scroll_to(self, index: int):
+        """Scroll so that data row `index` is visible."""
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + self._visible:
+            self._first = index - self._visible + 1
+        self.refresh()
+
+    def scroll_to_end(self):
+        """Show the latest rows (the bottom of the table)."""
+        self._first = self.row_count()
+        self.refresh()
+
+    def selected_index(self):
+        return self._selected
+
+    def set_selected_index(self, index):
+        """
+        Move the highlight to data row `index` (None = clear) without
+        scrolling or <<RowSelected>>: for owners whose selected row
+        moved because rows were added or removed. Takes effect on the
+        next refresh().
+        """
+        self._selected = index
+
+    def select(self, index: int):
+        """Select data row `index`, scrolling to it."""
+        self._selected = index
+        self.scroll_to(index)
+        self.event_generate("<<RowSelected>>")
+
+    # ------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------
+    def _clamp_first(self, first, count):
+        return max(0, min(first, count - self._visible))
+
+    def _render(self, count=None):
+        if count is None:
+            count = self.row_count()
+
+        wanted = max(0, min(self._visible + self.buffer_rows, count - self._first))
+
+        # Grow / shrink the item pool to the window size
+        while len(self._slots) < wanted:
+            self._slots.append(self.tree.insert("", tk.END, values=()))
+        while len(self._slots) > wanted:
+            self.tree.delete(self._slots.pop())
+
+        for slot, item in enumerate(self._slots):
+            values, tags = self.row_provider(self._first + slot)
+            self.tree.item(item, values=values, tags=tags)
+
+        # Keep the native selection in step with the selected data row
+        sel_slot = None if self._selected is None else self._selected - self._first
+        if sel_slot is not None and 0 <= sel_slot < len(self._slots):
+            self.tree.selection_set(self._slots[sel_slot])
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        # The pool is always drawn from the top; never let the Treeview scroll itself
+        self.tree.yview_moveto(0)
+        self._update_scrollbar(count)
+
+    def _update_scrollbar(self, count):
+        if count <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        top = self._first / count
+        bottom = min(1.0, (self._first + self._visible) / count)
+        self.scrollbar.set(top, bottom)
+
+    def _row_height(self):
+        if self._slots:
+            bbox = self.tree.bbox(self._slots[0])
+            if bbox:
+                return bbox[3], bbox[1]
+        try:
+            height = int(ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        except (ValueError, tk.TclError):
+            height = DEFAULT_ROW_HEIGHT
+        return height, height  # header assumed about one row tall
+
+    # ------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------
+    def _on_resize(self, event):
+        row_h, header_h = self._row_height()
+        visible = max(1, (event.height - header_h) // max(1, row_h))
+        if visible != self._visible:
+            at_end = self._first >= self.row_count() - self._visible
+            self._visible = visible
+            if at_end:
+                self.scroll_to_end()
+            else:
+                self.refresh()
+
+    def _on_scrollbar(self, *args):
+        count = self.row_count()
+        if args[0] == "moveto":
+            first = int(float(args[1]) * count)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible
+            first = self._first + step
+        else:
+            return
+        self._first = self._clamp_first(first, count)
+        self._render(count)
+
+    def _on_mousewheel(self, event):
+        self._scroll_by(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _scroll_by(self, rows):
+        count = self.row_count()
+        first = self._clamp_first(self._first + rows, count)
+        if first != self._first:
+            self._first = first
+            self._render(count)
+        return "break"
+
+    def _move_selection(self, step):
+        count = self.row_count()
+        if count == 0:
+            return "break"
+        current = self._first if self._selected is None else self._selected
+        self.select(max(0, min(count - 1, current + step)))
+        return "break"
+
+    def _on_tree_select(self, event):
+        sel = self.tree.selection()
+        if not sel or sel[0] not in self._slots:
+            return  # selection cleared by scrolling; keep the data index
+        index = self._first + self._slots.index(sel[0])
+        if index == self._selected:
+            return  # our own re-selection after a render
+        self._selected = index
+        self.event_generate("<<RowSelected>>")
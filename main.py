@@ -1,12 +1,21 @@
-import os
-import sys
-import tkinter as tk
-from tkinter import ttk
+import time
 
-from modules.rainfall.rainfall_tab import RainFallTab
-from modules.pool.pool_tab import PoolTestsTab
-from modules.pool.pool_test_db import PoolTestDB
-from modules.pool.desired_ranges import DesiredRanges
+_PROCESS_START = time.perf_counter()
+
+import os  # noqa: E402
+import sys  # noqa: E402
+import tkinter as tk  # noqa: E402
+from tkinter import ttk  # noqa: E402
+from typing import Optional  # noqa: E402
+
+from core.timing import PhaseTimer  # noqa: E402
+from modules.search.search_bar import SearchBar  # noqa: E402
+
+# Tab modules (and tkcalendar/dateutil behind them) are imported by the
+# tab factories the first time each tab is shown.
+
+# The daily online backup starts this long after first paint
+BACKUP_DELAY_MS = 5000
 
 
 def _base_dir() -> str:
@@ -20,7 +29,10 @@ def resource_path(name: str) -> str:
 
 
 class HomeMaintenanceApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, timer: Optional[PhaseTimer] = None, db_path: Optional[str] = None):
+        self.timer = timer or PhaseTimer()
+        self.timer.mark("app init")
+
         super().__init__()
 
         # ------------------------------------------------------------
@@ -38,13 +50,13 @@ class HomeMaintenanceApp(tk.Tk):
         # ------------------------------------------------------------
         # Shared database path
         # ------------------------------------------------------------
-        self.db_path = resource_path("home_maintenance.db")
+        self.db_path = db_path or resource_path("home_maintenance.db")
 
         # ------------------------------------------------------------
-        # Shared resources
+        # Notes search (above the tabs)
         # ------------------------------------------------------------
-        self.ranges = DesiredRanges(self.db_path).load()
-        self.pool_db = PoolTestDB(self.db_path)
+        self.search_bar = SearchBar(self, self.db_path, self._open_search_hit)
+        self.search_bar.pack(fill="x", padx=10, pady=(8, 0))
 
         # ------------------------------------------------------------
         # Notebook (tabs)
@@ -52,51 +64,145 @@ class HomeMaintenanceApp(tk.Tk):
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill="both", expand=True)
 
-        # Build tabs
-        self._build_rainfall_tab()
-        self._build_pool_tests_tab()
-        self._build_inventory_tab()
-        self._build_settings_tab()
+        # Tabs are registered as factories and built the first time they
+        # are selected; the initially selected tab is built right after
+        # the window's first paint.
+        self._tab_factories = {}   # frame widget name -> (label, factory)
+        self._tab_frames = {}      # label -> frame
+        self.rain_tab = None
+        self.pool_tab = None
+        self._add_lazy_tab("Rainfall", self._build_rainfall_tab)
+        self._add_lazy_tab("Pool Tests", self._build_pool_tests_tab)
+        self._add_lazy_tab("Charts", self._build_charts_tab)
+        self._add_lazy_tab("Inventory", self._build_inventory_tab)
+        self._add_lazy_tab("Settings", self._build_settings_tab)
+
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self.bind("<Map>", self._on_first_map)
+
+        self.timer.mark("window shell built")
 
     # ------------------------------------------------------------
-    # Rainfall Tab
+    # Lazy tabs
     # ------------------------------------------------------------
-    def _build_rainfall_tab(self):
+    def _add_lazy_tab(self, text, factory):
         frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Rainfall")
+        self.notebook.add(frame, text=text)
+        self._tab_factories[str(frame)] = (text, factory)
+        self._tab_frames[text] = frame
+
+    def _build_tab(self, tab_id):
+        """Run the factory for tab_id if that tab has not been built yet."""
+        entry = self._tab_factories.pop(tab_id, None)
+        if entry is None:
+            return
+        text, factory = entry
+        with self.timer.phase(f"build tab: {text}"):
+            factory(self.nametowidget(tab_id))
+
+    def _on_tab_changed(self, event):
+        if self.timer.first_paint_ms is None:
+            return  # the initial tab is built after first paint
+        self._build_tab(self.notebook.select())
+
+    def _on_first_map(self, event):
+        if event.widget is not self:
+            return
+        self.unbind("<Map>")
+        # Idle callbacks queued now run after the pending redraws
+        self.after_idle(self._on_first_paint)
+
+    def _on_first_paint(self):
+        self.timer.mark_first_paint()
+        self._build_tab(self.notebook.select())
+        self.timer.print_report()
+        self.after(BACKUP_DELAY_MS, self._backup_if_due)
 
-        rain_tab = RainFallTab(frame)
-        rain_tab.pack(fill="both", expand=True)
+    # ------------------------------------------------------------
+    # Backups
+    # ------------------------------------------------------------
+    def _backup_if_due(self):
+        """Start the daily backup (core.backup) in the background if one is due."""
+        from core.backup import backup_if_due
+        from core.db_worker import TkBridge
+
+        future = backup_if_due(self.db_path)
+        if future is not None:
+            self._backup_bridge = TkBridge(self, on_error=self._on_backup_error)
+            self._backup_bridge.deliver(future, lambda _result: None)
+
+    def _on_backup_error(self, exc):
+        from tkinter import messagebox
+
+        messagebox.showwarning("Backup failed", str(exc))
+
+    def _show_tab(self, text):
+        """Build (if needed) and select the tab labelled `text`."""
+        frame = self._tab_frames[text]
+        self._build_tab(str(frame))
+        self.notebook.select(frame)
+
+    # ------------------------------------------------------------
+    # Search hits
+    # ------------------------------------------------------------
+    def _open_search_hit(self, hit):
+        from modules.search.notes_search import RAINFALL
+
+        if hit.kind == RAINFALL:
+            self._show_tab("Rainfall")
+            if hit.day is not None:
+                self.rain_tab.show_date(hit.day)
+        else:
+            self._show_tab("Pool Tests")
+            self.pool_tab.show_test(hit.ref_id)
+
+    # ------------------------------------------------------------
+    # Rainfall Tab
+    # ------------------------------------------------------------
+    def _build_rainfall_tab(self, frame):
+        from modules.rainfall.rainfall_tab import RainFallTab
+
+        self.rain_tab = RainFallTab(frame, self.db_path)
+        self.rain_tab.pack(fill="both", expand=True)
 
     # ------------------------------------------------------------
     # Pool Tests Tab
     # ------------------------------------------------------------
-    def _build_pool_tests_tab(self):
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Pool Tests")
+    def _build_pool_tests_tab(self, frame):
+        from modules.pool.pool_tab import PoolTestsTab
+        from modules.pool.pool_test_db import PoolTestDB
+        from modules.pool.desired_ranges import DesiredRanges
+
+        self.ranges = DesiredRanges(self.db_path).load()
+        self.pool_db = PoolTestDB(self.db_path)
 
-        pool_tab = PoolTestsTab(frame, self.pool_db, self.ranges)
-        pool_tab.pack(fill="both", expand=True)
+        self.pool_tab = PoolTestsTab(frame, self.pool_db, self.ranges)
+        self.pool_tab.pack(fill="both", expand=True)
 
     # ------------------------------------------------------------
-    # Inventory Placeholder
+    # Charts Tab
     # ------------------------------------------------------------
-    def _build_inventory_tab(self):
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Inventory")
+    def _build_charts_tab(self, frame):
+        from modules.charts.charts_tab import ChartsTab
 
+        charts_tab = ChartsTab(frame, self.db_path)
+        charts_tab.pack(fill="both", expand=True)
+
+    # ------------------------------------------------------------
+    # Inventory Placeholder
+    # ------------------------------------------------------------
+    def _build_inventory_tab(self, frame):
         ttk.Label(frame, text="Inventory module coming soon…").pack(pady=20)
 
     # ------------------------------------------------------------
     # Settings Placeholder
     # ------------------------------------------------------------
-    def _build_settings_tab(self):
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Settings")
-
+    def _build_settings_tab(self, frame):
         ttk.Label(frame, text="Settings module coming soon…").pack(pady=20)
 
 
 if __name__ == "__main__":
-    app = HomeMaintenanceApp()
+    timer = PhaseTimer(_PROCESS_START)
+    timer.mark("imports done")
+    app = HomeMaintenanceApp(timer)
     app.mainloop()
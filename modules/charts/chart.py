@@ -0,0 +1,361 @@
+#---------------------------------------------------------------------
+# TIME SERIES CHART
+# Canvas chart of DecimatedSeries layers over a date axis, with
+# drag-to-pan and wheel zoom.
+#---------------------------------------------------------------------
+
+import math
+import time
+import tkinter as tk
+from datetime import date
+from tkinter import ttk
+from typing import List, NamedTuple, Optional, Tuple
+
+from .series import BARS, DecimatedSeries
+
+
+FONT = ("Segoe UI", 8)
+BACKGROUND = "#FFFFFF"
+AXIS_COLOUR = "#808080"
+GRID_COLOUR = "#EBEBEB"
+MARGIN_LEFT = 56
+MARGIN_RIGHT = 56
+MARGIN_TOP = 20
+MARGIN_BOTTOM = 24
+TICK_SPACING = 90        # minimum pixels between x-axis labels
+Y_TICKS = 5
+ZOOM_STEP = 1.25         # per wheel notch
+MIN_SPAN = 14.0          # days
+FRAME_BUDGET_MS = 16.0   # one frame at 60 Hz
+
+
+class ChartLayer(NamedTuple):
+    series: DecimatedSeries
+    colour: str
+    label: str
+    axis: str = "left"   # "left" or "right"
+
+
+class ChartBand(NamedTuple):
+    low: float
+    high: float
+    colour: str
+    axis: str = "left"
+
+
+# ------------------------------------------------------------
+# Axis ticks
+# ------------------------------------------------------------
+_YEAR_STEPS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+_MONTH_STEPS = (1, 2, 3, 6)
+_DAY_STEPS = (1, 2, 7, 14)
+
+
+def date_ticks(x0: float, x1: float, max_ticks: int) -> List[Tuple[float, str]]:
+    """(ordinal, label) ticks on whole days, months or years between x0 and x1."""
+    max_ticks = max(1, max_ticks)
+    lo = date.fromordinal(max(1, int(x0)))
+    hi = date.fromordinal(max(1, min(date.max.toordinal(), int(x1))))
+    span = x1 - x0
+
+    if span / 365.25 > max_ticks / 2:
+        step = next((s for s in _YEAR_STEPS if span / 365.25 / s <= max_ticks), _YEAR_STEPS[-1])
+        first = (lo.year + step - 1) // step * step
+        return [
+            (date(y, 1, 1).toordinal(), str(y))
+            for y in range(max(1, first), hi.year + 1, step)
+            if x0 <= date(y, 1, 1).toordinal() <= x1
+        ]
+
+    if span / 30.44 > max_ticks / 2:
+        step = next((s for s in _MONTH_STEPS if span / 30.44 / s <= max_ticks), 12)
+        ticks = []
+        m = lo.year * 12 + lo.month - 1
+        m += -m % step
+        while True:
+            d = date(m // 12, m % 12 + 1, 1)
+            if d > hi:
+                return ticks
+            if d.toordinal() >= x0:
+                ticks.append((d.toordinal(), d.strftime("%b %Y")))
+            m += step
+
+    step = next((s for s in _DAY_STEPS if span / s <= max_ticks), 28)
+    first = int(x0) + (-int(x0) % step)
+    return [
+        (x, date.fromordinal(x).strftime("%d %b"))
+        for x in range(max(1, first), min(int(x1), date.max.toordinal()) + 1, step)
+    ]
+
+
+def value_ticks(lo: float, hi: float, count: int = Y_TICKS) -> List[float]:
+    """About `count` round values (1, 2 or 5 x 10^k apart) covering lo..hi."""
+    span = hi - lo
+    if span <= 0:
+        return [lo]
+    raw = span / max(1, count - 1)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw * (1 - 1e-9))
+    first = -(-lo // step) * step
+    ticks = []
+    v = first
+    while v <= hi + step * 1e-9:
+        ticks.append(round(v, 10) + 0.0)   # no "-0"
+        v += step
+    return ticks
+
+
+class TimeSeriesChart(ttk.Frame):
+    """
+    Draws DecimatedSeries layers (bars or a line) against a date axis
+    (x = date ordinals) on a Canvas, with up to two value axes.
+
+    Each render asks every series for a window of at most ~2 points per
+    pixel (see DecimatedSeries.window), so a frame costs the same for a
+    year or a million days of data. Canvas items are created once per
+    layer and moved with coords(); renders triggered by pan/zoom events
+    are coalesced to one per idle cycle. Render cost is measured: see
+    last_render and ms_per_frame(), against FRAME_BUDGET_MS.
+
+    Drag to pan, mouse wheel to zoom about the pointer, double-click to
+    show everything.
+    """
+
+    def __init__(self, parent, height: int = 240, title: str = ""):
+        super().__init__(parent)
+
+        self.title = title
+        self.layers: List[ChartLayer] = []
+        self.band: Optional[ChartBand] = None
+        self.view: Tuple[float, float] = (0.0, 1.0)   # visible x range
+        self._bounds: Tuple[float, float] = (0.0, 1.0)
+        self._items = []            # per layer canvas item id
+        self._band_item = None
+        self._pending = None        # after_idle id of a queued render
+        self._drag_x = None
+
+        # (points drawn, seconds) for the most recent render
+        self.last_render: Tuple[int, float] = (0, 0.0)
+
+        self.canvas = tk.Canvas(self, background=BACKGROUND, highlightthickness=0,
+                                height=height)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self.request_render())
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+        self.canvas.bind("<Double-Button-1>", lambda e: self.show_all())
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self.zoom(1 / ZOOM_STEP, e.x))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom(ZOOM_STEP, e.x))
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def set_layers(self, layers: List[ChartLayer], band: Optional[ChartBand] = None,
+                   keep_view: bool = False):
+        """Replace what is drawn; shows all data unless keep_view."""
+        c = self.canvas
+        c.delete("series")
+        self.layers = list(layers)
+        self.band = band
+        self._band_item = c.create_rectangle(0, 0, 0, 0, fill=band.colour, width=0,
+                                             tags="series") if band else None
+        self._items = [
+            c.create_polygon(0, 0, 0, 0, 0, 0, fill=layer.colour, outline="", tags="series")
+            if layer.series.mode == BARS else
+            c.create_line(0, 0, 0, 0, fill=layer.colour, width=1.5, tags="series")
+            for layer in self.layers
+        ]
+
+        ranges = [layer.series.x_range for layer in self.layers if len(layer.series)]
+        if ranges:
+            lo = min(r[0] for r in ranges)
+            hi = max(r[1] for r in ranges) + 1
+            self._bounds = (lo, max(hi, lo + MIN_SPAN))
+        else:
+            self._bounds = (0.0, 1.0)
+
+        if keep_view:
+            self.set_view(*self.view)
+        else:
+            self.show_all()
+
+    def set_view(self, x0: float, x1: float):
+        """Show x0..x1, clamped to the data (and at least MIN_SPAN wide)."""
+        lo, hi = self._bounds
+        span = min(max(x1 - x0, MIN_SPAN), hi - lo)
+        x0 = min(max(x0, lo), hi - span)
+        self.view = (x0, x0 + span)
+        self.request_render()
+
+    def show_all(self):
+        self.set_view(*self._bounds)
+
+    def zoom(self, factor: float, anchor_px: Optional[int] = None):
+        """Scale the visible span by `factor` (<1 zooms in) about a pixel x."""
+        x0, x1 = self.view
+        plot_w = self._plot_width()
+        frac = 0.5 if anchor_px is None else min(max((anchor_px - MARGIN_LEFT) / plot_w, 0.0), 1.0)
+        anchor = x0 + (x1 - x0) * frac
+        span = (x1 - x0) * factor
+        self.set_view(anchor - span * frac, anchor - span * frac + span)
+
+    def pan(self, dx_px: float):
+        """Move the view by dx_px pixels (positive = earlier dates)."""
+        x0, x1 = self.view
+        dx = (x1 - x0) * dx_px / self._plot_width()
+        self.set_view(x0 - dx, x1 - dx)
+
+    def request_render(self):
+        if self._pending is None:
+            self._pending = self.after_idle(self.render)
+
+    def ms_per_frame(self) -> float:
+        return self.last_render[1] * 1000
+
+    def over_budget(self) -> bool:
+        return self.ms_per_frame() > FRAME_BUDGET_MS
+
+    # ------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------
+    def _plot_width(self) -> int:
+        return max(1, self.canvas.winfo_width() - MARGIN_LEFT - MARGIN_RIGHT)
+
+    def render(self):
+        self._pending = None
+        start = time.perf_counter()
+        c = self.canvas
+        width = c.winfo_width()
+        height = c.winfo_height()
+        plot_w = self._plot_width()
+        plot_h = max(1, height - MARGIN_TOP - MARGIN_BOTTOM)
+        left, top = MARGIN_LEFT, MARGIN_TOP
+        bottom = top + plot_h
+
+        x0, x1 = self.view
+        sx = plot_w / (x1 - x0)
+
+        # Fetch every window first: the value axes scale to what is visible
+        windows = [layer.series.window(x0, x1, plot_w) for layer in self.layers]
+        extents = {}
+        for layer, w in zip(self.layers, windows):
+            if len(w.ys):
+                lo, hi = min(w.ys), max(w.ys)
+                if layer.series.mode == BARS:
+                    lo = min(lo, 0.0)   # bars stand on zero
+                if layer.axis in extents:
+                    lo = min(lo, extents[layer.axis][0])
+                    hi = max(hi, extents[layer.axis][1])
+                extents[layer.axis] = (lo, hi)
+        if self.band is not None and self.band.axis in extents:
+            lo, hi = extents[self.band.axis]
+            extents[self.band.axis] = (min(lo, self.band.low), max(hi, self.band.high))
+        scales = {}
+        for axis, (lo, hi) in extents.items():
+            pad = 0.05 * ((hi - lo) or abs(hi) or 1.0)
+            lo = lo if lo == 0 else lo - pad
+            hi = hi + pad
+            scales[axis] = (lo, plot_h / (hi - lo))
+
+        drawn = 0
+        for layer, w, item in zip(self.layers, windows, self._items):
+            if layer.axis not in scales or len(w.xs) == 0:
+                c.itemconfigure(item, state="hidden")
+                continue
+            y_lo, sy = scales[layer.axis]
+            if layer.series.mode == BARS:
+                # One skyline polygon: bar tops joined, dropping to the
+                # baseline only across gaps, so it never self-intersects
+                base = bottom + y_lo * sy
+                bar_px = w.bar_width * sx
+                coords = []
+                edge = None   # right edge of the previous bar
+                for x, y in zip(w.xs, w.ys):
+                    px0 = left + (x - x0) * sx
+                    py = bottom - (y - y_lo) * sy
+                    if edge is None:
+                        coords += (px0, base)
+                    elif px0 > edge:
+                        coords += (edge, base, px0, base)
+                    else:
+                        px0 = edge
+                    edge = px0 + bar_px
+                    coords += (px0, py, edge, py)
+                coords += (edge, base)
+            else:
+                coords = []
+                for x, y in zip(w.xs, w.ys):
+                    coords += (left + (x - x0) * sx, bottom - (y - y_lo) * sy)
+                if len(coords) == 2:
+                    coords += coords   # a single point: zero-length line
+            c.coords(item, coords)
+            c.itemconfigure(item, state="normal")
+            drawn += len(w.xs)
+
+        if self._band_item is not None:
+            if self.band.axis in scales:
+                y_lo, sy = scales[self.band.axis]
+                c.coords(self._band_item, left, bottom - (self.band.high - y_lo) * sy,
+                         left + plot_w, bottom - (self.band.low - y_lo) * sy)
+                c.tag_lower(self._band_item)
+            else:
+                c.coords(self._band_item, 0, 0, 0, 0)
+
+        self._draw_axes(width, height, plot_w, plot_h, scales)
+        self.last_render = (drawn, time.perf_counter() - start)
+
+    def _draw_axes(self, width, height, plot_w, plot_h, scales):
+        """Margins (masking the off-plot ends of the series), ticks and labels."""
+        c = self.canvas
+        c.delete("axis")
+        left, top = MARGIN_LEFT, MARGIN_TOP
+        right, bottom = left + plot_w, top + plot_h
+
+        for box in ((0, 0, left, height), (right, 0, width, height)):
+            c.create_rectangle(*box, fill=BACKGROUND, width=0, tags="axis")
+        c.create_rectangle(left, top, right, bottom, outline=AXIS_COLOUR, tags="axis")
+        if self.title:
+            c.create_text(left, top // 2, text=self.title, anchor="w", font=FONT, tags="axis")
+
+        x0, x1 = self.view
+        sx = plot_w / (x1 - x0)
+        for x, label in date_ticks(x0, x1, plot_w // TICK_SPACING):
+            px = left + (x - x0) * sx
+            c.create_line(px, top, px, bottom, fill=GRID_COLOUR, tags=("axis", "grid"))
+            c.create_text(px, bottom + 4, text=label, anchor="n", font=FONT, tags="axis")
+
+        for axis, (y_lo, sy) in scales.items():
+            colour = next((l.colour for l in self.layers if l.axis == axis), AXIS_COLOUR)
+            label = " / ".join(l.label for l in self.layers if l.axis == axis)
+            px, anchor = (left - 4, "e") if axis == "left" else (right + 4, "w")
+            for v in value_ticks(y_lo, y_lo + plot_h / sy):
+                py = bottom - (v - y_lo) * sy
+                c.create_text(px, py, text=f"{v:g}", anchor=anchor, font=FONT,
+                              fill=colour, tags="axis")
+            c.create_text(px, top // 2, text=label, anchor=anchor, font=FONT,
+                          fill=colour, tags="axis")
+        c.tag_lower("grid")
+        if self._band_item is not None:
+            c.tag_lower(self._band_item)
+
+    # ------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------
+    def _on_press(self, event):
+        self.canvas.focus_set()
+        self._drag_x = event.x
+
+    def _on_drag(self, event):
+        if self._drag_x is not None:
+            self.pan(event.x - self._drag_x)
+            self._drag_x = event.x
+
+    def _on_release(self, event):
+        self._drag_x = None
+
+    def _on_mousewheel(self, event):
+        self.zoom(1 / ZOOM_STEP if event.delta > 0 else ZOOM_STEP, event.x)
+        return "break"
@@ -0,0 +1,138 @@
+#---------------------------------------------------------------------
+# CHARTS TAB
+# Rainfall bars with the moisture line, and the trend of one pool
+# parameter against its desired range.
+#---------------------------------------------------------------------
+
+from datetime import date
+from typing import Dict, Tuple
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from core.db_worker import TkBridge, get_executor
+from modules.pool.classifier import PARAMETERS
+from modules.pool.desired_ranges import DesiredRanges
+from modules.pool.pool_test_db import PoolTestDB
+from modules.rainfall.rainfall_db import RainfallDB
+from modules.rainfall.rainfall_store import RainfallStore
+
+from .chart import ChartBand, ChartLayer, TimeSeriesChart
+from .series import BARS, LINE, DecimatedSeries
+
+
+RAIN_COLOUR = "#1E90FF"       # dodger blue
+MOISTURE_COLOUR = "#8B4513"   # saddle brown
+POOL_COLOUR = "#006400"       # dark green
+BAND_COLOUR = "#E3F2E3"       # desired range
+
+
+# ------------------------------------------------------------
+# Loaders (run on the DB worker threads)
+# ------------------------------------------------------------
+def load_rainfall_series(db_path: str) -> Tuple[DecimatedSeries, DecimatedSeries]:
+    """(effective rain bars, moisture line), decimation levels prebuilt."""
+    store = RainfallStore.from_rows(RainfallDB(db_path).list_rows())
+    rain = DecimatedSeries(store.days, store.eff, BARS)
+    moisture = DecimatedSeries(store.days, store.moisture, LINE)
+    rain.build_levels()
+    moisture.build_levels()
+    return rain, moisture
+
+
+def load_pool_series(db_path: str) -> Tuple[Dict[str, DecimatedSeries], dict]:
+    """({item name: trend line}, desired ranges), oldest test first."""
+    tests = list(PoolTestDB(db_path).iter_range(date.min, date.max))
+    days = [t.test_date.toordinal() for t in tests]
+    series = {}
+    for name, attr in PARAMETERS:
+        values = [getattr(t, attr) for t in tests]
+        values = [float("nan") if v is None else float(v) for v in values]
+        series[name] = DecimatedSeries(days, values, LINE)
+        series[name].build_levels()
+    return series, DesiredRanges(db_path).load()
+
+
+class ChartsTab(ttk.Frame):
+    """
+    Two TimeSeriesCharts fed from the rainfall and pool tables. Data is
+    loaded and decimated on the DB worker threads; the Tk thread only
+    slices cached levels and draws. Use Reload after editing data in
+    the other tabs.
+    """
+
+    def __init__(self, parent, db_path: str):
+        super().__init__(parent)
+
+        self.db_path = db_path
+        self.pool_series: Dict[str, DecimatedSeries] = {}
+        self.ranges = {}
+
+        self.worker = get_executor(db_path)
+        self.bridge = TkBridge(self, on_error=self._on_db_error)
+
+        self._build_ui()
+        self.reload()
+
+    def destroy(self):
+        self.bridge.cancel()
+        super().destroy()
+
+    def _on_db_error(self, exc):
+        messagebox.showerror("Database error", str(exc))
+
+    # ------------------------------------------------------------
+    # UI Layout
+    # ------------------------------------------------------------
+    def _build_ui(self):
+        bar = ttk.Frame(self)
+        bar.pack(fill="x", padx=10, pady=5)
+
+        ttk.Button(bar, text="Reload", command=self.reload).pack(side="left")
+        ttk.Label(bar, text="Pool parameter:").pack(side="left", padx=(15, 5))
+        self.parameter = tk.StringVar(value=PARAMETERS[0][0])
+        combo = ttk.Combobox(bar, textvariable=self.parameter, state="readonly", width=30,
+                             values=[name for name, _attr in PARAMETERS])
+        combo.pack(side="left")
+        combo.bind("<<ComboboxSelected>>", lambda e: self._show_pool_parameter())
+        ttk.Label(bar, text="Drag to pan, wheel to zoom, double-click to show all",
+                  foreground="#808080").pack(side="right")
+
+        self.rain_chart = TimeSeriesChart(self, title="Rainfall and soil moisture")
+        self.rain_chart.pack(fill="both", expand=True, padx=10, pady=5)
+        self.pool_chart = TimeSeriesChart(self, title="Pool chemistry")
+        self.pool_chart.pack(fill="both", expand=True, padx=10, pady=5)
+
+    # ------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------
+    def reload(self):
+        self.bridge.deliver(
+            self.worker.submit_read(load_rainfall_series, self.db_path), self._show_rainfall
+        )
+        self.bridge.deliver(
+            self.worker.submit_read(load_pool_series, self.db_path), self._on_pool_loaded
+        )
+
+    def _show_rainfall(self, result):
+        rain, moisture = result
+        self.rain_chart.set_layers([
+            ChartLayer(rain, RAIN_COLOUR, "Rain (mm)"),
+            ChartLayer(moisture, MOISTURE_COLOUR, "Moisture", axis="right"),
+        ], keep_view=bool(self.rain_chart.layers))
+
+    def _on_pool_loaded(self, result):
+        self.pool_series, self.ranges = result
+        self._show_pool_parameter(keep_view=bool(self.pool_chart.layers))
+
+    def _show_pool_parameter(self, keep_view: bool = True):
+        name = self.parameter.get()
+        series = self.pool_series.get(name)
+        if series is None:
+            return
+        r = self.ranges.get(name)
+        band = None
+        if r and r["low"] is not None and r["high"] is not None:
+            band = ChartBand(r["low"], r["high"], BAND_COLOUR)
+        self.pool_chart.set_layers([ChartLayer(series, POOL_COLOUR, name)], band,
+                                   keep_view=keep_view)
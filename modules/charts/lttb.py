@@ -0,0 +1,64 @@
+#---------------------------------------------------------------------
+# DOWNSAMPLING
+# Largest-Triangle-Three-Buckets for lines and max-pooling for bars,
+# over x-sorted array('d') columns.
+#---------------------------------------------------------------------
+
+from array import array
+from typing import Sequence, Tuple
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> Tuple[array, array]:
+    """
+    Reduce (xs, ys) to `threshold` points with Largest-Triangle-Three-
+    Buckets: keep the first and last points and, from each bucket in
+    between, the point forming the largest triangle with the previously
+    kept point and the average of the next bucket. Peaks and troughs
+    survive, unlike with every-nth-point sampling. xs must be sorted and
+    ys free of NaN.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return array("d", xs), array("d", ys)
+
+    out_x = array("d", [xs[0]])
+    out_y = array("d", [ys[0]])
+    every = (n - 2) / (threshold - 2)
+    a = 0   # index of the last kept point
+
+    for i in range(threshold - 2):
+        # Average of the next bucket (the last point for the final bucket)
+        lo = int((i + 1) * every) + 1
+        hi = min(int((i + 2) * every) + 1, n)
+        count = hi - lo
+        avg_x = sum(xs[lo:hi]) / count
+        avg_y = sum(ys[lo:hi]) / count
+
+        # Twice the triangle area for point j is |A*y_j + B*x_j + C|
+        ax, ay = xs[a], ys[a]
+        A = ax - avg_x
+        B = avg_y - ay
+        C = -A * ay - B * ax
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        areas = [abs(A * y + B * x + C) for x, y in zip(xs[start:end], ys[start:end])]
+        a = start + areas.index(max(areas))
+        out_x.append(xs[a])
+        out_y.append(ys[a])
+
+    out_x.append(xs[n - 1])
+    out_y.append(ys[n - 1])
+    return out_x, out_y
+
+
+def max_pool_pairs(xs: Sequence[float], ys: Sequence[float]) -> Tuple[array, array]:
+    """
+    Halve a bar series: each pair of bars becomes one bar at the first
+    bar's x with the larger height, so no peak is lost.
+    """
+    out_x = array("d", xs[0::2])
+    out_y = array("d", map(max, ys[0::2], ys[1::2]))
+    if len(ys) % 2:
+        out_y.append(ys[-1])   # unpaired last bar
+    return out_x, out_y
@@ -0,0 +1,142 @@
+#---------------------------------------------------------------------
+# DECIMATED SERIES
+# An x-sorted series plus cached downsampled copies per zoom level, so
+# a chart can fetch ~2 points per pixel for any view.
+#---------------------------------------------------------------------
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, NamedTuple, Sequence, Tuple
+
+from .lttb import lttb, max_pool_pairs
+
+
+LINE = "line"
+BARS = "bars"
+
+POINTS_PER_PIXEL = 2     # a window returns at most this many points per pixel
+MIN_LINE_LEVEL = 8       # coarser zooms are served from cached LTTB levels
+MIN_LEVEL_POINTS = 64    # stop halving once a level is this small
+
+
+class SeriesWindow(NamedTuple):
+    xs: array
+    ys: array
+    level: int           # raw points per returned point (1 = raw data)
+    bar_width: float     # x units per bar at this level (bars only)
+
+
+class DecimatedSeries:
+    """
+    A chart series of (x, y) points, x sorted, y NaN = no value (dropped).
+
+    Zoom levels are powers of two of raw points per drawn point. Each
+    level is decimated once from the next finer one and cached, so
+    zooming out far costs a slice of a cached level and panning at a
+    zoom costs a binary search and a slice, never a pass over the data:
+
+    - LINE series use Largest-Triangle-Three-Buckets. Levels start at
+      MIN_LINE_LEVEL; closer zooms run LTTB over just the visible raw
+      points (fewer than MIN_LINE_LEVEL * 2 per pixel).
+    - BARS series use pairwise max, so the tallest bar in a bucket is
+      always the one drawn. `bar_width` is the x width of a raw bar.
+
+    Levels are built on first use; build_levels() builds them all up
+    front (e.g. on a worker thread while the data loads).
+    """
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float], mode: str = LINE,
+                 bar_width: float = 1.0):
+        if mode not in (LINE, BARS):
+            raise ValueError(f"unknown series mode {mode!r}")
+        self.mode = mode
+        self.bar_width = bar_width
+        self.xs = array("d")
+        self.ys = array("d")
+        for x, y in zip(xs, ys):
+            if y == y:   # not NaN
+                self.xs.append(x)
+                self.ys.append(y)
+        self._levels: Dict[int, Tuple[array, array]] = {1: (self.xs, self.ys)}
+
+    def __len__(self):
+        return len(self.xs)
+
+    @property
+    def x_range(self) -> Tuple[float, float]:
+        if not self.xs:
+            return 0.0, 0.0
+        return self.xs[0], self.xs[-1]
+
+    # ------------------------------------------------------------
+    # Levels
+    # ------------------------------------------------------------
+    def _first_level(self) -> int:
+        return MIN_LINE_LEVEL if self.mode == LINE else 2
+
+    def level(self, factor: int) -> Tuple[array, array]:
+        """
+        The cached copy with ~1 point per `factor` raw points: a power of
+        two, at least MIN_LINE_LEVEL for lines and 2 for bars.
+        """
+        cached = self._levels.get(factor)
+        if cached is not None:
+            return cached
+
+        first = self._first_level()
+        if factor <= first:
+            source, ratio = self._levels[1], first
+        else:
+            source, ratio = self.level(factor // 2), 2
+
+        if self.mode == LINE:
+            result = lttb(source[0], source[1], max(3, len(source[0]) // ratio))
+        else:
+            result = max_pool_pairs(source[0], source[1])
+        self._levels[factor] = result
+        return result
+
+    def max_level(self) -> int:
+        """The coarsest level worth building (still >= MIN_LEVEL_POINTS)."""
+        factor = self._first_level()
+        while len(self.xs) // (factor * 2) >= MIN_LEVEL_POINTS:
+            factor *= 2
+        return factor
+
+    def build_levels(self):
+        self.level(self.max_level())
+
+    def cached_levels(self):
+        return sorted(self._levels)
+
+    # ------------------------------------------------------------
+    # Windows
+    # ------------------------------------------------------------
+    def window(self, x0: float, x1: float, width_px: int) -> SeriesWindow:
+        """
+        Points covering x0..x1 (plus one on each side, so lines run to
+        the edges) at no more than POINTS_PER_PIXEL per pixel.
+        """
+        xs, ys = self.xs, self.ys
+        i0 = max(0, bisect_left(xs, x0) - 1)
+        i1 = min(len(xs), bisect_right(xs, x1) + 1)
+        budget = max(1, width_px) * POINTS_PER_PIXEL
+        visible = i1 - i0
+
+        if visible <= budget:
+            return SeriesWindow(xs[i0:i1], ys[i0:i1], 1, self.bar_width)
+
+        # Smallest power-of-two level that fits the budget
+        factor = 1 << math.ceil(math.log2(visible / budget))
+        factor = min(factor, self.max_level())
+
+        if factor < self._first_level():
+            # Close zoom on a line: decimate just the visible points
+            wx, wy = lttb(xs[i0:i1], ys[i0:i1], budget)
+            return SeriesWindow(wx, wy, factor, self.bar_width)
+
+        lx, ly = self.level(factor)
+        j0 = max(0, bisect_left(lx, x0) - 1)
+        j1 = min(len(lx), bisect_right(lx, x1) + 1)
+        return SeriesWindow(lx[j0:j1], ly[j0:j1], factor, self.bar_width * factor)
@@ -0,0 +1,141 @@
+#---------------------------------------------------------------------
+# COMPILED CLASSIFIER
+# Desired ranges compiled once into per-parameter bands, applied a whole
+# column of pool tests at a time.
+#---------------------------------------------------------------------
+
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from modules.pool.pool_test import PoolTest
+
+
+# Status codes (index into STATUS_NAMES), as stored in a StatusMatrix and
+# in the pool_test_status table
+UNKNOWN, IN_RANGE, SLIGHTLY_HIGH, HIGH, SLIGHTLY_LOW, LOW = range(6)
+STATUS_NAMES = ("unknown", "in_range", "slightly_high", "high", "slightly_low", "low")
+
+# (desired_ranges item name, PoolTest attribute), in PoolTest.apply_ranges order
+PARAMETERS = (
+    ("Free Chlorine (ppm)", "free_chlorine"),
+    ("Combined Chlorine (ppm)", "combined_chlorine"),
+    ("Total Chlorine (ppm)", "total_chlorine"),
+    ("Salt Level (ppm)", "salt_level"),
+    ("Alkalinity (ppm)", "alkalinity"),
+    ("pH", "ph"),
+    ("Sunscreen (Stabiliser) (ppm)", "sunscreen"),
+    ("Total Hardness (ppm)", "hardness"),
+    ("Phosphates (ppm)", "phosphates"),
+    ("Copper Total (ppm)", "copper"),
+)
+
+
+# A test's codes packed into one int, STATUS_BITS per parameter (parameter
+# j at bit STATUS_BITS * j); this is how pool_test_status is read back.
+STATUS_BITS = 3
+_STATUS_MASK = (1 << STATUS_BITS) - 1
+
+
+def pack_statuses(codes: Sequence[int]) -> int:
+    packed = 0
+    for j, code in enumerate(codes):
+        packed |= code << (STATUS_BITS * j)
+    return packed
+
+
+def unpack_statuses(packed: int, width: int = len(PARAMETERS)) -> Tuple[int, ...]:
+    return tuple((packed >> (STATUS_BITS * j)) & _STATUS_MASK for j in range(width))
+
+
+class Band(NamedTuple):
+    low: float
+    high: float
+    acceptable_low: float
+    acceptable_high: float
+
+    @classmethod
+    def from_range(cls, low: float, high: float, factor_warn: float) -> "Band":
+        # Same arithmetic as classify_value, so boundaries compare identically
+        return cls(low, high, low - (factor_warn * low), high + (factor_warn * high))
+
+
+class StatusMatrix:
+    """
+    Status codes for n tests x len(names) parameters, row-major in one
+    array('b') (one byte per cell).
+    """
+
+    def __init__(self, codes: array, names: Sequence[str]):
+        self.codes = codes
+        self.names = tuple(names)
+        self.width = len(self.names)
+
+    def __len__(self):
+        return len(self.codes) // self.width if self.width else 0
+
+    def code(self, row: int, col: int) -> int:
+        return self.codes[row * self.width + col]
+
+    def row(self, row: int) -> array:
+        start = row * self.width
+        return self.codes[start:start + self.width]
+
+    def as_dict(self, row: int) -> Dict[str, str]:
+        """One test's statuses in PoolTest.classifications form."""
+        return {name: STATUS_NAMES[c] for name, c in zip(self.names, self.row(row))}
+
+
+class CompiledClassifier:
+    """
+    classify_value() for every parameter of many tests at once.
+
+    Bands (including the factor_warn margins) are computed once from the
+    ranges dict returned by DesiredRanges.load(); parameters without a
+    range classify as "unknown", as in PoolTest.apply_ranges().
+
+        classifier = CompiledClassifier(ranges)
+        matrix = classifier.classify_tests(tests)
+        matrix.as_dict(0)   # == tests[0].apply_ranges(ranges) result
+    """
+
+    def __init__(self, ranges: Dict[str, Dict[str, float]], parameters=PARAMETERS):
+        self.parameters = tuple(parameters)
+        self.names = tuple(name for name, _attr in self.parameters)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.bands: List[Optional[Band]] = [
+            Band.from_range(r["low"], r["high"], r["factor_warn"]) if r is not None else None
+            for r in (ranges.get(name) for name in self.names)
+        ]
+
+    def classify_column(self, col: int, values: Iterable[float]) -> array:
+        """Status codes for one parameter across many values."""
+        band = self.bands[col]
+        if band is None:
+            return array("b", (UNKNOWN for _ in values))
+        low, high, a_low, a_high = band
+        # Checks in classify_value order; NaN falls through to UNKNOWN
+        return array("b", (
+            IN_RANGE if low <= v <= high else
+            SLIGHTLY_HIGH if high < v <= a_high else
+            HIGH if v > a_high else
+            SLIGHTLY_LOW if a_low <= v < low else
+            LOW if v < a_low else
+            UNKNOWN
+            for v in values
+        ))
+
+    def classify_columns(self, columns: Sequence[Sequence[float]]) -> StatusMatrix:
+        """
+        Classify column-major input (columns[j] holds parameter j for every
+        test) into a row-major StatusMatrix.
+        """
+        width = len(self.names)
+        n = len(columns[0]) if columns else 0
+        codes = array("b", bytes(n * width))
+        for j, values in enumerate(columns):
+            codes[j::width] = self.classify_column(j, values)
+        return StatusMatrix(codes, self.names)
+
+    def classify_tests(self, tests: Sequence[PoolTest]) -> StatusMatrix:
+        columns = [[getattr(t, attr) for t in tests] for _name, attr in self.parameters]
+        return self.classify_columns(columns)
@@ -1,6 +1,8 @@
-import sqlite3
 from typing import Dict
 
+from core.db_connection import get_connection
+from core.migrations import ensure_schema
+
 
 class DesiredRanges:
     """
@@ -10,22 +12,17 @@ class DesiredRanges:
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        ensure_schema(db_path)
         self.ranges = {}  # item_name → {low, high, factor_warn}
 
     # ------------------------------------------------------------
     # Load all ranges from SQLite
     # ------------------------------------------------------------
     def load(self):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-
-        cur.execute("""
+        rows = get_connection(self.db_path).execute("""
             SELECT item_name, low_value, high_value, factor_warn
             FROM desired_ranges
-        """)
-
-        rows = cur.fetchall()
-        conn.close()
+        """).fetchall()
 
         self.ranges = {
             item: {
@@ -1,25 +1,11 @@
 # ---------------------------------------------------------------------
 # Next Planned Test Date Module
 # ---------------------------------------------------------------------
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
+from datetime import datetime
 
-
-def next_planned_test_date(d):
-    """
-    Reproduces the Excel VBA logic exactly:
-
-    1. Add one month to the test date.
-    2. Move forward to the first Tuesday on or after that date.
-    """
-    base = d + relativedelta(months=+1)
-    next_date = base
-
-    # Python weekday(): Monday=0, Tuesday=1
-    while next_date.weekday() != 1:
-        next_date += timedelta(days=1)
-
-    return next_date
+# Closed-form, memoized implementation (see schedule.py); kept importable
+# from here for existing callers.
+from modules.pool.schedule import next_planned_test_date  # noqa: F401
 
 
 # ---------------------------------------------------------------------
@@ -0,0 +1,146 @@
+#---------------------------------------------------------------------
+# POOL TEST EXCEL IMPORT
+# Streams the "Pool Test Log" sheet of Swimming_Pool_Manager.xlsm into
+# pool_tests in batches (openpyxl read-only mode).
+#---------------------------------------------------------------------
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Iterator, List, Optional
+
+from .pool_test import PoolTest
+from .pool_test_db import PoolTestDB
+
+
+SHEET_NAME = "Pool Test Log"
+DEFAULT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+
+EXPECTED_HEADERS = [
+    "Date",
+    "Free Chlorine (ppm)",
+    "Combined Chlorine (ppm)",
+    "Total Chlorine (ppm)",
+    "Salt Level (ppm)",
+    "Alkalinity (ppm)",
+    "pH",
+    "Sunscreen (Stabiliser) (ppm)",
+    "Total Hardness (ppm)",
+    "Phosphates (ppm)",
+    "Copper Total (ppm)",
+    "Water Clarity Notes",
+    "Actions Taken (Chemicals Added, Adjustments, etc.)",
+    "Next Planned Test Date",
+]
+
+
+@dataclass
+class RowError:
+    row: int        # worksheet row number
+    message: str
+
+
+@dataclass
+class PoolImportResult:
+    rows_read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+
+def _to_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return None
+
+
+class PoolWorkbookImporter:
+    """
+    Imports the pool test log from an Excel workbook.
+
+    - The workbook is opened read-only, so rows stream from the file
+      instead of the whole workbook being loaded into memory.
+    - Valid rows are written with PoolTestDB.upsert_many in batches of
+      `batch_size`, one transaction per batch. Tests are keyed by date,
+      so re-running an import updates rather than duplicates.
+    - Rows with a bad date or reading are reported (first
+      MAX_REPORTED_ERRORS kept) and skipped. A missing or unreadable
+      "Next Planned Test Date" is recomputed from the test date.
+
+    progress(result) is called after every committed batch.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 progress: Optional[Callable[[PoolImportResult], None]] = None):
+        self.db = PoolTestDB(db_path)
+        self.batch_size = batch_size
+        self.progress = progress
+
+    def _error(self, result: PoolImportResult, row: int, message: str):
+        result.skipped += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(RowError(row, message))
+
+    def _parse(self, rows, result: PoolImportResult) -> Iterator[PoolTest]:
+        """Yield a PoolTest per valid worksheet row (row 1 is the header)."""
+        header = next(rows, None)
+        if header is None or list(header[:len(EXPECTED_HEADERS)]) != EXPECTED_HEADERS:
+            raise ValueError(f"Excel headers do not match expected layout: {header}")
+
+        width = len(EXPECTED_HEADERS)
+        for row_no, row in enumerate(rows, start=2):
+            if all(v is None for v in row):
+                continue  # blank row
+            result.rows_read += 1
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+
+            test_date = _to_date(row[0])
+            if test_date is None:
+                self._error(result, row_no, f"invalid date {row[0]!r}")
+                continue
+            try:
+                readings = [float(v) for v in row[1:11]]
+            except (TypeError, ValueError):
+                self._error(result, row_no, "missing or non-numeric reading")
+                continue
+
+            yield PoolTest(
+                test_date,
+                *readings,
+                clarity_notes=row[11] or "",
+                actions_taken=row[12] or "",
+                next_test_date=_to_date(row[13]),
+            )
+
+    def import_workbook(self, path: str, sheet_name: str = SHEET_NAME) -> PoolImportResult:
+        from openpyxl import load_workbook
+
+        result = PoolImportResult()
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            if sheet_name not in wb.sheetnames:
+                raise ValueError(f"Sheet '{sheet_name}' not found")
+            rows = wb[sheet_name].iter_rows(values_only=True)
+
+            batch = []
+            for test in self._parse(rows, result):
+                batch.append(test)
+                if len(batch) >= self.batch_size:
+                    self._flush(batch, result)
+            self._flush(batch, result)
+        finally:
+            wb.close()   # read-only workbooks keep the file open
+        return result
+
+    def _flush(self, batch: List[PoolTest], result: PoolImportResult):
+        if not batch:
+            return
+        inserted, updated = self.db.upsert_many(batch)
+        result.inserted += inserted
+        result.updated += updated
+        batch.clear()
+        if self.progress:
+            self.progress(result)
@@ -1,10 +1,16 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
+from array import array
 from datetime import date
+from typing import Optional
+from core.db_worker import TkBridge, get_executor
+from modules.pool.classifier import PARAMETERS, STATUS_NAMES, unpack_statuses
 from modules.pool.pool_test import PoolTest
+from modules.pool.results_grid import PoolResultsGrid
+from modules.pool.schedule import schedule_status
 
-# High‑contrast text colours (Palette A)
+# High‑contrast text colours (Palette A): the grid's fixed status palette
 STATUS_COLOURS = {
     "in_range":        "#006400",   # dark green
     "slightly_high":   "#B8860B",   # dark goldenrod
@@ -14,6 +20,32 @@ STATUS_COLOURS = {
     "unknown":         "#000000",   # black
 }
 
+PARAMETER_NAMES = [name for name, _attr in PARAMETERS]
+
+# Schedule state -> (label format, text colour)
+DUE_LABELS = {
+    "none":          ("No tests recorded", "#000000"),
+    "overdue":       ("Test overdue since {due:%d/%m/%Y}", "#8B0000"),
+    "due_this_week": ("Test due this week ({due:%a %d/%m/%Y})", "#B8860B"),
+    "upcoming":      ("Next test {due:%d/%m/%Y}", "#006400"),
+}
+
+PAGE_SIZE = 200
+
+# Grid column -> desired_ranges item name
+COL_TO_KEY = {
+    "FC":   "Free Chlorine (ppm)",
+    "CC":   "Combined Chlorine (ppm)",
+    "TC":   "Total Chlorine (ppm)",
+    "Salt": "Salt Level (ppm)",
+    "Alk":  "Alkalinity (ppm)",
+    "pH":   "pH",
+    "Sun":  "Sunscreen (Stabiliser) (ppm)",
+    "Hard": "Total Hardness (ppm)",
+    "Phos": "Phosphates (ppm)",
+    "Cu":   "Copper Total (ppm)",
+}
+
 
 class PoolTestsTab(ttk.Frame):
     def __init__(self, parent, db, ranges):
@@ -23,12 +55,29 @@ class PoolTestsTab(ttk.Frame):
         self.ranges = ranges
         self.selected_id = None
 
-        # Transparent 1×1 image required for per‑cell styling
-        self._img = tk.PhotoImage(width=1, height=1)
+        # Tests are fetched a page at a time as the grid scrolls
+        self._tests = []   # PoolTest rows loaded so far, newest first
+        self._statuses = array("q")   # packed stored classifications, per test
+        self._has_more = True
+        self._page_pending = False
+        self._generation = 0   # bumped by each full refresh
+        self._pending_show = None   # test id to select once it is loaded
+        self._jump_reload = False   # the pending refresh was sized to reach it
+
+        # DB work runs off the Tk thread; results come back via after()
+        self.worker = get_executor(db.db_path)
+        self.bridge = TkBridge(self, on_error=self._on_db_error)
 
         self._build_ui()
         self._refresh_table()
 
+    def destroy(self):
+        self.bridge.cancel()
+        super().destroy()
+
+    def _on_db_error(self, exc):
+        messagebox.showerror("Database error", str(exc))
+
     # ------------------------------------------------------------
     # UI Layout
     # ------------------------------------------------------------
@@ -102,126 +151,203 @@ class PoolTestsTab(ttk.Frame):
         ttk.Button(btn_frame, text="Delete Selected", command=self._on_delete).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Refresh", command=self._refresh_table).pack(side="left", padx=5)
 
-        # ---------- Table ----------
-        table_frame = ttk.Frame(self)
-        table_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.due_label = ttk.Label(self, text="")
+        self.due_label.pack(anchor="w", padx=10)
 
+        # ---------- Table ----------
         self.cols = (
             "ID", "Date", "FC", "CC", "TC", "Salt", "Alk", "pH",
             "Sun", "Hard", "Phos", "Cu", "Next Test", "Notes"
         )
 
-        self.tree = ttk.Treeview(table_frame, columns=self.cols, show="headings")
-        for c in self.cols:
-            self.tree.heading(c, text=c)
-            self.tree.column(c, width=90 if c != "Notes" else 200)
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scroll.set)
-        scroll.pack(side="right", fill="y")
+        # Grid column -> parameter index (None = plain text column)
+        self._status_cols = tuple(
+            PARAMETER_NAMES.index(COL_TO_KEY[c]) if c in COL_TO_KEY else None
+            for c in self.cols
+        )
 
-        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.grid_view = PoolResultsGrid(
+            self,
+            columns=self.cols,
+            widths=[90 if c != "Notes" else 200 for c in self.cols],
+            row_count=lambda: len(self._tests),
+            row_provider=self._row_values,
+            palette=STATUS_COLOURS,
+            on_near_end=self._load_more,
+        )
+        self.grid_view.pack(fill="both", expand=True, padx=10, pady=5)
+        self.grid_view.bind("<<RowSelected>>", self._on_select)
 
     # ------------------------------------------------------------
     # Table Refresh
     # ------------------------------------------------------------
     def _refresh_table(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        tests = self.db.list_all()
-
-        col_to_key = {
-            "FC":   "Free Chlorine (ppm)",
-            "CC":   "Combined Chlorine (ppm)",
-            "TC":   "Total Chlorine (ppm)",
-            "Salt": "Salt Level (ppm)",
-            "Alk":  "Alkalinity (ppm)",
-            "pH":   "pH",
-            "Sun":  "Sunscreen (Stabiliser) (ppm)",
-            "Hard": "Total Hardness (ppm)",
-            "Phos": "Phosphates (ppm)",
-            "Cu":   "Copper Total (ppm)",
-        }
+        """Reload the rows loaded so far (at least one page) in the background."""
+        self._generation += 1
+        self._page_pending = True
+        self._request_page(None, max(PAGE_SIZE, len(self._tests)), replace=True)
+        self.bridge.deliver(
+            self.worker.submit_read(self.db.next_due_date, consistent=True),
+            self._show_due,
+        )
 
-        style = ttk.Style()
-
-        for t in tests:
-            t.apply_ranges(self.ranges)
-
-            row = (
-                t.id,
-                t.test_date.isoformat(),
-                t.free_chlorine,
-                t.combined_chlorine,
-                t.total_chlorine,
-                t.salt_level,
-                t.alkalinity,
-                t.ph,
-                t.sunscreen,
-                t.hardness,
-                t.phosphates,
-                t.copper,
-                t.next_test_date.isoformat(),
-                t.clarity_notes,
-                t.actions_taken,   # not shown in table, but needed for selection
-            )
-
-            item_id = self.tree.insert("", "end", values=row)
-
-            # Apply per‑cell styles
-            for col, key in col_to_key.items():
-                status = t.classifications.get(key, "unknown")
-                colour = STATUS_COLOURS.get(status, "#000000")
-
-                style_name = f"Cell_{item_id}_{col}.Treeview"
-                style.configure(style_name, foreground=colour, font=("Segoe UI", 9, "bold"))
-
-                # Force per‑cell rendering using image trick
-                self.tree.set(item_id, col, self.tree.set(item_id, col))
-                self.tree.item(item_id, image=self._img, tags=(style_name,))
+    def _show_due(self, due):
+        status = schedule_status(due)
+        fmt, colour = DUE_LABELS[status.state]
+        self.due_label.configure(text=fmt.format(due=status.due), foreground=colour)
+
+    def _load_more(self):
+        """Fetch the next page (keyset: older than the last loaded test)."""
+        if self._page_pending or not self._has_more or not self._tests:
+            return
+        self._page_pending = True
+        last = self._tests[-1]
+        self._request_page((last.test_date, last.id), PAGE_SIZE, replace=False)
+
+    def _request_page(self, before, limit, replace):
+        generation = self._generation
+        self.bridge.deliver(
+            self.worker.submit_read(self.db.list_page_with_status, before, limit,
+                                    consistent=True),
+            lambda result: self._fill_table(result, generation, limit, replace),
+        )
+
+    def _fill_table(self, result, generation, limit, replace):
+        if generation != self._generation:
+            return   # a page requested before the latest refresh
+        self._page_pending = False
+
+        # Classifications come from pool_test_status (kept current by
+        # triggers), so nothing is reclassified here.
+        tests, statuses = result
+        if replace:
+            self._tests, self._statuses = tests, statuses
+            # Rows shift on add/delete: keep the highlight on the selected test
+            self.grid_view.set_selected_index(self._index_of_test(self.selected_id))
+        else:
+            self._tests.extend(tests)
+            self._statuses.extend(statuses)
+        self._has_more = len(tests) == limit
+        self.grid_view.refresh()
+        if self._pending_show is not None and not self._select_test(self._pending_show):
+            if self._jump_reload:
+                self._pending_show = None   # deleted meanwhile
+            else:
+                self.show_test(self._pending_show)
+        self._jump_reload = False
+
+    def show_test(self, test_id: int):
+        """Select and scroll to a test (e.g. a search hit), loading pages down to it."""
+        self._pending_show = test_id
+        if self._page_pending or self._select_test(test_id):
+            return
+        self.bridge.deliver(
+            self.worker.submit_read(self.db.position, test_id, consistent=True),
+            self._load_through,
+        )
+
+    def _load_through(self, position):
+        """Reload the grid with enough pages to include row `position`."""
+        if position is None:
+            self._pending_show = None
+            return
+        pages = position // PAGE_SIZE + 1
+        self._generation += 1
+        self._page_pending = True
+        self._jump_reload = True
+        self._request_page(None, max(pages * PAGE_SIZE, len(self._tests)), replace=True)
+
+    def _index_of_test(self, test_id) -> Optional[int]:
+        """Row of a loaded test, or None."""
+        if test_id is None:
+            return None
+        for index, t in enumerate(self._tests):
+            if t.id == test_id:
+                return index
+        return None
+
+    def _select_test(self, test_id) -> bool:
+        index = self._index_of_test(test_id)
+        if index is None:
+            return False
+        self._pending_show = None
+        self.grid_view.select(index)
+        return True
+
+    def _row_values(self, index):
+        """(values, statuses) for one grid row; only rows in view are asked for."""
+        t = self._tests[index]
+        values = (
+            t.id,
+            t.test_date.isoformat(),
+            t.free_chlorine,
+            t.combined_chlorine,
+            t.total_chlorine,
+            t.salt_level,
+            t.alkalinity,
+            t.ph,
+            t.sunscreen,
+            t.hardness,
+            t.phosphates,
+            t.copper,
+            t.next_test_date.isoformat(),
+            t.clarity_notes,
+        )
+        # Status per cell; plain text for the non-chemistry columns
+        codes = unpack_statuses(self._statuses[index])
+        statuses = tuple(
+            None if j is None else STATUS_NAMES[codes[j]]
+            for j in self._status_cols
+        )
+        return values, statuses
 
     # ------------------------------------------------------------
     # Row Selection
     # ------------------------------------------------------------
     def _on_select(self, event):
-        sel = self.tree.selection()
-        if not sel:
+        idx = self.grid_view.selected_index()
+        if idx is None:
             return
 
-        item = self.tree.item(sel[0])
-        vals = item["values"]
-
-        self.selected_id = int(vals[0])
-
-        self.entry_date.set_date(vals[1])
-        self.entry_fc.delete(0, "end"); self.entry_fc.insert(0, vals[2])
-        self.entry_cc.delete(0, "end"); self.entry_cc.insert(0, vals[3])
-        self.entry_tc.delete(0, "end"); self.entry_tc.insert(0, vals[4])
-        self.entry_salt.delete(0, "end"); self.entry_salt.insert(0, vals[5])
-        self.entry_alk.delete(0, "end"); self.entry_alk.insert(0, vals[6])
-        self.entry_ph.delete(0, "end"); self.entry_ph.insert(0, vals[7])
-        self.entry_sunscreen.delete(0, "end"); self.entry_sunscreen.insert(0, vals[8])
-        self.entry_hard.delete(0, "end"); self.entry_hard.insert(0, vals[9])
-        self.entry_phos.delete(0, "end"); self.entry_phos.insert(0, vals[10])
-        self.entry_copper.delete(0, "end"); self.entry_copper.insert(0, vals[11])
+        t = self._tests[idx]
+        self.selected_id = t.id
+
+        self.entry_date.set_date(t.test_date)
+        for entry, value in (
+            (self.entry_fc, t.free_chlorine),
+            (self.entry_cc, t.combined_chlorine),
+            (self.entry_tc, t.total_chlorine),
+            (self.entry_salt, t.salt_level),
+            (self.entry_alk, t.alkalinity),
+            (self.entry_ph, t.ph),
+            (self.entry_sunscreen, t.sunscreen),
+            (self.entry_hard, t.hardness),
+            (self.entry_phos, t.phosphates),
+            (self.entry_copper, t.copper),
+        ):
+            entry.delete(0, "end")
+            entry.insert(0, value)
 
         self.entry_notes.delete("1.0", "end")
-        self.entry_notes.insert("1.0", vals[13])
+        self.entry_notes.insert("1.0", t.clarity_notes or "")
 
         self.entry_actions.delete("1.0", "end")
-        self.entry_actions.insert("1.0", vals[14])
+        self.entry_actions.insert("1.0", t.actions_taken or "")
 
     # ------------------------------------------------------------
     # Add / Update / Delete
     # ------------------------------------------------------------
+
+    # Writes are queued on the DB writer thread; the refresh that follows
+    # is a consistent read, so it runs after the write has committed.
+    def _write(self, fn, *args):
+        """Queue a write; failures are reported through the bridge."""
+        self.bridge.deliver(self.worker.submit_write(fn, *args), lambda _result: None)
+
     def _on_add(self):
         data = self._collect_form()
         test = PoolTest(**data)
-        test.apply_ranges(self.ranges)
-        self.db.insert(test)
+        self._write(self.db.insert, test)
         self._refresh_table()
 
     def _on_update(self):
@@ -229,14 +355,14 @@ class PoolTestsTab(ttk.Frame):
             return
         data = self._collect_form()
         test = PoolTest(**data)
-        test.apply_ranges(self.ranges)
-        self.db.update(self.selected_id, test)
+        self._write(self.db.update, self.selected_id, test)
         self._refresh_table()
 
     def _on_delete(self):
         if not self.selected_id:
             return
-        self.db.delete(self.selected_id)
+        self._write(self.db.delete, self.selected_id)
+        self.selected_id = None
         self._refresh_table()
 
     # ------------------------------------------------------------
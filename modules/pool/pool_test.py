@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from datetime import date
 from typing import Optional, Dict
 
-from .next_test_date import next_planned_test_date
+from .schedule import next_planned_test_date
 from modules.pool.classification_module import classify_value
 
 
@@ -26,14 +26,16 @@ class PoolTest:
     # --- Database ID (must come AFTER non-default fields) ---
 
     id: Optional[int] = None
-    
+
     # --- Derived fields ---
-    next_test_date: date = field(init=False)
+    # Pass the stored value when loading from SQLite; computed otherwise.
+    next_test_date: Optional[date] = None
     classifications: Dict[str, str] = field(init=False)
 
     def __post_init__(self):
         # Compute next planned test date
-        self.next_test_date = next_planned_test_date(self.test_date)
+        if self.next_test_date is None:
+            self.next_test_date = next_planned_test_date(self.test_date)
 
         # Classification results (filled later via apply_ranges())
         self.classifications = {}
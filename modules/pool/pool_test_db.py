@@ -1,10 +1,17 @@
-import sqlite3
-from typing import List, Optional
+from array import array
+from typing import Iterator, List, Optional, Tuple
 from datetime import date
 
+from core.db_connection import get_connection
+from core.migrations import ensure_schema
+from .classifier import STATUS_BITS, STATUS_NAMES
 from .pool_test import PoolTest
 
 
+DEFAULT_PAGE_SIZE = 200
+STATUS_LOOKUP_MAX = 500   # above this, scan pool_test_status once instead
+
+
 class PoolTestDB:
     """
     Handles saving, loading, listing, updating, and deleting PoolTest records
@@ -13,33 +20,55 @@ class PoolTestDB:
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        ensure_schema(db_path)
 
-    # ------------------------------------------------------------
-    # Insert a new PoolTest into the database
-    # ------------------------------------------------------------
-    def insert(self, test: PoolTest) -> int:
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-
-        cur.execute("""
-            INSERT INTO pool_tests (
-                test_date,
-                free_chlorine,
-                combined_chlorine,
-                total_chlorine,
-                salt_level,
-                alkalinity,
-                ph,
-                sunscreen,
-                hardness,
-                phosphates,
-                copper,
-                clarity_notes,
-                actions_taken,
-                next_test_date
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+    def _connect(self):
+        return get_connection(self.db_path)
+
+    _INSERT_SQL = """
+        INSERT INTO pool_tests (
+            test_date,
+            free_chlorine,
+            combined_chlorine,
+            total_chlorine,
+            salt_level,
+            alkalinity,
+            ph,
+            sunscreen,
+            hardness,
+            phosphates,
+            copper,
+            clarity_notes,
+            actions_taken,
+            next_test_date
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    _UPDATE_SQL = """
+        UPDATE pool_tests
+        SET
+            test_date = ?,
+            free_chlorine = ?,
+            combined_chlorine = ?,
+            total_chlorine = ?,
+            salt_level = ?,
+            alkalinity = ?,
+            ph = ?,
+            sunscreen = ?,
+            hardness = ?,
+            phosphates = ?,
+            copper = ?,
+            clarity_notes = ?,
+            actions_taken = ?,
+            next_test_date = ?
+        WHERE id = ?
+    """
+
+    @staticmethod
+    def _params(test: PoolTest) -> tuple:
+        """Column values in _INSERT_SQL / _UPDATE_SQL order."""
+        return (
             test.test_date.isoformat(),
             test.free_chlorine,
             test.combined_chlorine,
@@ -54,94 +83,99 @@ class PoolTestDB:
             test.clarity_notes,
             test.actions_taken,
             test.next_test_date.isoformat()
-        ))
-
-        conn.commit()
-        new_id = cur.lastrowid
-        conn.close()
+        )
 
-        return new_id
+    # ------------------------------------------------------------
+    # Insert a new PoolTest into the database
+    # ------------------------------------------------------------
+    def insert(self, test: PoolTest) -> int:
+        with self._connect() as conn:
+            cur = conn.execute(self._INSERT_SQL, self._params(test))
+        return cur.lastrowid
 
     # ------------------------------------------------------------
     # Update an existing PoolTest
     # ------------------------------------------------------------
     def update(self, test_id: int, test: PoolTest):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-
-        cur.execute("""
-            UPDATE pool_tests
-            SET
-                test_date = ?,
-                free_chlorine = ?,
-                combined_chlorine = ?,
-                total_chlorine = ?,
-                salt_level = ?,
-                alkalinity = ?,
-                ph = ?,
-                sunscreen = ?,
-                hardness = ?,
-                phosphates = ?,
-                copper = ?,
-                clarity_notes = ?,
-                actions_taken = ?,
-                next_test_date = ?
-            WHERE id = ?
-        """, (
-            test.test_date.isoformat(),
-            test.free_chlorine,
-            test.combined_chlorine,
-            test.total_chlorine,
-            test.salt_level,
-            test.alkalinity,
-            test.ph,
-            test.sunscreen,
-            test.hardness,
-            test.phosphates,
-            test.copper,
-            test.clarity_notes,
-            test.actions_taken,
-            test.next_test_date.isoformat(),
-            test_id
-        ))
+        with self._connect() as conn:
+            conn.execute(self._UPDATE_SQL, self._params(test) + (test_id,))
 
-        conn.commit()
-        conn.close()
+    # ------------------------------------------------------------
+    # Bulk writes (one transaction each)
+    # ------------------------------------------------------------
+    def insert_many(self, tests: List[PoolTest]) -> int:
+        """Insert every test in one transaction. Returns the row count."""
+        if not tests:
+            return 0
+        with self._connect() as conn:
+            conn.executemany(self._INSERT_SQL, [self._params(t) for t in tests])
+        return len(tests)
+
+    def upsert_many(self, tests: List[PoolTest]) -> Tuple[int, int]:
+        """
+        Insert or update tests keyed by test_date, in one transaction.
+        Within the batch the last test for a date wins; a date already in
+        the table updates that row (the newest, if there are several).
+        Returns (inserted, updated).
+        """
+        latest = {}
+        for t in tests:
+            latest[t.test_date] = t
+        if not latest:
+            return 0, 0
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # One range scan of ix_pool_tests_date_id finds existing rows
+            existing = dict(conn.execute("""
+                SELECT test_date, MAX(id)
+                FROM pool_tests
+                WHERE test_date BETWEEN ? AND ?
+                GROUP BY test_date
+            """, (min(latest).isoformat(), max(latest).isoformat())))
+
+            inserts, updates = [], []
+            for d, t in latest.items():
+                test_id = existing.get(d.isoformat())
+                if test_id is None:
+                    inserts.append(self._params(t))
+                else:
+                    updates.append(self._params(t) + (test_id,))
+
+            conn.executemany(self._INSERT_SQL, inserts)
+            conn.executemany(self._UPDATE_SQL, updates)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return len(inserts), len(updates)
 
     # ------------------------------------------------------------
-    # Load a single PoolTest by ID
+    # Row -> PoolTest
     # ------------------------------------------------------------
-    def load(self, test_id: int) -> Optional[PoolTest]:
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT
-                id,
-                test_date,
-                free_chlorine,
-                combined_chlorine,
-                total_chlorine,
-                salt_level,
-                alkalinity,
-                ph,
-                sunscreen,
-                hardness,
-                phosphates,
-                copper,
-                clarity_notes,
-                actions_taken,
-                next_test_date
-            FROM pool_tests
-            WHERE id = ?
-        """, (test_id,))
-
-        row = cur.fetchone()
-        conn.close()
-
-        if not row:
-            return None
+    _SELECT = """
+        SELECT
+            id,
+            test_date,
+            free_chlorine,
+            combined_chlorine,
+            total_chlorine,
+            salt_level,
+            alkalinity,
+            ph,
+            sunscreen,
+            hardness,
+            phosphates,
+            copper,
+            clarity_notes,
+            actions_taken,
+            next_test_date
+        FROM pool_tests
+    """
 
+    @staticmethod
+    def _to_test(row) -> PoolTest:
         (
             _id,
             test_date,
@@ -160,8 +194,9 @@ class PoolTestDB:
             next_test_date
         ) = row
 
-        # IMPORTANT: include id=_id
-        test = PoolTest(
+        # Stored next_test_date is passed in, so PoolTest does not
+        # recompute it for every loaded row
+        return PoolTest(
             test_date=date.fromisoformat(test_date),
             free_chlorine=free_chlorine,
             combined_chlorine=combined_chlorine,
@@ -175,94 +210,173 @@ class PoolTestDB:
             copper=copper,
             clarity_notes=clarity_notes,
             actions_taken=actions_taken,
-            id=_id
+            id=_id,
+            next_test_date=date.fromisoformat(next_test_date),
         )
 
-        # Override next_test_date from DB
-        test.next_test_date = date.fromisoformat(next_test_date)
-
-        return test
+    # ------------------------------------------------------------
+    # Load a single PoolTest by ID
+    # ------------------------------------------------------------
+    def load(self, test_id: int) -> Optional[PoolTest]:
+        row = self._connect().execute(
+            self._SELECT + " WHERE id = ?", (test_id,)
+        ).fetchone()
+        return self._to_test(row) if row else None
 
     # ------------------------------------------------------------
-    # List all PoolTests
+    # List all PoolTests (newest first)
     # ------------------------------------------------------------
     def list_all(self) -> List[PoolTest]:
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT
-                id,
-                test_date,
-                free_chlorine,
-                combined_chlorine,
-                total_chlorine,
-                salt_level,
-                alkalinity,
-                ph,
-                sunscreen,
-                hardness,
-                phosphates,
-                copper,
-                clarity_notes,
-                actions_taken,
-                next_test_date
-            FROM pool_tests
-            ORDER BY test_date DESC
-        """)
-
-        rows = cur.fetchall()
-        conn.close()
-
-        tests = []
-        for row in rows:
-            (
-                _id,
-                test_date,
-                free_chlorine,
-                combined_chlorine,
-                total_chlorine,
-                salt_level,
-                alkalinity,
-                ph,
-                sunscreen,
-                hardness,
-                phosphates,
-                copper,
-                clarity_notes,
-                actions_taken,
-                next_test_date
-            ) = row
-
-            test = PoolTest(
-                test_date=date.fromisoformat(test_date),
-                free_chlorine=free_chlorine,
-                combined_chlorine=combined_chlorine,
-                total_chlorine=total_chlorine,
-                salt_level=salt_level,
-                alkalinity=alkalinity,
-                ph=ph,
-                sunscreen=sunscreen,
-                hardness=hardness,
-                phosphates=phosphates,
-                copper=copper,
-                clarity_notes=clarity_notes,
-                actions_taken=actions_taken,
-                id=_id,   # <-- ADD THIS
+        rows = self._connect().execute(
+            self._SELECT + " ORDER BY test_date DESC, id DESC"
+        )
+        return [self._to_test(row) for row in rows]
+
+    # ------------------------------------------------------------
+    # Keyset pagination (ix_pool_tests_date_id)
+    # ------------------------------------------------------------
+    def list_page(self, before: Optional[Tuple[date, int]] = None,
+                  limit: int = DEFAULT_PAGE_SIZE) -> List[PoolTest]:
+        """
+        Up to `limit` tests, newest first, strictly older than the
+        (test_date, id) key `before` (None = from the newest test).
+        Pass the last test's (test_date, id) to get the next page.
+        """
+        if before is None:
+            rows = self._connect().execute(
+                self._SELECT + " ORDER BY test_date DESC, id DESC LIMIT ?", (limit,)
             )
+        else:
+            rows = self._connect().execute(
+                self._SELECT + """
+                WHERE (test_date, id) < (?, ?)
+                ORDER BY test_date DESC, id DESC
+                LIMIT ?
+                """, (before[0].isoformat(), before[1], limit)
+            )
+        return [self._to_test(row) for row in rows]
 
-            test.next_test_date = date.fromisoformat(next_test_date)
-            tests.append(test)
+    def position(self, test_id: int) -> Optional[int]:
+        """
+        Index of a test in the newest-first order list_page() walks
+        (0 = newest), or None if there is no such test.
+        """
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT test_date FROM pool_tests WHERE id = ?", (test_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return conn.execute(
+            "SELECT COUNT(*) FROM pool_tests WHERE (test_date, id) > (?, ?)",
+            (row[0], test_id),
+        ).fetchone()[0]
 
-        return tests
+    def iter_range(self, start: date, end: date) -> Iterator[PoolTest]:
+        """Tests dated start..end (inclusive), oldest first, streamed."""
+        rows = self._connect().execute(
+            self._SELECT + """
+            WHERE test_date BETWEEN ? AND ?
+            ORDER BY test_date, id
+            """, (start.isoformat(), end.isoformat())
+        )
+        for row in rows:
+            yield self._to_test(row)
 
     # ------------------------------------------------------------
     # Delete a PoolTest by ID
     # ------------------------------------------------------------
     def delete(self, test_id: int):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM pool_tests WHERE id = ?", (test_id,))
+
+    # ------------------------------------------------------------
+    # Schedule (ix_pool_tests_next_test_date)
+    # ------------------------------------------------------------
+    def next_due_date(self) -> Optional[date]:
+        """The latest planned next test date, i.e. when a test is next due."""
+        row = self._connect().execute(
+            "SELECT MAX(next_test_date) FROM pool_tests"
+        ).fetchone()
+        return date.fromisoformat(row[0]) if row[0] else None
+
+    def list_due_between(self, start: date, end: date) -> List[PoolTest]:
+        """Tests whose planned next test falls in start..end (inclusive)."""
+        rows = self._connect().execute(
+            self._SELECT + """
+            WHERE next_test_date BETWEEN ? AND ?
+            ORDER BY next_test_date, id
+            """, (start.isoformat(), end.isoformat())
+        )
+        return [self._to_test(row) for row in rows]
 
-        cur.execute("DELETE FROM pool_tests WHERE id = ?", (test_id,))
+    # ------------------------------------------------------------
+    # Materialized classifications (pool_test_status)
+    # ------------------------------------------------------------
+    # Maintained by triggers (see core/migrations.py): writes to a test
+    # refresh that test's rows, writes to desired_ranges refresh that
+    # parameter for every test.
+    def packed_statuses(self, tests: List[PoolTest]) -> array:
+        """
+        Stored status codes for `tests`, one packed int per test in the
+        same order (decode with classifier.unpack_statuses).
+        """
+        conn = self._connect()
+        if len(tests) <= STATUS_LOOKUP_MAX:
+            # A page: primary-key seeks for just these tests
+            ids = [t.id for t in tests]
+            marks = ", ".join("?" * len(ids))
+            packed = dict(conn.execute(f"""
+                SELECT test_id, SUM(status << ({STATUS_BITS} * param))
+                FROM pool_test_status
+                WHERE test_id IN ({marks})
+                GROUP BY test_id
+            """, ids)) if ids else {}
+        else:
+            packed = dict(conn.execute(f"""
+                SELECT test_id, SUM(status << ({STATUS_BITS} * param))
+                FROM pool_test_status
+                GROUP BY test_id
+            """))
+        return array("q", [packed.get(t.id, 0) for t in tests])
+
+    def list_all_with_status(self) -> Tuple[List[PoolTest], array]:
+        """list_all() plus packed_statuses(), read from one snapshot."""
+        return self._with_status(self.list_all)
+
+    def list_page_with_status(self, before: Optional[Tuple[date, int]] = None,
+                              limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[PoolTest], array]:
+        """list_page() plus packed_statuses(), read from one snapshot."""
+        return self._with_status(self.list_page, before, limit)
+
+    def _with_status(self, fetch, *args):
+        # One read transaction, so the tests and statuses are one snapshot
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            tests = fetch(*args)
+            statuses = self.packed_statuses(tests)
+        except Exception:
+            conn.rollback()
+            raise
         conn.commit()
-        conn.close()
+        return tests, statuses
+
+    def list_out_of_range(self, item_name: Optional[str] = None) -> List[Tuple[int, str, str]]:
+        """
+        (test_id, item_name, status) for every parameter outside its
+        desired range, optionally for one parameter. Served by the
+        ix_pool_test_status_out partial index.
+        """
+        sql = """
+            SELECT s.test_id, p.item_name, s.status
+            FROM pool_test_status s
+            JOIN pool_parameters p ON p.param = s.param
+            WHERE s.status >= 2
+        """
+        params = ()
+        if item_name is not None:
+            sql += " AND p.item_name = ?"
+            params = (item_name,)
+        rows = self._connect().execute(sql + " ORDER BY s.test_id, s.param", params)
+        return [(test_id, name, STATUS_NAMES[status]) for test_id, name, status in rows]
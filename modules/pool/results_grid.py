@@ -0,0 +1,249 @@
+#---------------------------------------------------------------------
+# POOL RESULTS GRID
+# Canvas-drawn pool test table with per-cell status colours.
+#---------------------------------------------------------------------
+
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+ROW_HEIGHT = 20
+CELL_PAD = 4
+FONT = ("Segoe UI", 9)
+FONT_STATUS = ("Segoe UI", 9, "bold")
+HEADER_BG = "#E6E6E6"
+ROW_BG = ("#FFFFFF", "#F5F5F5")   # alternating rows
+SELECTED_BG = "#CCE4F7"
+GRID_LINE = "#D0D0D0"
+DEFAULT_FG = "#000000"
+NEAR_END_ROWS = 20         # call on_near_end when this close to the last row
+
+
+class PoolResultsGrid(ttk.Frame):
+    """
+    A read-only results table drawn on a Canvas, so every cell can have
+    its own colour. (ttk.Treeview only styles whole rows: tags are per
+    item, and a style per cell leaks a Tk style object per cell.)
+
+    Like VirtualTreeview, data stays with the owner, which supplies:
+        row_count()          -> int
+        row_provider(index)  -> (values, statuses)
+
+    `statuses` is aligned with `values`; a status is a key of `palette`
+    (text colour, drawn bold) or None for plain text. The canvas holds a
+    fixed pool of cell items for the rows in view, reused on every
+    refresh and scroll, so memory does not grow with refreshes or with
+    the number of rows.
+
+    Selection is reported with <<RowSelected>>; call selected_index().
+    The selection is a row number: owners that reload rows move it with
+    set_selected_index().
+    on_near_end() is called whenever the view comes within NEAR_END_ROWS
+    of the last row, so the owner can fetch the next page.
+    Render cost is measured: see last_render and ms_per_row().
+    """
+
+    def __init__(self, parent, columns: Sequence[str], widths: Sequence[int],
+                 row_count: Callable[[], int],
+                 row_provider: Callable[[int], Tuple[tuple, tuple]],
+                 palette: Dict[str, str], row_height: int = ROW_HEIGHT,
+                 on_near_end: Optional[Callable[[], None]] = None):
+        super().__init__(parent)
+
+        self.columns = tuple(columns)
+        self.widths = tuple(widths)
+        self.row_count = row_count
+        self.row_provider = row_provider
+        self.palette = dict(palette)
+        self.row_height = row_height
+        self.on_near_end = on_near_end
+
+        self._x = [sum(self.widths[:i]) for i in range(len(self.widths) + 1)]
+        self._first = 0           # data index shown in the top slot
+        self._visible = 20        # rows that fit in the viewport
+        self._slots = []          # per slot: (background rect id, [text ids])
+        self._selected = None     # selected data index (survives scrolling)
+
+        # (rows drawn, seconds) for the most recent render
+        self.last_render: Tuple[int, float] = (0, 0.0)
+
+        self.canvas = tk.Canvas(self, background=ROW_BG[0], highlightthickness=0,
+                                width=self._x[-1], takefocus=1)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._draw_header()
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.canvas.bind("<Up>", lambda e: self._move_selection(-1))
+        self.canvas.bind("<Down>", lambda e: self._move_selection(1))
+        self.canvas.bind("<Prior>", lambda e: self._move_selection(-self._visible))
+        self.canvas.bind("<Next>", lambda e: self._move_selection(self._visible))
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def refresh(self):
+        """Re-render the visible window (call after the data changed)."""
+        count = self.row_count()
+        if self._selected is not None and self._selected >= count:
+            self._selected = None
+        self._first = self._clamp_first(self._first, count)
+        self._render(count)
+
+    def selected_index(self) -> Optional[int]:
+        return self._selected
+
+    def set_selected_index(self, index: Optional[int]):
+        """
+        Move the highlight to data row `index` (None = clear) without
+        scrolling or <<RowSelected>>: for owners whose rows were
+        reloaded. Takes effect on the next refresh().
+        """
+        self._selected = index
+
+    def select(self, index: int):
+        """Select data row `index`, scrolling to it."""
+        self._selected = index
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + self._visible:
+            self._first = index - self._visible + 1
+        self.refresh()
+        self.event_generate("<<RowSelected>>")
+
+    def ms_per_row(self) -> float:
+        """Average render time per drawn row in the most recent render."""
+        rows, seconds = self.last_render
+        return seconds * 1000 / rows if rows else 0.0
+
+    def item_count(self) -> int:
+        """Canvas items in use (constant for a given window size)."""
+        return len(self.canvas.find_all())
+
+    # ------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------
+    def _draw_header(self):
+        c = self.canvas
+        h = self.row_height
+        for i, name in enumerate(self.columns):
+            x0, x1 = self._x[i], self._x[i + 1]
+            c.create_rectangle(x0, 0, x1, h, fill=HEADER_BG, outline=GRID_LINE)
+            c.create_text(x0 + CELL_PAD, h // 2, text=name, anchor="w", font=FONT_STATUS)
+
+    def _new_slot(self, slot: int):
+        c = self.canvas
+        y0 = (slot + 1) * self.row_height
+        y1 = y0 + self.row_height
+        bg = c.create_rectangle(0, y0, self._x[-1], y1, outline=GRID_LINE,
+                                fill=ROW_BG[slot % 2])
+        texts = [
+            c.create_text(self._x[i] + CELL_PAD, (y0 + y1) // 2, anchor="w", font=FONT)
+            for i in range(len(self.columns))
+        ]
+        return bg, texts
+
+    def _render(self, count=None):
+        start = time.perf_counter()
+        if count is None:
+            count = self.row_count()
+        c = self.canvas
+
+        wanted = max(0, min(self._visible, count - self._first))
+
+        # Grow / shrink the slot pool to the window size
+        while len(self._slots) < wanted:
+            self._slots.append(self._new_slot(len(self._slots)))
+        while len(self._slots) > wanted:
+            bg, texts = self._slots.pop()
+            c.delete(bg, *texts)
+
+        palette = self.palette
+        for slot, (bg, texts) in enumerate(self._slots):
+            index = self._first + slot
+            values, statuses = self.row_provider(index)
+            if index == self._selected:
+                c.itemconfigure(bg, fill=SELECTED_BG)
+            else:
+                c.itemconfigure(bg, fill=ROW_BG[index % 2])
+            for text_id, value, status in zip(texts, values, statuses):
+                if status is None:
+                    c.itemconfigure(text_id, text=value, fill=DEFAULT_FG, font=FONT)
+                else:
+                    c.itemconfigure(text_id, text=value, font=FONT_STATUS,
+                                    fill=palette.get(status, DEFAULT_FG))
+
+        self._update_scrollbar(count)
+        self.last_render = (len(self._slots), time.perf_counter() - start)
+
+        if self.on_near_end is not None and self._first + self._visible >= count - NEAR_END_ROWS:
+            self.on_near_end()
+
+    def _update_scrollbar(self, count):
+        if count <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        top = self._first / count
+        bottom = min(1.0, (self._first + self._visible) / count)
+        self.scrollbar.set(top, bottom)
+
+    def _clamp_first(self, first, count):
+        return max(0, min(first, count - self._visible))
+
+    # ------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------
+    def _on_resize(self, event):
+        visible = max(1, event.height // self.row_height - 1)   # minus header
+        if visible != self._visible:
+            self._visible = visible
+            self.refresh()
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        slot = int(self.canvas.canvasy(event.y)) // self.row_height - 1
+        if 0 <= slot < len(self._slots):
+            self.select(self._first + slot)
+
+    def _on_scrollbar(self, *args):
+        count = self.row_count()
+        if args[0] == "moveto":
+            first = int(float(args[1]) * count)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible
+            first = self._first + step
+        else:
+            return
+        self._first = self._clamp_first(first, count)
+        self._render(count)
+
+    def _on_mousewheel(self, event):
+        self._scroll_by(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _scroll_by(self, rows):
+        count = self.row_count()
+        first = self._clamp_first(self._first + rows, count)
+        if first != self._first:
+            self._first = first
+            self._render(count)
+        return "break"
+
+    def _move_selection(self, step):
+        count = self.row_count()
+        if count == 0:
+            return "break"
+        current = self._first if self._selected is None else self._selected
+        self.select(max(0, min(count - 1, current + step)))
+        return "break"
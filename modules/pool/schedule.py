@@ -0,0 +1,70 @@
+#---------------------------------------------------------------------
+# POOL TEST SCHEDULE
+# Next planned test dates (one month on, then the next Tuesday) in
+# closed form, planned-test calendars, and the "is a test due" answer.
+#---------------------------------------------------------------------
+
+import calendar
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+TUESDAY = 1   # date.weekday()
+
+
+def add_one_month(d: date) -> date:
+    """Same day next month, clamped to the month's end (relativedelta(months=+1))."""
+    year, month = (d.year + 1, 1) if d.month == 12 else (d.year, d.month + 1)
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def next_weekday_on_or_after(d: date, weekday: int = TUESDAY) -> date:
+    return d + timedelta(days=(weekday - d.weekday()) % 7)
+
+
+@lru_cache(maxsize=8192)
+def next_planned_test_date(d: date) -> date:
+    """
+    Excel VBA rule: add one month to the test date, then move forward to
+    the first Tuesday on or after that date. Memoized per date.
+    """
+    return next_weekday_on_or_after(add_one_month(d))
+
+
+def planned_calendar(first_test: date, until: date) -> List[date]:
+    """
+    Planned test dates from first_test, each one the next planned date of
+    the previous, up to and including `until` (e.g. several years ahead).
+    """
+    dates = []
+    d = first_test
+    while True:
+        d = next_planned_test_date(d)
+        if d > until:
+            return dates
+        dates.append(d)
+
+
+# ------------------------------------------------------------
+# Due status
+# ------------------------------------------------------------
+class ScheduleStatus(NamedTuple):
+    due: Optional[date]   # next planned test date (None = no tests yet)
+    state: str            # "none", "overdue", "due_this_week" or "upcoming"
+    days: int             # days until due (negative when overdue)
+
+
+def schedule_status(due: Optional[date], today: Optional[date] = None) -> ScheduleStatus:
+    """Classify the next due date against today and the current (Mon-Sun) week."""
+    if due is None:
+        return ScheduleStatus(None, "none", 0)
+    today = today or date.today()
+    days = (due - today).days
+    end_of_week = today + timedelta(days=6 - today.weekday())
+    if due < today:
+        state = "overdue"
+    elif due <= end_of_week:
+        state = "due_this_week"
+    else:
+        state = "upcoming"
+    return ScheduleStatus(due, state, days)
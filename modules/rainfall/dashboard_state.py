@@ -0,0 +1,93 @@
+#---------------------------------------------------------------------
+# DASHBOARD STATE
+# Rainfall dashboard figures kept up to date as rows change, so a
+# dashboard refresh never scans the history.
+#---------------------------------------------------------------------
+
+from array import array
+from bisect import bisect_left
+from datetime import date
+from typing import NamedTuple, Optional
+
+from .rainfall_store import RainfallStore
+
+
+class DashboardFacts(NamedTuple):
+    last_rain: Optional[date]
+    last_watering: Optional[date]
+    balance: float            # moisture of the newest row (0.0 if none)
+    missing_days: int         # days without a row between first and last record
+
+
+def _index_set(days: array, day: int, present: bool):
+    """Add or remove `day` in the sorted ordinal array `days`."""
+    idx = bisect_left(days, day)
+    found = idx < len(days) and days[idx] == day
+    if present and not found:
+        days.insert(idx, day)
+    elif found and not present:
+        del days[idx]
+
+
+class DashboardState:
+    """
+    Incremental dashboard aggregates over a RainfallStore.
+
+    Rain days (effective rain > 0) and watering days are kept as sorted
+    ordinal arrays, so the last of each is simply the final element; an
+    edit or delete touches one position found by binary search. The gap
+    count and balance come straight from the store's ends: dates are
+    unique, so missing days = span - rows.
+
+    Call row_changed(i) after RainfallStore.upsert() and
+    row_removed(day) after RainfallStore.remove().
+    """
+
+    def __init__(self, store: RainfallStore):
+        self.store = store
+        self._rain_days = array("l", (d for d, e in zip(store.days, store.eff) if e > 0))
+        self._watered_days = array("l", (d for d, w in zip(store.days, store.watered) if w))
+
+    # ------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------
+    def row_changed(self, i: int):
+        """Row i was inserted or edited. O(log n) search."""
+        store = self.store
+        day = store.days[i]
+        _index_set(self._rain_days, day, store.eff[i] > 0)    # NaN compares False
+        _index_set(self._watered_days, day, store.watered[i] == 1)
+
+    def row_removed(self, day: int):
+        """The row for `day` (ordinal) was removed."""
+        _index_set(self._rain_days, day, False)
+        _index_set(self._watered_days, day, False)
+
+    # ------------------------------------------------------------
+    # Figures (all O(1))
+    # ------------------------------------------------------------
+    @property
+    def last_rain(self) -> Optional[date]:
+        return date.fromordinal(self._rain_days[-1]) if self._rain_days else None
+
+    @property
+    def last_watering(self) -> Optional[date]:
+        return date.fromordinal(self._watered_days[-1]) if self._watered_days else None
+
+    @property
+    def balance(self) -> float:
+        store = self.store
+        if not len(store):
+            return 0.0
+        value = store.moisture_at(len(store) - 1)
+        return 0.0 if value is None else value
+
+    @property
+    def missing_days(self) -> int:
+        days = self.store.days
+        if not days:
+            return 0
+        return days[-1] - days[0] + 1 - len(days)
+
+    def facts(self) -> DashboardFacts:
+        return DashboardFacts(self.last_rain, self.last_watering, self.balance, self.missing_days)
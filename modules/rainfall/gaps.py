@@ -0,0 +1,55 @@
+#---------------------------------------------------------------------
+# MISSING DAYS
+# Gaps in the rainfall log as compact (start, end, days) intervals.
+#---------------------------------------------------------------------
+
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+
+
+class MissingRange(NamedTuple):
+    start: date      # first missing day
+    end: date        # last missing day (inclusive)
+    days: int
+
+
+def missing_ranges_from_days(days: Sequence[int]) -> List[MissingRange]:
+    """
+    Missing intervals between consecutive recorded days, given sorted
+    ordinals (e.g. RainfallStore.days). O(records), regardless of how
+    long any single gap is.
+    """
+    ranges = []
+    for i in range(1, len(days)):
+        prev, cur = days[i - 1], days[i]
+        if cur - prev > 1:
+            ranges.append(MissingRange(
+                date.fromordinal(prev + 1),
+                date.fromordinal(cur - 1),
+                cur - prev - 1,
+            ))
+    return ranges
+
+
+def missing_ranges_from_gaps(gaps: Iterable[tuple]) -> List[MissingRange]:
+    """Convert (last_day_before, first_day_after) date pairs to ranges."""
+    ranges = []
+    for before, after in gaps:
+        start = before.toordinal() + 1
+        end = after.toordinal() - 1
+        ranges.append(MissingRange(date.fromordinal(start), date.fromordinal(end), end - start + 1))
+    return ranges
+
+
+def totals_by_year(ranges: Iterable[MissingRange]) -> Dict[int, int]:
+    """Missing-day count per calendar year, splitting ranges that cross 1 Jan."""
+    totals: Dict[int, int] = {}
+    for r in ranges:
+        start = r.start
+        while start <= r.end:
+            year_end = min(date(start.year, 12, 31), r.end)
+            totals[start.year] = totals.get(start.year, 0) + (year_end - start).days + 1
+            if year_end == r.end:
+                break
+            start = date(start.year + 1, 1, 1)
+    return totals
@@ -0,0 +1,172 @@
+#---------------------------------------------------------------------
+# MOISTURE ENGINE
+# Option 1 moisture model (smooth net decay, clamped to [0, threshold])
+# with incremental, early-terminating recompute.
+#---------------------------------------------------------------------
+
+import math
+from array import array
+from typing import List, Optional, Sequence
+
+
+DEFAULT_THRESHOLD_MM = 20.0
+DEFAULT_PERIOD_DAYS = 5
+
+# Moisture is stored rounded to this many decimals, so checkpoints are
+# compared at that precision.
+MOISTURE_DECIMALS = 2
+
+# Typed settings keys for the model and the values the rainfall tab seeds
+# (see core.settings_db.SettingsCache.register_many).
+SETTINGS_SPEC = {
+    "threshold_mm": (float, 10.0),
+    "period_days": (int, 7),
+}
+
+
+class MoistureEngine:
+    """
+    Computes the daily moisture series for the rainfall log.
+
+    The engine works on any "series" object exposing, per row index i:
+        len(series)
+        series.effective(i)        -> Optional[float]  effective rain (mm)
+        series.is_watered(i)       -> bool
+        series.moisture_at(i)      -> Optional[float]  stored checkpoint
+        series.set_moisture(i, v)
+
+    Full recomputes also read the whole columns at once:
+        series.eff                 float sequence (NaN = no valid rain)
+        series.watered             int sequence (1 = watered)
+        series.moisture            float sequence
+
+    RainfallStore implements this interface directly.
+
+    The stored moisture of each day is its checkpoint. Because the model
+    clamps to [0, threshold], an edit usually stops mattering within a few
+    days: once a recomputed value equals the checkpoint already stored for
+    that day (at the stored precision, MOISTURE_DECIMALS, since reloaded
+    checkpoints are rounded), every later day is unchanged too and
+    propagation stops.
+    """
+
+    def __init__(self, threshold_mm: float = DEFAULT_THRESHOLD_MM,
+                 period_days: int = DEFAULT_PERIOD_DAYS):
+        self.threshold = threshold_mm
+        self.period_days = period_days
+        self.loss = threshold_mm / period_days
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "MoistureEngine":
+        """Build an engine from the settings dict, with the tab's fallbacks."""
+        try:
+            threshold = float(settings.get("threshold_mm", DEFAULT_THRESHOLD_MM))
+        except ValueError:
+            threshold = DEFAULT_THRESHOLD_MM
+
+        try:
+            period_days = int(settings.get("period_days", DEFAULT_PERIOD_DAYS))
+            if period_days <= 0:
+                period_days = DEFAULT_PERIOD_DAYS
+        except ValueError:
+            period_days = DEFAULT_PERIOD_DAYS
+
+        return cls(threshold, period_days)
+
+    # ------------------------------------------------------------
+    # Single-day model
+    # ------------------------------------------------------------
+    def delta(self, eff_rain: Optional[float], watered: bool) -> float:
+        """
+        Delta = Effective_mm + Watering_contribution - Loss
+        where Loss = threshold / period_days
+        """
+        watering_contribution = self.threshold if watered else 0
+        rain_contribution = eff_rain if eff_rain is not None else 0
+
+        return rain_contribution + watering_contribution - self.loss
+
+    def step(self, prev_moisture: float, eff_rain: Optional[float], watered: bool) -> float:
+        """Moisture = prev_moisture + Delta (clamped to [0, threshold])"""
+        moisture = prev_moisture + self.delta(eff_rain, watered)
+        moisture = max(0, moisture)               # Cannot be negative
+        moisture = min(moisture, self.threshold)  # Cap at threshold
+        return moisture
+
+    # ------------------------------------------------------------
+    # Series recompute
+    # ------------------------------------------------------------
+    def _prev_checkpoint(self, series, start: int) -> float:
+        if start == 0:
+            return 0.0
+        prev = series.moisture_at(start - 1)
+        return 0.0 if prev is None else prev
+
+    @staticmethod
+    def _same(stored: Optional[float], moisture: float) -> bool:
+        """True if `moisture` would store as the checkpoint `stored`."""
+        return stored is not None and (
+            round(stored, MOISTURE_DECIMALS) == round(moisture, MOISTURE_DECIMALS)
+        )
+
+    def propagate(self, series, start: int) -> List[int]:
+        """
+        Recompute from row `start` forward, stopping as soon as a day's
+        recomputed value matches its stored checkpoint.
+
+        Returns the indices whose moisture changed (the dirty rows).
+        """
+        dirty = []
+        prev = self._prev_checkpoint(series, start)
+
+        for i in range(start, len(series)):
+            moisture = self.step(prev, series.effective(i), series.is_watered(i))
+            if self._same(series.moisture_at(i), moisture):
+                break  # converged: every later day is already correct
+            series.set_moisture(i, moisture)
+            dirty.append(i)
+            prev = moisture
+
+        return dirty
+
+    def recompute_all(self, series) -> List[int]:
+        """
+        Recompute every row without early termination (e.g. after the
+        model parameters change). Returns the indices whose moisture changed.
+        """
+        new = self.compute(series.eff, series.watered)
+        old = series.moisture
+
+        dirty = [i for i in range(len(new))
+                 if not self._same(None if math.isnan(old[i]) else old[i], new[i])]
+        for i in dirty:
+            series.set_moisture(i, new[i])
+        return dirty
+
+    def compute(self, eff: Sequence[float], watered: Sequence[int],
+                prev_moisture: float = 0.0) -> array:
+        """
+        Batched kernel: the clamped moisture series for whole columns of
+        effective rain (NaN = none) and watered flags, in one pass.
+
+        Bit-for-bit identical to calling step() day by day; the operations
+        are done in the same order, with the parameters hoisted out of the
+        loop. The clamp makes each day depend on the previous one, so the
+        loop itself cannot be vectorised.
+        """
+        threshold = self.threshold
+        loss = self.loss
+        out = array("d", bytes(8 * len(eff)))
+
+        prev = prev_moisture
+        for i, (e, w) in enumerate(zip(eff, watered)):
+            # (rain + watering) - loss, exactly as delta() evaluates it
+            moisture = prev + (((0 if e != e else e) + (threshold if w else 0)) - loss)
+            if moisture < 0:
+                moisture = 0
+            if moisture > threshold:
+                moisture = threshold
+            out[i] = moisture
+            prev = moisture
+
+        return out
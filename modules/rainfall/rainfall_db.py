@@ -1,9 +1,15 @@
-import sqlite3
+from contextlib import nullcontext
 from datetime import date, timedelta
 from typing import List, Optional
 
+from core.db_connection import get_connection
+from core.migrations import ensure_schema
+from .gaps import MissingRange, missing_ranges_from_gaps
+from .rollups import deferred_rollups
+
 
 DATE_FMT = "%Y-%m-%d"
+BULK_ROWS = 256   # change sets this large rebuild the rollups once instead of per row
 
 
 class RainfallRecord:
@@ -52,229 +58,158 @@ class RainfallDB:
     # ------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------
-    def _connect(self):
-        return sqlite3.connect(self.db_path)
-
-    def _ensure_schema(self):
-        conn = self._connect()
-        cur = conn.cursor()
-
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS rainfall (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL,
-                rain_mm REAL,
-                bom_mm REAL,
-                notes TEXT,
-                watered TEXT NOT NULL DEFAULT 'No',
-                moisture REAL
-            )
-        """)
-
-        # Normalize historic data before adding constraints/indexes.
-        cur.execute("""
-            UPDATE rainfall
-            SET watered = 'No'
-            WHERE watered IS NULL OR watered NOT IN ('Yes', 'No')
-        """)
-        cur.execute("""
-            DELETE FROM rainfall
-            WHERE id NOT IN (
-                SELECT MAX(id)
-                FROM rainfall
-                GROUP BY date
-            )
-        """)
-
-        cur.execute("""
-            CREATE UNIQUE INDEX IF NOT EXISTS ux_rainfall_date
-            ON rainfall(date)
-        """)
-
-        # Enforce key domain rules for legacy schemas that cannot add CHECK easily.
-        cur.execute("""
-            CREATE TRIGGER IF NOT EXISTS trg_rainfall_validate_insert
-            BEFORE INSERT ON rainfall
-            WHEN (NEW.rain_mm IS NOT NULL AND NEW.rain_mm < 0)
-              OR (NEW.bom_mm IS NOT NULL AND NEW.bom_mm < 0)
-              OR NEW.watered NOT IN ('Yes', 'No')
-            BEGIN
-                SELECT RAISE(ABORT, 'Invalid rainfall row');
-            END
-        """)
-
-        cur.execute("""
-            CREATE TRIGGER IF NOT EXISTS trg_rainfall_validate_update
-            BEFORE UPDATE ON rainfall
-            WHEN (NEW.rain_mm IS NOT NULL AND NEW.rain_mm < 0)
-              OR (NEW.bom_mm IS NOT NULL AND NEW.bom_mm < 0)
-              OR NEW.watered NOT IN ('Yes', 'No')
-            BEGIN
-                SELECT RAISE(ABORT, 'Invalid rainfall row');
-            END
-        """)
-
-        conn.commit()
-        conn.close()
+    _UPSERT_SQL = """
+        INSERT INTO rainfall (
+            date, rain_mm, bom_mm, notes, watered, moisture
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(date) DO UPDATE SET
+            rain_mm=excluded.rain_mm,
+            bom_mm=excluded.bom_mm,
+            notes=excluded.notes,
+            watered=excluded.watered,
+            moisture=excluded.moisture
+    """
 
-    # ------------------------------------------------------------
-    # Insert
-    # ------------------------------------------------------------
-    def insert(self, rec: RainfallRecord) -> int:
-        conn = self._connect()
-        cur = conn.cursor()
+    def _connect(self):
+        return get_connection(self.db_path)
 
-        cur.execute("""
-            INSERT INTO rainfall (
-                date, rain_mm, bom_mm, notes, watered, moisture
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+    @staticmethod
+    def _row(rec: RainfallRecord) -> tuple:
+        return (
             rec.date.isoformat(),
             rec.rain_mm,
             rec.bom_mm,
             rec.notes,
             rec.watered,
             rec.moisture,
-        ))
-
-        conn.commit()
-        new_id = cur.lastrowid
-        conn.close()
-        return new_id
+        )
 
-    def upsert_by_date(self, rec: RainfallRecord) -> int:
-        conn = self._connect()
-        cur = conn.cursor()
+    def _ensure_schema(self):
+        # Table, indexes and triggers live in core.migrations; after the
+        # first open this is a no-op.
+        ensure_schema(self.db_path)
 
-        cur.execute("""
-            INSERT INTO rainfall (
-                date, rain_mm, bom_mm, notes, watered, moisture
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(date) DO UPDATE SET
-                rain_mm=excluded.rain_mm,
-                bom_mm=excluded.bom_mm,
-                notes=excluded.notes,
-                watered=excluded.watered,
-                moisture=excluded.moisture
-        """, (
-            rec.date.isoformat(),
-            rec.rain_mm,
-            rec.bom_mm,
-            rec.notes,
-            rec.watered,
-            rec.moisture,
-        ))
+    # ------------------------------------------------------------
+    # Insert
+    # ------------------------------------------------------------
+    def insert(self, rec: RainfallRecord) -> int:
+        with self._connect() as conn:
+            cur = conn.execute("""
+                INSERT INTO rainfall (
+                    date, rain_mm, bom_mm, notes, watered, moisture
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                rec.date.isoformat(),
+                rec.rain_mm,
+                rec.bom_mm,
+                rec.notes,
+                rec.watered,
+                rec.moisture,
+            ))
+        return cur.lastrowid
 
-        conn.commit()
-        new_id = cur.lastrowid
-        conn.close()
-        return new_id
+    def upsert_by_date(self, rec: RainfallRecord) -> int:
+        with self._connect() as conn:
+            cur = conn.execute(self._UPSERT_SQL, self._row(rec))
+        return cur.lastrowid
 
     # ------------------------------------------------------------
     # Update
     # ------------------------------------------------------------
     def update(self, rec_id: int, rec: RainfallRecord):
-        conn = self._connect()
-        cur = conn.cursor()
-
-        cur.execute("""
-            UPDATE rainfall
-            SET date=?, rain_mm=?, bom_mm=?, notes=?, watered=?, moisture=?
-            WHERE id=?
-        """, (
-            rec.date.isoformat(),
-            rec.rain_mm,
-            rec.bom_mm,
-            rec.notes,
-            rec.watered,
-            rec.moisture,
-            rec_id,
-        ))
-
-        conn.commit()
-        conn.close()
+        with self._connect() as conn:
+            conn.execute("""
+                UPDATE rainfall
+                SET date=?, rain_mm=?, bom_mm=?, notes=?, watered=?, moisture=?
+                WHERE id=?
+            """, (
+                rec.date.isoformat(),
+                rec.rain_mm,
+                rec.bom_mm,
+                rec.notes,
+                rec.watered,
+                rec.moisture,
+                rec_id,
+            ))
 
     # ------------------------------------------------------------
     # Delete
     # ------------------------------------------------------------
     def delete(self, rec_id: int):
-        conn = self._connect()
-        cur = conn.cursor()
-        cur.execute("DELETE FROM rainfall WHERE id=?", (rec_id,))
-        conn.commit()
-        conn.close()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM rainfall WHERE id=?", (rec_id,))
 
     def delete_by_date(self, d: date):
-        conn = self._connect()
-        cur = conn.cursor()
-        cur.execute("DELETE FROM rainfall WHERE date=?", (d.isoformat(),))
-        conn.commit()
-        conn.close()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM rainfall WHERE date=?", (d.isoformat(),))
 
     def sync_records(self, records: List[RainfallRecord]):
         """
         Sync DB rows to exactly match given records, without table truncation.
+        Prefer apply_changes() when the caller knows what changed.
         """
         conn = self._connect()
         cur = conn.cursor()
         try:
             cur.execute("BEGIN")
 
-            for rec in records:
-                cur.execute("""
-                    INSERT INTO rainfall (
-                        date, rain_mm, bom_mm, notes, watered, moisture
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(date) DO UPDATE SET
-                        rain_mm=excluded.rain_mm,
-                        bom_mm=excluded.bom_mm,
-                        notes=excluded.notes,
-                        watered=excluded.watered,
-                        moisture=excluded.moisture
-                """, (
-                    rec.date.isoformat(),
-                    rec.rain_mm,
-                    rec.bom_mm,
-                    rec.notes,
-                    rec.watered,
-                    rec.moisture,
-                ))
-
-            desired_dates = [r.date.isoformat() for r in records]
-            if desired_dates:
-                placeholders = ",".join("?" for _ in desired_dates)
-                cur.execute(
-                    f"DELETE FROM rainfall WHERE date NOT IN ({placeholders})",
-                    desired_dates,
+            # Every row is written, so rebuild the rollups once at the end
+            with deferred_rollups(conn):
+                cur.executemany(self._UPSERT_SQL, [self._row(rec) for rec in records])
+
+                # Stage the wanted dates in a temp table rather than binding one
+                # parameter per row (SQLite caps host parameters per statement).
+                cur.execute("CREATE TEMP TABLE IF NOT EXISTS _keep_dates (date TEXT PRIMARY KEY)")
+                cur.execute("DELETE FROM _keep_dates")
+                cur.executemany(
+                    "INSERT OR IGNORE INTO _keep_dates (date) VALUES (?)",
+                    [(r.date.isoformat(),) for r in records],
                 )
-            else:
-                cur.execute("DELETE FROM rainfall")
+                cur.execute("DELETE FROM rainfall WHERE date NOT IN (SELECT date FROM _keep_dates)")
+                cur.execute("DELETE FROM _keep_dates")
 
             conn.commit()
         except Exception:
             conn.rollback()
             raise
-        finally:
-            conn.close()
+
+    def apply_changes(self, upserts: List[RainfallRecord], deleted: List[date]):
+        """
+        Apply a change set in one transaction: upsert the given records
+        (keyed by date) and delete the rows for the given dates.
+        Cost is proportional to the number of changed rows, not the history.
+        The rollup triggers refresh each changed row's buckets; change sets
+        of BULK_ROWS or more rebuild the buckets over their date span once.
+        """
+        if not upserts and not deleted:
+            return
+
+        with self._connect() as conn:
+            if len(upserts) + len(deleted) >= BULK_ROWS:
+                days = [rec.date for rec in upserts] + list(deleted)
+                span = deferred_rollups(conn, min(days).isoformat(), max(days).isoformat())
+            else:
+                span = nullcontext()
+            with span:
+                if deleted:
+                    conn.executemany(
+                        "DELETE FROM rainfall WHERE date=?",
+                        [(d.isoformat(),) for d in deleted],
+                    )
+                if upserts:
+                    conn.executemany(self._UPSERT_SQL, [self._row(rec) for rec in upserts])
 
     # ------------------------------------------------------------
     # Load single record
     # ------------------------------------------------------------
     def load(self, rec_id: int) -> Optional[RainfallRecord]:
-        conn = self._connect()
-        cur = conn.cursor()
-
-        cur.execute("""
+        row = self._connect().execute("""
             SELECT id, date, rain_mm, bom_mm, notes, watered, moisture
             FROM rainfall
             WHERE id=?
-        """, (rec_id,))
-
-        row = cur.fetchone()
-        conn.close()
+        """, (rec_id,)).fetchone()
 
         if not row:
             return None
@@ -293,17 +228,11 @@ class RainfallDB:
     # List all records (sorted by date)
     # ------------------------------------------------------------
     def list_all(self) -> List[RainfallRecord]:
-        conn = self._connect()
-        cur = conn.cursor()
-
-        cur.execute("""
+        rows = self._connect().execute("""
             SELECT id, date, rain_mm, bom_mm, notes, watered, moisture
             FROM rainfall
             ORDER BY date ASC
-        """)
-
-        rows = cur.fetchall()
-        conn.close()
+        """).fetchall()
 
         records = []
         for row in rows:
@@ -320,45 +249,75 @@ class RainfallDB:
             )
         return records
 
+    def list_rows(self) -> List[tuple]:
+        """
+        Raw (date, rain_mm, bom_mm, notes, watered, moisture) tuples sorted
+        by date, for bulk loaders such as RainfallStore.from_rows().
+        """
+        return self._connect().execute("""
+            SELECT date, rain_mm, bom_mm, notes, watered, moisture
+            FROM rainfall
+            ORDER BY date ASC
+        """).fetchall()
+
     # ------------------------------------------------------------
     # Missing days detection
     # ------------------------------------------------------------
-    def compute_missing_dates(self):
-        records = self.list_all()
-        if not records:
-            return []
+    def _gaps(self) -> List[tuple]:
+        """
+        (last_date_before_gap, first_date_after_gap) pairs, found with a
+        single ordered pass over the date index using LAG().
+        """
+        rows = self._connect().execute("""
+            SELECT prev_date, date
+            FROM (
+                SELECT date, LAG(date) OVER (ORDER BY date) AS prev_date
+                FROM rainfall
+            )
+            WHERE julianday(date) - julianday(prev_date) > 1
+            ORDER BY date
+        """).fetchall()
+        return [(date.fromisoformat(a), date.fromisoformat(b)) for a, b in rows]
 
-        dates = sorted(r.date for r in records)
-        all_dates = []
-        d = dates[0]
-        while d <= dates[-1]:
-            all_dates.append(d)
-            d += timedelta(days=1)
+    def missing_ranges(self) -> List[MissingRange]:
+        """Missing days as (start, end, days) intervals. O(records)."""
+        return missing_ranges_from_gaps(self._gaps())
 
-        existing = set(dates)
-        return [d for d in all_dates if d not in existing]
+    def compute_missing_dates(self):
+        """
+        Every missing day as a date. Prefer missing_ranges(): one long gap
+        (e.g. a mistyped year) makes this list arbitrarily large.
+        """
+        missing = []
+        for before, after in self._gaps():
+            d = before + timedelta(days=1)
+            while d < after:
+                missing.append(d)
+                d += timedelta(days=1)
+        return missing
+
+    def missing_day_count(self) -> int:
+        """Number of missing days between the first and last record."""
+        row = self._connect().execute("""
+            SELECT CAST(julianday(MAX(date)) - julianday(MIN(date)) AS INTEGER) + 1 - COUNT(*)
+            FROM rainfall
+        """).fetchone()
+        return row[0] or 0
 
     # ------------------------------------------------------------
     # Last rainfall date
     # ------------------------------------------------------------
     def last_rain_date(self):
-        records = self.list_all()
-        last = None
-        for r in records:
-            eff = r.effective_mm()
-            if eff is not None and eff > 0:
-                if last is None or r.date > last:
-                    last = r.date
-        return last
+        row = self._connect().execute(
+            "SELECT MAX(date) FROM rainfall WHERE eff_mm > 0"
+        ).fetchone()
+        return date.fromisoformat(row[0]) if row[0] else None
 
     # ------------------------------------------------------------
     # Last watering date
     # ------------------------------------------------------------
     def last_watering_date(self):
-        records = self.list_all()
-        last = None
-        for r in records:
-            if r.watered == "Yes":
-                if last is None or r.date > last:
-                    last = r.date
-        return last
+        row = self._connect().execute(
+            "SELECT MAX(date) FROM rainfall WHERE watered = 'Yes'"
+        ).fetchone()
+        return date.fromisoformat(row[0]) if row[0] else None
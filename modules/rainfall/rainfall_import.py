@@ -0,0 +1,276 @@
+#---------------------------------------------------------------------
+# RAINFALL CSV IMPORT
+# Streaming parse -> validate -> batch upsert pipeline for rain_data.csv
+# style files (Date, Rain_mm, BOM_mm, Notes, Watered[, Moisture]).
+#---------------------------------------------------------------------
+
+import csv
+import json
+import os
+from array import array
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from core.db_connection import get_connection
+from core.settings_db import SettingsDB, get_settings
+from .moisture import MOISTURE_DECIMALS, SETTINGS_SPEC, MoistureEngine
+from .rainfall_db import RainfallDB
+from .rollups import deferred_rollups
+
+
+CHECKPOINT_KEY = "rainfall_import_checkpoint"
+DEFAULT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+NAN = float("nan")
+
+
+@dataclass
+class RowError:
+    line: int
+    message: str
+
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    upserted: int = 0
+    skipped: int = 0
+    resumed_from: int = 0
+    moisture_updated: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+
+DATE_FMT = "%Y-%m-%d"
+
+
+def _parse_float(raw: str) -> Optional[float]:
+    """A rain/BOM cell as a float; blank or unparsable cells are None."""
+    raw = raw.strip()
+    if raw == "":
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def _parse_date(raw: str) -> str:
+    """ISO date string for a Date cell; accepts unpadded dates (2024-1-5)."""
+    raw = raw.strip()
+    try:
+        return date.fromisoformat(raw).isoformat()
+    except ValueError:
+        return datetime.strptime(raw, DATE_FMT).date().isoformat()
+
+
+class RainfallImporter:
+    """
+    Imports a rainfall CSV into the rainfall table.
+
+    - Rows stream through parse/validate and are upserted with executemany
+      in batches of `batch_size`, one transaction per batch.
+    - After each committed batch a checkpoint (file identity + last row) is
+      written in the same transaction, so an interrupted import resumes
+      where it stopped.
+    - Bad rows are reported (first MAX_REPORTED_ERRORS kept) and skipped.
+    - The CSV Moisture column is ignored; moisture is recomputed once for
+      the whole table at the end with the batched kernel.
+
+    progress(result) is called after every committed batch.
+    """
+
+    # Each batch is executemany'd into a plain temp table, then applied
+    # with one set-based upsert: far cheaper than running the upsert (and
+    # the validation triggers' statement setup) once per row.
+    STAGE_SQL = """
+        CREATE TEMP TABLE IF NOT EXISTS _import_stage (
+            date TEXT, rain_mm REAL, bom_mm REAL, notes TEXT, watered TEXT
+        )
+    """
+    MERGE_SQL = """
+        INSERT INTO rainfall (date, rain_mm, bom_mm, notes, watered)
+        SELECT date, rain_mm, bom_mm, notes, watered
+        FROM _import_stage ORDER BY rowid
+        ON CONFLICT(date) DO UPDATE SET
+            rain_mm=excluded.rain_mm,
+            bom_mm=excluded.bom_mm,
+            notes=excluded.notes,
+            watered=excluded.watered
+    """
+
+    def __init__(self, db_path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 progress: Optional[Callable[[ImportResult], None]] = None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.progress = progress
+
+        RainfallDB(db_path)  # ensure schema
+
+    # ------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------
+    @staticmethod
+    def _file_identity(csv_path: str) -> dict:
+        st = os.stat(csv_path)
+        return {"path": os.path.abspath(csv_path), "size": st.st_size, "mtime": st.st_mtime}
+
+    def _load_checkpoint(self, identity: dict) -> int:
+        raw = SettingsDB(self.db_path).get(CHECKPOINT_KEY)
+        if not raw:
+            return 0
+        try:
+            saved = json.loads(raw)
+        except ValueError:
+            return 0
+        if {k: saved.get(k) for k in identity} != identity:
+            return 0  # checkpoint belongs to another file (or it changed)
+        return int(saved.get("rows", 0))
+
+    def _checkpoint_params(self, identity: dict, rows: int) -> tuple:
+        return (CHECKPOINT_KEY, json.dumps(dict(identity, rows=rows)))
+
+    def clear_checkpoint(self):
+        with get_connection(self.db_path) as conn:
+            conn.execute("DELETE FROM settings WHERE key=?", (CHECKPOINT_KEY,))
+
+    # ------------------------------------------------------------
+    # Pipeline stages
+    # ------------------------------------------------------------
+    def _parse(self, reader, result: ImportResult) -> Iterator[Tuple]:
+        """Yield validated (date, rain, bom, notes, watered) tuples."""
+        header = next(reader, None)
+        if header is None:
+            return
+        cols = {name.strip(): i for i, name in enumerate(header)}
+        if "Date" not in cols:
+            raise ValueError("CSV has no Date column")
+
+        i_date = cols["Date"]
+        i_rain = cols.get("Rain_mm")
+        i_bom = cols.get("BOM_mm")
+        i_notes = cols.get("Notes")
+        i_watered = cols.get("Watered")
+        width = len(header)
+
+        if result.resumed_from:
+            for _ in islice(reader, result.resumed_from):
+                pass
+
+        for row in reader:
+            result.rows_read += 1
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            try:
+                d_str = _parse_date(row[i_date])
+            except ValueError:
+                self._error(result, reader.line_num, f"invalid date {row[i_date]!r}")
+                continue
+
+            # Like the old migrator, a cell that isn't a number imports as None
+            rain = _parse_float(row[i_rain]) if i_rain is not None else None
+            bom = _parse_float(row[i_bom]) if i_bom is not None else None
+            if (rain is not None and rain < 0) or (bom is not None and bom < 0):
+                self._error(result, reader.line_num, "negative rain/BOM value")
+                continue
+
+            notes = row[i_notes] if i_notes is not None else ""
+            watered = "Yes" if i_watered is not None and row[i_watered] == "Yes" else "No"
+            yield (d_str, rain, bom, notes, watered)
+
+    @staticmethod
+    def _error(result: ImportResult, line: int, message: str):
+        result.skipped += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(RowError(line, message))
+
+    # ------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------
+    def run(self, csv_path: str, resume: bool = True) -> ImportResult:
+        identity = self._file_identity(csv_path)
+        result = ImportResult()
+        if resume:
+            result.resumed_from = self._load_checkpoint(identity)
+
+        conn = get_connection(self.db_path)
+        conn.execute(self.STAGE_SQL)
+
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            rows = self._parse(reader, result)
+
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                with conn:
+                    conn.executemany("INSERT INTO _import_stage VALUES (?, ?, ?, ?, ?)", batch)
+                    lo, hi = conn.execute("SELECT MIN(date), MAX(date) FROM _import_stage").fetchone()
+                    with deferred_rollups(conn, lo, hi):
+                        conn.execute(self.MERGE_SQL)
+                    conn.execute("DELETE FROM _import_stage")
+                    conn.execute("""
+                        INSERT INTO settings (key, value) VALUES (?, ?)
+                        ON CONFLICT(key) DO UPDATE SET value=excluded.value
+                    """, self._checkpoint_params(identity, result.resumed_from + result.rows_read))
+                result.upserted += len(batch)
+                if self.progress:
+                    self.progress(result)
+
+        result.moisture_updated = self.recompute_moisture()
+        self.clear_checkpoint()
+        return result
+
+    def recompute_moisture(self) -> int:
+        """
+        Recompute the stored moisture for the whole table in one pass and
+        write back only the rows whose 2-decimal value changed.
+        """
+        conn = get_connection(self.db_path)
+        settings = get_settings(self.db_path)
+        settings.register_many(SETTINGS_SPEC)
+        engine = MoistureEngine.from_settings(settings)
+
+        ids = array("q")
+        eff = array("d")
+        watered = array("b")
+        stored = array("d")
+        for rowid, e, w, m in conn.execute(
+            "SELECT id, eff_mm, watered, moisture FROM rainfall ORDER BY date"
+        ):
+            ids.append(rowid)
+            eff.append(NAN if e is None else e)
+            watered.append(1 if w == "Yes" else 0)
+            stored.append(NAN if m is None else m)
+
+        moisture = engine.compute(eff, watered)
+
+        # Stage the changed values by rowid and apply them in one UPDATE ... FROM.
+        with conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS _import_moisture (id INTEGER PRIMARY KEY, moisture REAL)")
+            conn.execute("DELETE FROM _import_moisture")
+            changed = (
+                (ids[i], m)
+                for i, m in enumerate(round(v, MOISTURE_DECIMALS) for v in moisture)
+                if m != stored[i]
+            )
+            updated = 0
+            while True:
+                batch = list(islice(changed, self.batch_size))
+                if not batch:
+                    break
+                conn.executemany("INSERT INTO _import_moisture VALUES (?, ?)", batch)
+                updated += len(batch)
+            if updated:
+                with deferred_rollups(conn):
+                    conn.execute("""
+                        UPDATE rainfall SET moisture = m.moisture
+                        FROM _import_moisture AS m
+                        WHERE rainfall.id = m.id
+                    """)
+            conn.execute("DELETE FROM _import_moisture")
+
+        return updated
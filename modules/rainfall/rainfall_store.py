@@ -0,0 +1,167 @@
+#---------------------------------------------------------------------
+# RAINFALL STORE
+# Typed, columnar in-memory copy of the rainfall table, sorted by date.
+#---------------------------------------------------------------------
+
+import math
+from array import array
+from bisect import bisect_left
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+from .moisture import MOISTURE_DECIMALS
+from .rainfall_db import RainfallRecord
+
+
+NAN = float("nan")
+
+
+def _to_float(value: Optional[float]) -> float:
+    return NAN if value is None else float(value)
+
+
+def _to_optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def effective_value(rain: float, bom: float) -> float:
+    """Rain_mm if it is a number >= 0, else BOM_mm if >= 0, else NaN."""
+    if rain >= 0:        # NaN compares False
+        return rain
+    if bom >= 0:
+        return bom
+    return NAN
+
+
+class RainfallStore:
+    """
+    Column-per-field rainfall history, one row per day, kept sorted:
+
+        days      array('l')  proleptic ordinal (date.toordinal())
+        rain      array('d')  Rain_mm   (NaN = missing)
+        bom       array('d')  BOM_mm    (NaN = missing)
+        eff       array('d')  effective rain, derived from rain/bom
+        moisture  array('d')  moisture checkpoint (NaN = not computed)
+        watered   array('b')  1 = watered
+        notes     list[str]
+
+    Lookup by date is a binary search over `days`; nothing is ever
+    re-parsed from strings. Implements the MoistureEngine series interface.
+    """
+
+    def __init__(self):
+        self.days = array("l")
+        self.rain = array("d")
+        self.bom = array("d")
+        self.eff = array("d")
+        self.moisture = array("d")
+        self.watered = array("b")
+        self.notes = []
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "RainfallStore":
+        """
+        Build from (date_iso, rain_mm, bom_mm, notes, watered, moisture)
+        rows already sorted by date.
+        """
+        store = cls()
+        for d_str, rain, bom, notes, watered, moisture in rows:
+            rain = _to_float(rain)
+            bom = _to_float(bom)
+            store.days.append(date.fromisoformat(d_str).toordinal())
+            store.rain.append(rain)
+            store.bom.append(bom)
+            store.eff.append(effective_value(rain, bom))
+            store.moisture.append(_to_float(moisture))
+            store.watered.append(1 if watered == "Yes" else 0)
+            store.notes.append(notes or "")
+        return store
+
+    def __len__(self):
+        return len(self.days)
+
+    # ------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------
+    def index_of(self, d: date) -> Optional[int]:
+        """Row index for date d, or None. O(log n)."""
+        day = d.toordinal()
+        idx = bisect_left(self.days, day)
+        if idx < len(self.days) and self.days[idx] == day:
+            return idx
+        return None
+
+    def date_at(self, i: int) -> date:
+        return date.fromordinal(self.days[i])
+
+    # ------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------
+    def upsert(self, d: date, rain_mm: Optional[float], bom_mm: Optional[float],
+               notes: str, watered: bool) -> Tuple[int, bool]:
+        """
+        Insert or replace the row for d, keeping date order.
+        Moisture of a new row is NaN until the engine computes it.
+        Returns (index, is_new).
+        """
+        day = d.toordinal()
+        rain = _to_float(rain_mm)
+        bom = _to_float(bom_mm)
+        eff = effective_value(rain, bom)
+
+        idx = bisect_left(self.days, day)
+        if idx < len(self.days) and self.days[idx] == day:
+            self.rain[idx] = rain
+            self.bom[idx] = bom
+            self.eff[idx] = eff
+            self.notes[idx] = notes
+            self.watered[idx] = 1 if watered else 0
+            return idx, False
+
+        self.days.insert(idx, day)
+        self.rain.insert(idx, rain)
+        self.bom.insert(idx, bom)
+        self.eff.insert(idx, eff)
+        self.moisture.insert(idx, NAN)
+        self.watered.insert(idx, 1 if watered else 0)
+        self.notes.insert(idx, notes)
+        return idx, True
+
+    def remove(self, i: int):
+        del self.days[i]
+        del self.rain[i]
+        del self.bom[i]
+        del self.eff[i]
+        del self.moisture[i]
+        del self.watered[i]
+        del self.notes[i]
+
+    # ------------------------------------------------------------
+    # MoistureEngine series interface
+    # ------------------------------------------------------------
+    def effective(self, i: int) -> Optional[float]:
+        return _to_optional(self.eff[i])
+
+    def is_watered(self, i: int) -> bool:
+        return self.watered[i] == 1
+
+    def moisture_at(self, i: int) -> Optional[float]:
+        return _to_optional(self.moisture[i])
+
+    def set_moisture(self, i: int, value: float):
+        self.moisture[i] = value
+
+    # ------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------
+    def to_record(self, i: int) -> RainfallRecord:
+        """Row i as a RainfallRecord, with moisture rounded to MOISTURE_DECIMALS."""
+        moisture = _to_optional(self.moisture[i])
+        return RainfallRecord(
+            date_obj=self.date_at(i),
+            rain_mm=_to_optional(self.rain[i]),
+            bom_mm=_to_optional(self.bom[i]),
+            notes=self.notes[i],
+            watered="Yes" if self.watered[i] else "No",
+            moisture=None if moisture is None else round(moisture, MOISTURE_DECIMALS),
+        )
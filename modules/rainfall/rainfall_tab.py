@@ -4,19 +4,26 @@
 #(Option 1 moisture model, same UI, same dashboard).
 #---------------------------------------------------------------------
 
+import math
 import os
 from pathlib import Path
 import sys
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 import tkinter as tk
 from tkinter import ttk, messagebox
 
 
 from tkcalendar import DateEntry
 
-from .rainfall_db import RainfallDB, RainfallRecord
-from core.settings_db import SettingsDB
+from .rainfall_db import RainfallDB
+from .dashboard_state import DashboardState
+from .rainfall_store import RainfallStore
+from .moisture import SETTINGS_SPEC, MoistureEngine
+from .gaps import missing_ranges_from_days, totals_by_year
+from core.db_worker import TkBridge, get_executor
+from core.settings_db import get_settings
+from core.virtual_treeview import VirtualTreeview
 
 
 DATE_FMT = "%Y-%m-%d"  # storage format
@@ -35,270 +42,168 @@ def resource_path(name: str) -> str:
 DB_PATH = resource_path("home_maintenance.db")
 
 
-def load_settings():
-    # Default settings
-    defaults = {
-        "threshold_mm": 10.0,
-        "period_days": 7,
-    }
-
-    db = SettingsDB(DB_PATH)
-    settings = {}
-
-    # Load existing values or seed defaults
-    for key, default in defaults.items():
-        val = db.get(key, None)
-        if val is None:
-            settings[key] = default
-            db.set(key, default)
-        else:
-            # Cast types where needed
-            if key == "threshold_mm":
-                try:
-                    settings[key] = float(val)
-                except ValueError:
-                    settings[key] = default
-            elif key == "period_days":
-                try:
-                    settings[key] = int(val)
-                except ValueError:
-                    settings[key] = default
-            else:
-                settings[key] = val
-
+def rainfall_settings(db_path: str = DB_PATH):
+    """The shared settings cache, with the moisture model keys registered."""
+    settings = get_settings(db_path)
+    settings.register_many(SETTINGS_SPEC)
     return settings
 
 
-def save_settings(settings):
-    db = SettingsDB(DB_PATH)
-    for key, value in settings.items():
-        db.set(key, value)
+def _fmt_mm(value):
+    """Display string for a stored float column (NaN = blank)."""
+    return "" if math.isnan(value) else str(value)
+
 
 class RainFallTab(ttk.Frame):
-    def __init__(self, parent):
+    def __init__(self, parent, db_path: str = DB_PATH):
         super().__init__(parent)
 
-        # Load settings FIRST
-        self.settings = load_settings()
+        self.db_path = db_path
+
+        # Load settings FIRST (process-wide cache; see core.settings_db)
+        self.settings = rainfall_settings(db_path)
 
         # SQLite DB for rainfall
-        self.db = RainfallDB(DB_PATH)
+        self.db = RainfallDB(db_path)
+
+        # Moisture model (rebuilt when threshold/period change)
+        self.engine = MoistureEngine.from_settings(self.settings)
 
-        self.records = []  # list of dicts (kept for compatibility with existing logic)
+        # Typed, date-sorted in-memory copy of the rainfall table
+        self.store = RainfallStore()
+        self.dashboard = DashboardState(self.store)
+
+        # Change set since the last save (date ordinals)
+        self._dirty_days = set()
+        self._deleted_days = set()
+
+        # Rebuild the model only when threshold/period really change
+        self._unsubscribe_settings = self.settings.subscribe(
+            self._on_model_settings_changed, keys=SETTINGS_SPEC
+        )
+
+        # DB work runs off the Tk thread; results come back via after()
+        self.worker = get_executor(db_path)
+        self.bridge = TkBridge(self, on_error=self._on_db_error)
+        self._loaded = False
+        self._model_changed = False   # threshold/period changed during the load
+        self._pending_show = None   # date to select once the data has loaded
+        self._selected_day = None   # ordinal of the selected row's date
 
         self._build_ui()
         self._load_data()
-        self._refresh_table()
-        self._update_dashboard()
-        
+
+    def destroy(self):
+        self._unsubscribe_settings()
+        self.bridge.cancel()
+        super().destroy()
+
+    def _on_db_error(self, exc):
+        messagebox.showerror("Database error", str(exc))
+
     # ---------- Data layer ----------
     def _load_data(self):
-        """
-        Load rainfall records from SQLite into self.records
-        as a list of dicts, preserving the original structure.
-        """
-        self.records.clear()
+        """Load rainfall rows from SQLite into the columnar store (in the background)."""
+        self.bridge.deliver(
+            self.worker.submit_read(self.db.list_rows, consistent=True),
+            self._on_data_loaded,
+        )
 
-        records = self.db.list_all()
-        for r in records:
-            self.records.append({
-                "Date": r.date.strftime(DATE_FMT),
-                "Rain_mm": "" if r.rain_mm is None else str(r.rain_mm),
-                "BOM_mm": "" if r.bom_mm is None else str(r.bom_mm),
-                "Notes": r.notes or "",
-                "Watered": r.watered or "No",
-                "Moisture": "" if r.moisture is None else f"{float(r.moisture):.2f}",
-            })
+    def _on_data_loaded(self, rows):
+        self.store = RainfallStore.from_rows(rows)
+        self.dashboard = DashboardState(self.store)
+        self._loaded = True
+        if self._model_changed:
+            # The rows were saved under the previous model
+            self._model_changed = False
+            self._mark_dirty(self._recompute_all())
+            self._save_data()
+        self._refresh_table()
+        self._update_dashboard()
+        if self._pending_show is not None:
+            self.show_date(self._pending_show)
 
-        self._sort_records()
+    def show_date(self, d: date):
+        """Select and scroll to the row for date d (e.g. a search hit)."""
+        if not self._loaded:
+            self._pending_show = d
+            return
+        self._pending_show = None
+        idx = self.store.index_of(d)
+        if idx is not None:
+            self.table.select(idx)
+
+    def _mark_dirty(self, indices):
+        """Record rows (by index) that must be upserted on the next save."""
+        for i in indices:
+            day = self.store.days[i]
+            self._dirty_days.add(day)
+            self._deleted_days.discard(day)
+
+    def _mark_deleted(self, day):
+        """Record a day (ordinal) whose row must be deleted on the next save."""
+        self._dirty_days.discard(day)
+        self._deleted_days.add(day)
 
     def _save_data(self):
         """
-        Persist self.records into SQLite using date-based upsert sync.
-        This avoids destructive full-table truncation.
+        Persist only the rows changed since the last save, as one
+        change-set transaction (see RainfallDB.apply_changes).
         """
-        db_records = []
-        for rec in self.records:
-            d_str = rec.get("Date", "")
-            try:
-                d_obj = datetime.strptime(d_str, DATE_FMT).date()
-            except ValueError:
-                continue
-
-            rain_str = rec.get("Rain_mm", "").strip()
-            bom_str = rec.get("BOM_mm", "").strip()
-            notes = rec.get("Notes", "")
-            watered = "Yes" if rec.get("Watered", "No") == "Yes" else "No"
-            moisture_str = rec.get("Moisture", "").strip()
-
-            rain_val = None
-            bom_val = None
-            moisture_val = None
-
-            try:
-                if rain_str != "":
-                    rain_val = float(rain_str)
-            except ValueError:
-                rain_val = None
-
-            try:
-                if bom_str != "":
-                    bom_val = float(bom_str)
-            except ValueError:
-                bom_val = None
-
-            try:
-                if moisture_str != "":
-                    moisture_val = float(moisture_str)
-            except ValueError:
-                moisture_val = None
-
-            db_records.append(
-                RainfallRecord(
-                    date_obj=d_obj,
-                    rain_mm=rain_val,
-                    bom_mm=bom_val,
-                    notes=notes,
-                    watered=watered,
-                    moisture=moisture_val,
-                )
+        upserts = []
+        for day in sorted(self._dirty_days):
+            idx = self.store.index_of(date.fromordinal(day))
+            if idx is not None:
+                upserts.append(self.store.to_record(idx))
+
+        deleted = [date.fromordinal(day) for day in sorted(self._deleted_days)]
+
+        # Records are snapshots, so the write can run on the DB writer
+        # thread while the UI carries on. The change set leaves the
+        # pending sets now and goes back into them if the write fails.
+        if upserts or deleted:
+            dirty, removed = set(self._dirty_days), set(self._deleted_days)
+            self.bridge.deliver(
+                self.worker.submit_write(self.db.apply_changes, upserts, deleted),
+                lambda _result: None,
+                on_error=lambda exc: self._on_save_failed(exc, dirty, removed),
             )
+        self._dirty_days.clear()
+        self._deleted_days.clear()
+
+    def _on_save_failed(self, exc, dirty, deleted):
+        """Put a failed change set back so the next save retries it."""
+        # Days marked again since then already hold their newer change
+        pending = self._dirty_days | self._deleted_days
+        self._dirty_days |= dirty - pending
+        self._deleted_days |= deleted - pending
+        messagebox.showerror(
+            "Database error",
+            f"{exc}\n\nYour changes were kept and will be saved with the next edit.",
+        )
 
-        self.db.sync_records(db_records)
-
-    def _sort_records(self):
-        def parse_date(d):
-            try:
-                return datetime.strptime(d, DATE_FMT).date()
-            except Exception:
-                return date.min
-
-        self.records.sort(key=lambda r: parse_date(r["Date"]))
-
-    def _effective_mm(self, rec):
-        """Return effective rainfall:
-           1. Use Rain_mm if it's a number >= 0
-           2. Else use BOM_mm if it's a number >= 0
-           3. Else return None (invalid)
-        """
-        rain_raw = rec.get("Rain_mm", "").strip()
-        bom_raw = rec.get("BOM_mm", "").strip()
-
-        # Try Rain_mm first
-        try:
-            rain_val = float(rain_raw)
-            if rain_val >= 0:
-                return rain_val
-        except ValueError:
-            pass
-
-        # Try BOM_mm next
-        try:
-            bom_val = float(bom_raw)
-            if bom_val >= 0:
-                return bom_val
-        except ValueError:
-            pass
-
-        # Neither valid
-        return None
-
-    def _compute_moisture_delta(self, eff_rain, watered_flag):
+    def _compute_moisture_delta(self, eff_rain, watered):
         """
         Compute moisture delta for the day using smooth net decay:
         Delta = Effective_mm + Watering_contribution - Loss
         where Loss = threshold / period_days
         """
-        try:
-            threshold = float(self.settings.get("threshold_mm", 20.0))
-        except ValueError:
-            threshold = 20.0
-
-        try:
-            period_days = int(self.settings.get("period_days", 5))
-            if period_days <= 0:
-                period_days = 5
-        except ValueError:
-            period_days = 5
-
-        loss = threshold / period_days
-        watering_contribution = threshold if watered_flag == "Yes" else 0
-        rain_contribution = eff_rain if eff_rain is not None else 0
-
-        return rain_contribution + watering_contribution - loss
+        return self.engine.delta(eff_rain, watered)
 
-    def _compute_daily_moisture(self, prev_moisture, eff_rain, watered_flag):
+    def _recompute_from(self, start_idx):
         """
-        Compute today's moisture using smooth net decay:
-        Moisture = prev_moisture + Delta (clamped to [0, threshold])
+        Recompute moisture from row start_idx forward, stopping once the
+        values converge with what is already stored.
+        Returns the indices whose moisture changed.
         """
-        try:
-            threshold = float(self.settings.get("threshold_mm", 20.0))
-        except ValueError:
-            threshold = 20.0
+        return self.engine.propagate(self.store, start_idx)
 
-        # Calculate delta
-        delta = self._compute_moisture_delta(eff_rain, watered_flag)
-
-        # Apply delta to previous moisture
-        moisture = prev_moisture + delta
-        moisture = max(0, moisture)  # Cannot be negative
-        moisture = min(moisture, threshold)  # Cap at threshold
-
-        return moisture
-
-    def _recompute_from(self, start_date):
+    def _recompute_all(self):
         """
-        Recompute moisture from start_date forward, using stored settings.
-        Used when a historical row is edited or settings are changed.
+        Recompute moisture for all rows from oldest to newest.
+        Returns the indices whose moisture changed.
         """
-        # Sort to ensure correct order
-        self._sort_records()
-
-        # Find index of start_date
-        start_idx = None
-        for i, rec in enumerate(self.records):
-            if rec["Date"] == start_date.strftime(DATE_FMT):
-                start_idx = i
-                break
-
-        if start_idx is None:
-            return  # nothing to do
-
-        # Determine previous day's moisture
-        if start_idx == 0:
-            prev_moisture = 0.0
-        else:
-            try:
-                prev_moisture = float(self.records[start_idx - 1].get("Moisture", 0.0))
-            except ValueError:
-                prev_moisture = 0.0
-
-        # Recompute forward
-        for i in range(start_idx, len(self.records)):
-            rec = self.records[i]
-            eff = self._effective_mm(rec)
-            watered_flag = rec.get("Watered", "No")
-
-            moisture = self._compute_daily_moisture(prev_moisture, eff, watered_flag)
-
-            rec["Moisture"] = f"{moisture:.2f}"
-            prev_moisture = moisture
-
-    def _recompute_all(self):
-        """Recompute moisture for all rows from oldest to newest."""
-        if not self.records:
-            return
-
-        self._sort_records()
-        prev_moisture = 0.0
-
-        for rec in self.records:
-            eff = self._effective_mm(rec)
-            watered_flag = rec.get("Watered", "No")
-            moisture = self._compute_daily_moisture(prev_moisture, eff, watered_flag)
-            rec["Moisture"] = f"{moisture:.2f}"
-            prev_moisture = moisture
+        return self.engine.recompute_all(self.store)
 
     # ---------- UI construction ----------
     def _build_ui(self):
@@ -343,19 +248,22 @@ class RainFallTab(ttk.Frame):
         table_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=5)
 
         columns = ("Date", "Rain_mm", "BOM_mm", "Moisture_Delta", "Moisture", "Notes", "Watered")
-        
-        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings")
-        
+
+        # Virtual table: only the rows in view are materialized
+        self.table = VirtualTreeview(
+            table_frame,
+            columns,
+            row_count=lambda: len(self.store),
+            row_provider=self._table_row,
+        )
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.table.tree
+
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=100 if col != "Notes" else 250, anchor="center")
-            self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.tree.bind("<<TreeviewSelect>>", self._on_select_row)
+        self.table.bind("<<RowSelected>>", self._on_select_row)
 
         self.tree.tag_configure("watered", background="#90EE90")       # PaleGreen2
         self.tree.tag_configure("rain", background="#87CEFA")          # LightSkyBlue
@@ -374,7 +282,7 @@ class RainFallTab(ttk.Frame):
         tk.Label(dash_frame, text="Threshold (mm):").grid(row=0, column=2, sticky="e")
         self.entry_threshold = tk.Entry(dash_frame, width=6)
         self.entry_threshold.grid(row=0, column=3, padx=5)
-        self.entry_threshold.insert(0, str(self.settings["threshold_mm"]))
+        self.entry_threshold.insert(0, str(self.settings.get("threshold_mm")))
 
         # Row 1
         tk.Label(dash_frame, text="Moisture balance:").grid(row=1, column=0, sticky="e")
@@ -432,6 +340,8 @@ class RainFallTab(ttk.Frame):
 
     # ---------- UI actions ----------
     def _on_add_update(self):
+        if not self._loaded:
+            return   # edits would be lost when the initial load lands
         d_str = self.entry_date.get().strip()
         rain_str = self.entry_rain.get().strip()
         bom_str = self.entry_bom.get().strip()
@@ -484,136 +394,122 @@ class RainFallTab(ttk.Frame):
             )
             return
 
-        # --- Compute moisture for this date ---
-
-        # 1. Determine previous day's moisture
-        prev_moisture = 0.0
-        yesterday = d_obj - timedelta(days=1)
-
-        for r in self.records:
-            if r["Date"] == yesterday.strftime(DATE_FMT):
-                try:
-                    prev_moisture = float(r.get("Moisture", 0.0))
-                except ValueError:
-                    prev_moisture = 0.0
-                break
-
-        # 2. Effective rainfall for today
-        eff_today = None
-        try:
-            if rain_str != "":
-                eff_today = float(rain_str)
-            elif bom_str != "":
-                eff_today = float(bom_str)
-        except:
-            eff_today = None
+        # --- Upsert record ---
+        rain_val = float(rain_str) if rain_str != "" else None
+        bom_val = float(bom_str) if bom_str != "" else None
+        idx, is_new = self.store.upsert(d_obj, rain_val, bom_val, notes_str, watered_flag == "Yes")
+        self.dashboard.row_changed(idx)
 
-        # 3. Compute moisture for today using smooth net decay
-        moisture_today = self._compute_daily_moisture(prev_moisture, eff_today, watered_flag)
+        # Recompute moisture forward from this date (stops on convergence)
+        dirty = self._recompute_from(idx)
+        self._mark_dirty([idx])
+        self._mark_dirty(dirty)
 
-        # --- Upsert record ---
-        found = False
-        for rec in self.records:
-            if rec["Date"] == d_obj.strftime(DATE_FMT):
-                rec["Rain_mm"] = rain_str
-                rec["BOM_mm"] = bom_str
-                rec["Notes"] = notes_str
-                rec["Watered"] = watered_flag
-                rec["Moisture"] = f"{moisture_today:.2f}"
-                found = True
-                break
-        
-        if not found:
-            self.records.append({
-                "Date": d_obj.strftime(DATE_FMT),
-                "Rain_mm": rain_str,
-                "BOM_mm": bom_str,
-                "Notes": notes_str,
-                "Watered": watered_flag,
-                "Moisture": f"{moisture_today:.2f}",
-            })
-
-        # Recompute moisture forward from this date
-        self._recompute_from(d_obj)
-        
-        self._sort_records()
         self._save_data()
-        self._refresh_table()
+        if is_new:
+            self._refresh_table()
+        else:
+            self._refresh_rows([idx] + dirty)
         self._update_dashboard()
 
     def _on_delete(self):
-        sel = self.tree.selection()
-        if not sel:
+        if not self._loaded:
             return
-        item_id = sel[0]
-        values = self.tree.item(item_id, "values")
-        d_str = values[0]
-        self.records = [r for r in self.records if r["Date"] != d_str]
-        self._recompute_all()
+        # Rows shift on every add/delete, so the selection is kept by date
+        if self._selected_day is None:
+            return
+        idx = self.store.index_of(date.fromordinal(self._selected_day))
+        if idx is None:
+            return
+        day = self.store.days[idx]
+        self._mark_deleted(day)
+        self.store.remove(idx)
+        self.dashboard.row_removed(day)
+
+        # Only rows after the deleted day can change
+        self._mark_dirty(self._recompute_from(idx))
         self._save_data()
         self._refresh_table()
         self._update_dashboard()
 
     def _on_select_row(self, event):
-        sel = self.tree.selection()
-        if not sel:
+        idx = self.table.selected_index()
+        if idx is None:
             return
-        item_id = sel[0]
-        values = self.tree.item(item_id, "values")
+        store = self.store
+        self._selected_day = store.days[idx]
         self.entry_date.delete(0, tk.END)
-        self.entry_date.insert(0, values[0])
+        self.entry_date.insert(0, store.date_at(idx).strftime(DATE_FMT))
         self.entry_rain.delete(0, tk.END)
-        self.entry_rain.insert(0, values[1])
+        self.entry_rain.insert(0, _fmt_mm(store.rain[idx]))
         self.entry_bom.delete(0, tk.END)
-        self.entry_bom.insert(0, values[2])
+        self.entry_bom.insert(0, _fmt_mm(store.bom[idx]))
         self.entry_notes.delete(0, tk.END)
-        self.entry_notes.insert(0, values[5])
-        self.var_watered.set(values[6] == "Yes")
+        self.entry_notes.insert(0, store.notes[idx])
+        self.var_watered.set(store.is_watered(idx))
 
     # ---------- Table & dashboard refresh ----------
 
-    def _refresh_table(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        for rec in self.records:
-            eff = self._effective_mm(rec)
-            watered_flag = rec.get("Watered", "No")
-            delta = self._compute_moisture_delta(eff, watered_flag)
-            delta_str = f"{delta:+.1f}"
-
-            # Determine tag priority
-            if watered_flag == "Yes":
-                tags = ("watered",)
+    def _table_row(self, index):
+        """Values and colour tags for table row `index` (called for visible rows only)."""
+        store = self.store
+        eff = store.effective(index)
+        watered = store.is_watered(index)
+        delta = self._compute_moisture_delta(eff, watered)
+        delta_str = f"{delta:+.1f}"
+
+        # Determine tag priority
+        if watered:
+            tags = ("watered",)
+        else:
+            if eff is None:
+                tags = ()  # invalid data, no colour
+            elif eff > 0:
+                tags = ("rain",)
             else:
-                if eff is None:
-                    tags = ()  # invalid data, no colour
-                elif eff > 0:
-                    tags = ("rain",)
-                else:
-                    tags = ("dry",)
-
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    rec["Date"],
-                    rec["Rain_mm"],
-                    rec["BOM_mm"],
-                    delta_str,
-                    rec.get("Moisture", ""),
-                    rec["Notes"],
-                    rec["Watered"],
-                ),
-                tags=tags
-            )
-            
+                tags = ("dry",)
+
+        moisture = store.moisture[index]
+        values = (
+            store.date_at(index).strftime(DATE_FMT),
+            _fmt_mm(store.rain[index]),
+            _fmt_mm(store.bom[index]),
+            delta_str,
+            "" if math.isnan(moisture) else f"{moisture:.2f}",
+            store.notes[index],
+            "Yes" if watered else "No",
+        )
+        return values, tags
+
+    def _refresh_table(self):
+        # Keep the highlight on the selected date (cleared if it was deleted)
+        idx = None
+        if self._selected_day is not None:
+            idx = self.store.index_of(date.fromordinal(self._selected_day))
+            if idx is None:
+                self._selected_day = None
+        self.table.set_selected_index(idx)
+
         # ✅ Scroll to the bottom so latest entries are visible
-        self.tree.yview_moveto(1.0)
+        self.table.scroll_to_end()
+
+    def _refresh_rows(self, indices):
+        """Update the given rows in place (no-op for rows out of view)."""
+        for idx in indices:
+            self.table.refresh_row(idx)
+
+    def _on_model_settings_changed(self, changes):
+        self.engine = MoistureEngine.from_settings(self.settings)
+        if not self._loaded:
+            self._model_changed = True   # recompute once the rows arrive
+            return
+        self._mark_dirty(self._recompute_all())
+        self._save_data()
+        self._refresh_table()
 
     def _update_dashboard(self):
-        old_threshold = self.settings.get("threshold_mm", 20.0)
-        old_period_days = self.settings.get("period_days", 5)
+        if not self._loaded:
+            return   # _on_data_loaded refreshes it (and applies the entries)
 
         # --- Threshold (mm) ---
         try:
@@ -633,47 +529,17 @@ class RainFallTab(ttk.Frame):
             self.entry_period.delete(0, tk.END)
             self.entry_period.insert(0, str(period_days))
 
-        # Save updated settings
-        self.settings["threshold_mm"] = threshold
-        self.settings["period_days"] = period_days
-        save_settings(self.settings)
-
-        settings_changed = (threshold != old_threshold) or (period_days != old_period_days)
-        if settings_changed:
-            self._recompute_all()
-            self._save_data()
-            self._refresh_table()
+        # Save updated settings: a no-op unless a value changed, in which
+        # case _on_model_settings_changed recomputes before we read balance.
+        self.settings.update({"threshold_mm": threshold, "period_days": period_days})
 
+        # Every figure below is maintained incrementally (DashboardState),
+        # so a refresh costs the same however long the history is.
+        facts = self.dashboard.facts()
         today = date.today()
-        last_watering_date = None
-        last_rain_date = None
-
-        # --- Last watering & last rainfall dates (independent of moisture model) ---
-        for rec in self.records:
-            try:
-                d_obj = datetime.strptime(rec["Date"], DATE_FMT).date()
-            except ValueError:
-                continue
-
-            eff = self._effective_mm(rec)
-            if eff is not None and eff > 0:
-                if last_rain_date is None or d_obj > last_rain_date:
-                    last_rain_date = d_obj
-
-            if rec.get("Watered", "No") == "Yes":
-                if last_watering_date is None or d_obj > last_watering_date:
-                    last_watering_date = d_obj
 
         # --- Moisture Mode (Stored Moisture) ---
-        if self.records:
-            last_rec = self.records[-1]
-            try:
-                balance = float(last_rec.get("Moisture", 0.0))
-            except ValueError:
-                balance = 0.0
-        else:
-            balance = 0.0
-
+        balance = facts.balance
         self.lbl_moisture_balance.config(text=f"{balance:.1f} mm")
 
         if balance <= 0:
@@ -681,7 +547,8 @@ class RainFallTab(ttk.Frame):
         else:
             self.lbl_watering.config(text="No watering needed", bg="green", fg="white")
 
-        # Last watering date + days since
+        # Last watering date + days since (independent of moisture model)
+        last_watering_date = facts.last_watering
         if last_watering_date is None:
             self.lbl_last_watering.config(text="-")
             self.lbl_days_since_watering.config(text="-")
@@ -690,6 +557,7 @@ class RainFallTab(ttk.Frame):
             self.lbl_days_since_watering.config(text=str((today - last_watering_date).days))
 
         # Last rainfall date + days since
+        last_rain_date = facts.last_rain
         if last_rain_date is None:
             self.lbl_last_rain_date.config(text="-")
             self.lbl_days_since.config(text="-")
@@ -698,54 +566,58 @@ class RainFallTab(ttk.Frame):
             self.lbl_days_since.config(text=str((today - last_rain_date).days))
 
         # Missing days detector
-        missing = self._compute_missing_dates()
-
-        if missing:
+        if facts.missing_days > 0:
             self.lbl_missing.config(text="Missing days detected")
             self.btn_show_missing.grid()   # show button
         else:
             self.lbl_missing.config(text="No missing days")
             self.btn_show_missing.grid_remove()   # hide button
 
-    def _compute_missing_dates(self):
-        """Return list of missing dates (as date objects) between min and max Date."""
-        if not self.records:
-            return []
-
-        dates = []
-        for rec in self.records:
-            try:
-                d_obj = datetime.strptime(rec["Date"], DATE_FMT).date()
-                dates.append(d_obj)
-            except ValueError:
-                continue
-        if not dates:
-            return []
-
-        dates = sorted(set(dates))
-        all_dates = []
-        d = dates[0]
-        while d <= dates[-1]:
-            all_dates.append(d)
-            d += timedelta(days=1)
-
-        existing = set(dates)
-        missing = [d for d in all_dates if d not in existing]
-        return missing
+    def _missing_ranges(self):
+        """Missing days between the first and last record, as (start, end, days) ranges."""
+        return missing_ranges_from_days(self.store.days)
 
     def _show_missing_dates(self):
-        missing = self._compute_missing_dates()
-        if not missing:
+        ranges = self._missing_ranges()
+        if not ranges:
             messagebox.showinfo("Missing Dates", "No missing days.")
             return
 
         win = tk.Toplevel(self)
         win.title("Missing Dates")
-        txt = tk.Text(win, width=20, height=15)
-        txt.pack(fill=tk.BOTH, expand=True)
-        for d in missing:
-            txt.insert(tk.END, d.strftime(DATE_FMT) + "\n")
-        txt.config(state="disabled")
+
+        total = sum(r.days for r in ranges)
+        tk.Label(win, text=f"{total} missing days in {len(ranges)} gaps").pack(anchor="w", padx=5, pady=3)
+
+        body = tk.Frame(win)
+        body.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        # Ranges (one row per gap, not per day)
+        range_tree = ttk.Treeview(body, columns=("Start", "End", "Days"), show="headings", height=15)
+        for col in ("Start", "End", "Days"):
+            range_tree.heading(col, text=col)
+            range_tree.column(col, width=90, anchor="center")
+        range_scroll = ttk.Scrollbar(body, orient="vertical", command=range_tree.yview)
+        range_tree.configure(yscrollcommand=range_scroll.set)
+        range_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        range_scroll.pack(side=tk.LEFT, fill=tk.Y)
+
+        for r in ranges:
+            range_tree.insert("", tk.END, values=(
+                r.start.strftime(DATE_FMT),
+                r.end.strftime(DATE_FMT),
+                r.days,
+            ))
+
+        # Totals per year
+        year_tree = ttk.Treeview(body, columns=("Year", "Missing"), show="headings", height=15)
+        for col in ("Year", "Missing"):
+            year_tree.heading(col, text=col)
+            year_tree.column(col, width=70, anchor="center")
+        year_tree.pack(side=tk.LEFT, fill=tk.Y, padx=(10, 0))
+
+        for year, days in sorted(totals_by_year(ranges).items()):
+            year_tree.insert("", tk.END, values=(year, days))
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,248 @@
+#---------------------------------------------------------------------
+# RAINFALL ROLLUPS
+# Weekly, monthly and yearly rainfall totals from the rollup tables
+# (kept current by triggers, see core/migrations.py), and totals for
+# any date span without reading the whole rainfall table.
+#---------------------------------------------------------------------
+
+import calendar
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional
+
+from core.db_connection import get_connection
+from core.migrations import ensure_schema
+
+
+class RainfallRollup(NamedTuple):
+    start: date
+    end: date                        # inclusive
+    days: int                        # recorded days (fewer than the span if days are missing)
+    rain_mm: float                   # effective rainfall total
+    rain_days: int
+    watering_days: int
+    moisture_min: Optional[float]
+    moisture_max: Optional[float]
+    moisture_mean: Optional[float]
+
+
+# Period -> (table, SQL expression for the period's last day)
+_PERIODS = {
+    "week":  ("rainfall_weekly", "date(period_start, '+6 days')"),
+    "month": ("rainfall_monthly", "date(period_start, '+1 month', '-1 day')"),
+    "year":  ("rainfall_yearly", "date(period_start, '+1 year', '-1 day')"),
+}
+
+
+DEFER_KEY = "rainfall_rollups_deferred"   # settings key checked by the triggers
+
+# Daily-bucket tables: (table, first day of the bucket holding {},
+# modifiers from the first day to the last)
+_DAILY_BUCKETS = (
+    ("rainfall_weekly", "date({}, '-6 days', 'weekday 1')", "'+6 days'"),
+    ("rainfall_monthly", "date({}, 'start of month')", "'+1 month', '-1 day'"),
+)
+
+_DAILY_AGGREGATES = """
+    COUNT(*), TOTAL(eff_mm),
+    COUNT(CASE WHEN eff_mm > 0 THEN 1 END),
+    COUNT(CASE WHEN watered = 'Yes' THEN 1 END),
+    MIN(moisture), MAX(moisture), TOTAL(moisture), COUNT(moisture)
+"""
+
+
+def _first_of_next_month(d: date) -> date:
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+class RainfallRollupDB:
+    """
+    Read side of the rainfall rollup tables. Each daily write refreshes
+    only its own week, month and year, so these queries cost the same
+    however much history is stored.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        ensure_schema(db_path)
+
+    def _connect(self):
+        return get_connection(self.db_path)
+
+    # ------------------------------------------------------------
+    # Per-period rows
+    # ------------------------------------------------------------
+    def periods(self, period: str, start: Optional[date] = None,
+                end: Optional[date] = None) -> List[RainfallRollup]:
+        """
+        Rollups for `period` ("week", "month" or "year") starting within
+        start..end (inclusive; None = unbounded), oldest first. Weeks
+        start on Monday. Periods with no recorded days are absent.
+        """
+        table, end_expr = _PERIODS[period]
+        rows = self._connect().execute(f"""
+            SELECT period_start, {end_expr}, days, rain_mm, rain_days, watering_days,
+                   moisture_min, moisture_max, moisture_sum / NULLIF(moisture_count, 0)
+            FROM {table}
+            WHERE period_start BETWEEN ? AND ?
+            ORDER BY period_start
+        """, (
+            start.isoformat() if start else "",
+            end.isoformat() if end else "9999-12-31",
+        ))
+        return [
+            RainfallRollup(date.fromisoformat(s), date.fromisoformat(e), *rest)
+            for s, e, *rest in rows
+        ]
+
+    def weekly(self, start: Optional[date] = None, end: Optional[date] = None) -> List[RainfallRollup]:
+        return self.periods("week", start, end)
+
+    def monthly(self, start: Optional[date] = None, end: Optional[date] = None) -> List[RainfallRollup]:
+        return self.periods("month", start, end)
+
+    def yearly(self, start: Optional[date] = None, end: Optional[date] = None) -> List[RainfallRollup]:
+        return self.periods("year", start, end)
+
+    # ------------------------------------------------------------
+    # Any span
+    # ------------------------------------------------------------
+    def span(self, start: date, end: date) -> RainfallRollup:
+        """
+        Totals for start..end (inclusive). Whole years come from
+        rainfall_yearly, whole months at either side from
+        rainfall_monthly, and only the part-months at the ends (at most
+        ~60 days) from rainfall itself.
+        """
+        # Whole months inside the span: [m0, m1)
+        m0 = start if start.day == 1 else _first_of_next_month(start)
+        if end.day == calendar.monthrange(end.year, end.month)[1]:
+            m1 = _first_of_next_month(end)
+        else:
+            m1 = date(end.year, end.month, 1)
+
+        if m0 >= m1:
+            days = [(start, end)]
+            months = []
+            years = []
+        else:
+            days = [(start, m0 - timedelta(days=1)), (m1, end)]
+            # Whole years inside the whole months: [y0, y1)
+            y0 = m0 if m0.month == 1 else date(m0.year + 1, 1, 1)
+            y1 = date(m1.year, 1, 1)
+            if y0 >= y1:
+                months = [(m0, m1)]
+                years = []
+            else:
+                months = [(m0, y0), (y1, m1)]
+                years = [(y0, y1)]
+
+        # Empty ranges (lo > hi) simply match nothing
+        def ranges(pairs, inclusive):
+            op = "<=" if inclusive else "<"
+            where = " OR ".join(f"({{0}} >= ? AND {{0}} {op} ?)" for _ in pairs) or "0"
+            params = [d.isoformat() for pair in pairs for d in pair]
+            return where, params
+
+        day_where, day_params = ranges(days, inclusive=True)
+        month_where, month_params = ranges(months, inclusive=False)
+        year_where, year_params = ranges(years, inclusive=False)
+
+        row = self._connect().execute(f"""
+            SELECT TOTAL(days), TOTAL(rain_mm), TOTAL(rain_days), TOTAL(watering_days),
+                   MIN(moisture_min), MAX(moisture_max),
+                   TOTAL(moisture_sum) / NULLIF(TOTAL(moisture_count), 0)
+            FROM (
+                SELECT COUNT(*) AS days, TOTAL(eff_mm) AS rain_mm,
+                       COUNT(CASE WHEN eff_mm > 0 THEN 1 END) AS rain_days,
+                       COUNT(CASE WHEN watered = 'Yes' THEN 1 END) AS watering_days,
+                       MIN(moisture) AS moisture_min, MAX(moisture) AS moisture_max,
+                       TOTAL(moisture) AS moisture_sum, COUNT(moisture) AS moisture_count
+                FROM rainfall
+                WHERE {day_where.format("date")}
+                UNION ALL
+                SELECT days, rain_mm, rain_days, watering_days,
+                       moisture_min, moisture_max, moisture_sum, moisture_count
+                FROM rainfall_monthly
+                WHERE {month_where.format("period_start")}
+                UNION ALL
+                SELECT days, rain_mm, rain_days, watering_days,
+                       moisture_min, moisture_max, moisture_sum, moisture_count
+                FROM rainfall_yearly
+                WHERE {year_where.format("period_start")}
+            )
+        """, day_params + month_params + year_params).fetchone()
+
+        days_n, rain_mm, rain_days, watering_days, m_min, m_max, m_mean = row
+        return RainfallRollup(start, end, int(days_n), rain_mm, int(rain_days),
+                              int(watering_days), m_min, m_max, m_mean)
+
+
+# ------------------------------------------------------------
+# Bulk writes
+# ------------------------------------------------------------
+def rebuild_rollups(conn, start: Optional[str] = None, end: Optional[str] = None):
+    """
+    Recompute every rollup bucket overlapping the ISO dates start..end
+    (None = unbounded) with one grouped pass per table. Runs in the
+    caller's transaction.
+    """
+    for table, first_expr, last_offset in _DAILY_BUCKETS:
+        lo = hi = day_lo = day_hi = "1"
+        params = []
+        if start is not None:
+            lo = f"period_start >= {first_expr.format('?')}"
+            day_lo = f"date >= {first_expr.format('?')}"
+            params.append(start)
+        if end is not None:
+            hi = "period_start <= ?"
+            day_hi = f"date <= date({first_expr.format('?')}, {last_offset})"
+            params.append(end)
+        conn.execute(f"DELETE FROM {table} WHERE {lo} AND {hi}", params)
+        conn.execute(f"""
+            INSERT INTO {table}
+            SELECT {first_expr.format('date')} AS period, {_DAILY_AGGREGATES}
+            FROM rainfall
+            WHERE {day_lo} AND {day_hi} AND period IS NOT NULL
+            GROUP BY period
+        """, params)
+
+    # Years from their (already rebuilt) months
+    lo, hi, params = "1", "1", []
+    if start is not None:
+        lo = "period_start >= date(?, 'start of year')"
+        params.append(start)
+    if end is not None:
+        hi = "period_start <= ?"
+        params.append(end)
+    conn.execute(f"DELETE FROM rainfall_yearly WHERE {lo} AND {hi}", params)
+    month_hi = "period_start <= date(?, 'start of year', '+11 months')" if end is not None else "1"
+    conn.execute(f"""
+        INSERT INTO rainfall_yearly
+        SELECT date(period_start, 'start of year') AS period,
+               SUM(days), TOTAL(rain_mm), SUM(rain_days), SUM(watering_days),
+               MIN(moisture_min), MAX(moisture_max), TOTAL(moisture_sum), SUM(moisture_count)
+        FROM rainfall_monthly
+        WHERE {lo} AND {month_hi}
+        GROUP BY period
+    """, params)
+
+
+@contextmanager
+def deferred_rollups(conn, start: Optional[str] = None, end: Optional[str] = None):
+    """
+    Suspend the per-row rollup triggers for a bulk write touching only
+    ISO dates start..end (None = unbounded), then rebuild those buckets
+    in one pass. Use inside the write's transaction, so other
+    connections never see the triggers suspended:
+
+        with conn:
+            with deferred_rollups(conn, lo, hi):
+                conn.executemany(...)
+    """
+    conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, '1')", (DEFER_KEY,))
+    try:
+        yield
+        rebuild_rollups(conn, start, end)
+    finally:
+        conn.execute("DELETE FROM settings WHERE key = ?", (DEFER_KEY,))
@@ -0,0 +1,118 @@
+#---------------------------------------------------------------------
+# NOTES SEARCH
+# Ranked full-text search over rainfall notes and pool test clarity /
+# actions notes, backed by the notes_fts FTS5 table (migration 12).
+#---------------------------------------------------------------------
+
+import re
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+from core.db_connection import get_connection
+from core.migrations import ensure_schema
+
+
+RAINFALL = "rainfall"
+POOL_TEST = "pool_test"
+
+PAGE_SIZE = 50         # hits per search() call; ask for more with offset
+SNIPPET_TOKENS = 12
+
+# Snippet highlight markers: control characters that never appear in
+# typed notes, so the UI can split on them safely.
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class NoteHit(NamedTuple):
+    kind: str             # RAINFALL or POOL_TEST
+    ref_id: int           # rainfall.id or pool_tests.id
+    day: Optional[date]   # rainfall.date or pool_tests.test_date
+    snippet: str          # matches wrapped in MATCH_START / MATCH_END
+    score: float          # bm25, lower is better
+
+
+def build_match_query(text: str) -> str:
+    """
+    An FTS5 MATCH expression for free text typed into the search box:
+    every word must appear, the last one as a prefix (search as you
+    type) once it is two characters long. Words are quoted so FTS5
+    operators and punctuation in the input are taken literally.
+    '' = nothing to search for.
+    """
+    words = _TOKEN.findall(text)
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words]
+    if len(words[-1]) > 1:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def split_snippet(snippet: str):
+    """[(text, is_match), ...] runs of a NoteHit snippet."""
+    runs = []
+    for i, part in enumerate(re.split(f"[{MATCH_START}{MATCH_END}]", snippet)):
+        if part:
+            runs.append((part, i % 2 == 1))
+    return runs
+
+
+class NotesSearchDB:
+    """
+    Queries notes_fts. The index is kept in step with rainfall and
+    pool_tests by triggers; its rowid is id * 2 for a rainfall row and
+    id * 2 + 1 for a pool test.
+
+    Every match is ranked with bm25(), so the cost of a query grows with
+    the number of notes it matches (not with notes that do not match);
+    results are paged with `offset`.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        ensure_schema(db_path)
+
+    def _connect(self):
+        return get_connection(self.db_path)
+
+    # Rank and cut in the FTS subquery, then join only the kept hits
+    # back to their tables for the dates.
+    _SEARCH_SQL = f"""
+        SELECT f.rowid, f.score, f.snip, r.date, p.test_date
+        FROM (
+            SELECT rowid,
+                   rank AS score,
+                   snippet(notes_fts, -1, char(2), char(3), '…', {SNIPPET_TOKENS}) AS snip
+            FROM notes_fts
+            WHERE notes_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        ) AS f
+        LEFT JOIN rainfall AS r ON f.rowid % 2 = 0 AND r.id = f.rowid / 2
+        LEFT JOIN pool_tests AS p ON f.rowid % 2 = 1 AND p.id = f.rowid / 2
+        ORDER BY f.score
+    """
+
+    def search(self, text: str, limit: int = PAGE_SIZE, offset: int = 0) -> List[NoteHit]:
+        """Hits offset .. offset + limit for free text, best first."""
+        query = build_match_query(text)
+        if not query:
+            return []
+        hits = []
+        for rowid, score, snip, rain_day, pool_day in self._connect().execute(
+            self._SEARCH_SQL, (query, limit, offset)
+        ):
+            if rowid % 2 == 0:
+                kind, day = RAINFALL, rain_day
+            else:
+                kind, day = POOL_TEST, pool_day
+            hits.append(NoteHit(kind, rowid // 2, date.fromisoformat(day) if day else None,
+                                snip, score))
+        return hits
+
+    def count(self) -> int:
+        """Number of indexed rows (rainfall days and pool tests with notes)."""
+        return self._connect().execute("SELECT COUNT(*) FROM notes_fts").fetchone()[0]
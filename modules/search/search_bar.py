@@ -0,0 +1,189 @@
+#---------------------------------------------------------------------
+# SEARCH BAR
+# Search-as-you-type box over all notes, with a ranked hit list that
+# highlights the matched words. Picking a hit hands it to on_open.
+#---------------------------------------------------------------------
+
+from typing import Callable, List, Optional
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from core.db_worker import TkBridge, get_executor
+
+from .notes_search import PAGE_SIZE, RAINFALL, NoteHit, NotesSearchDB, split_snippet
+
+
+DEBOUNCE_MS = 150
+RESULT_LINES = 8
+
+KIND_LABELS = {RAINFALL: "Rainfall", "pool_test": "Pool test"}
+MATCH_BACKGROUND = "#FFF59D"   # pale yellow
+ACTIVE_BACKGROUND = "#DDEEFF"
+
+
+class SearchBar(ttk.Frame):
+    """
+    Entry plus a hit list that is shown while there is text to search.
+    Queries run on the DB reader threads; only the newest query's
+    results are shown. Hits come a page at a time, best first; click
+    "More results…" (or arrow past the last hit) for the next page.
+    Click a hit, or use Up/Down and Return, to open it.
+    """
+
+    def __init__(self, parent, db_path: str, on_open: Callable[[NoteHit], None]):
+        super().__init__(parent)
+
+        self.db_path = db_path
+        self.on_open = on_open
+        self.hits: List[NoteHit] = []
+        self._text = ""           # text the shown hits are for
+        self._has_more = False    # the last page was full
+        self._active = 0
+        self._query_id = 0
+        self._after_id = None
+        self._db: Optional[NotesSearchDB] = None   # created on first search
+
+        self.bridge = TkBridge(self, on_error=self._on_db_error)
+        self._build_ui()
+
+    def destroy(self):
+        self.bridge.cancel()
+        super().destroy()
+
+    def _on_db_error(self, exc):
+        messagebox.showerror("Search error", str(exc))
+
+    # ------------------------------------------------------------
+    # UI Layout
+    # ------------------------------------------------------------
+    def _build_ui(self):
+        bar = ttk.Frame(self)
+        bar.pack(fill="x")
+
+        ttk.Label(bar, text="Search notes:").pack(side="left")
+        self.query = tk.StringVar()
+        self.entry = ttk.Entry(bar, textvariable=self.query, width=50)
+        self.entry.pack(side="left", padx=5)
+        self.status = ttk.Label(bar, foreground="#808080")
+        self.status.pack(side="left")
+
+        self.results = tk.Text(self, height=RESULT_LINES, wrap="none", cursor="arrow",
+                               relief="solid", borderwidth=1)
+        self.results.tag_configure("meta", foreground="#808080")
+        self.results.tag_configure("match", background=MATCH_BACKGROUND)
+        self.results.tag_configure("active", background=ACTIVE_BACKGROUND)
+        self.results.tag_configure("more", foreground="#1E90FF", underline=True)
+        self.results.tag_raise("match")
+        self.results.bind("<Button-1>", self._on_click)
+        self.results.configure(state="disabled")
+
+        self.query.trace_add("write", lambda *_: self._schedule())
+        self.entry.bind("<Return>", lambda e: self._open_active())
+        self.entry.bind("<Down>", lambda e: self._move(1))
+        self.entry.bind("<Up>", lambda e: self._move(-1))
+        self.entry.bind("<Escape>", lambda e: self.query.set(""))
+
+    # ------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------
+    def _schedule(self):
+        """Debounce typing: search DEBOUNCE_MS after the last keystroke."""
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(DEBOUNCE_MS, self._search)
+
+    def _search(self):
+        self._after_id = None
+        self._query_id += 1
+        self._text = self.query.get()
+        if not self._text.strip():
+            self._show_hits([], self._query_id, 0)
+            return
+        self._fetch(0)
+
+    def _fetch(self, offset: int):
+        """Request the page of hits for the current text starting at `offset`."""
+        if self._db is None:
+            self._db = NotesSearchDB(self.db_path)
+        query_id = self._query_id
+        self.bridge.deliver(
+            get_executor(self.db_path).submit_read(self._db.search, self._text,
+                                                   PAGE_SIZE, offset),
+            lambda hits: self._show_hits(hits, query_id, offset),
+        )
+
+    def _more(self):
+        if self._has_more and not self.bridge.busy:
+            self._fetch(len(self.hits))
+
+    # ------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------
+    def _show_hits(self, hits: List[NoteHit], query_id: int, offset: int):
+        if query_id != self._query_id:
+            return   # superseded by a newer query
+        if offset == 0:
+            self.hits = []
+            self._active = 0
+        self.hits.extend(hits)
+        self._has_more = len(hits) == PAGE_SIZE
+
+        text = self.results
+        text.configure(state="normal")
+        text.delete("1.0", "end")
+        for i, hit in enumerate(self.hits):
+            if i:
+                text.insert("end", "\n")
+            day = hit.day.strftime("%d/%m/%Y") if hit.day else "?"
+            text.insert("end", f"{KIND_LABELS[hit.kind]:<10} {day}   ", "meta")
+            for run, is_match in split_snippet(hit.snippet.replace("\n", " ")):
+                text.insert("end", run, "match" if is_match else ())
+        if self._has_more:
+            text.insert("end", "\nMore results…", "more")
+        text.configure(state="disabled")
+        self._highlight_active()
+
+        if not self.query.get().strip():
+            self.status.configure(text="")
+            self.results.pack_forget()
+            return
+        count = len(self.hits)
+        if not count:
+            self.status.configure(text="No matches")
+        else:
+            self.status.configure(text=f"{count}{'+' if self._has_more else ''} "
+                                       f"hit{'s' if count != 1 else ''}")
+        if count:
+            self.results.pack(fill="x", pady=(5, 0))
+        else:
+            self.results.pack_forget()
+
+    def _highlight_active(self):
+        self.results.tag_remove("active", "1.0", "end")
+        if self.hits:
+            line = self._active + 1
+            self.results.tag_add("active", f"{line}.0", f"{line}.end")
+            self.results.see(f"{line}.0")
+
+    def _move(self, step: int):
+        if self.hits:
+            if self._active + step >= len(self.hits):
+                self._more()   # arrowing past the last hit loads the next page
+            self._active = max(0, min(len(self.hits) - 1, self._active + step))
+            self._highlight_active()
+        return "break"
+
+    def _on_click(self, event):
+        line = int(self.results.index(f"@{event.x},{event.y}").split(".")[0])
+        if line == len(self.hits) + 1:
+            self._more()
+        elif 1 <= line <= len(self.hits):
+            self._active = line - 1
+            self._highlight_active()
+            self._open_active()
+        return "break"
+
+    def _open_active(self):
+        if self.hits:
+            self.on_open(self.hits[self._active])
@@ -0,0 +1,112 @@
+"""
+Compare per-call latency of the shared connection layer against the old
+connect-per-call pattern.
+
+Runs against a throwaway database in a temp directory, so it never touches
+home_maintenance.db.
+
+    python scripts/benchmark_db_connections.py [calls]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.db_connection import close_all  # noqa: E402
+from core.settings_db import SettingsDB  # noqa: E402
+from modules.rainfall.rainfall_db import RainfallDB, RainfallRecord  # noqa: E402
+
+
+UPSERT_SQL = """
+    INSERT INTO rainfall (date, rain_mm, bom_mm, notes, watered, moisture)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(date) DO UPDATE SET
+        rain_mm=excluded.rain_mm,
+        bom_mm=excluded.bom_mm,
+        notes=excluded.notes,
+        watered=excluded.watered,
+        moisture=excluded.moisture
+"""
+
+
+# ------------------------------------------------------------
+# Old pattern: open, run one statement, commit, close
+# ------------------------------------------------------------
+def legacy_upsert(db_path, d):
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    cur.execute(UPSERT_SQL, (d.isoformat(), 1.0, None, "", "No", 5.0))
+    conn.commit()
+    conn.close()
+
+
+def legacy_get_setting(db_path, key):
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    cur.execute("SELECT value FROM settings WHERE key=?", (key,))
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+# ------------------------------------------------------------
+# Timing helpers
+# ------------------------------------------------------------
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def report(name, legacy_us, shared_us):
+    speedup = legacy_us / shared_us if shared_us else float("inf")
+    print(f"{name:22} legacy {legacy_us:9.1f} us   shared {shared_us:9.1f} us   x{speedup:.1f}")
+
+
+def main() -> int:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    start_day = date(2000, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        shared_path = os.path.join(tmp, "shared.db")
+
+        # Same schema in both files; only the legacy one stays in rollback-journal mode.
+        RainfallDB(legacy_path)
+        SettingsDB(legacy_path).set("threshold_mm", 10.0)
+        close_all()
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+
+        rain_db = RainfallDB(shared_path)
+        settings_db = SettingsDB(shared_path)
+        settings_db.set("threshold_mm", 10.0)
+
+        print(f"{calls} calls per case\n")
+
+        legacy = per_call_us(lambda i: legacy_upsert(legacy_path, start_day + timedelta(days=i)), calls)
+        shared = per_call_us(
+            lambda i: rain_db.upsert_by_date(
+                RainfallRecord(start_day + timedelta(days=i), 1.0, None, "", "No", 5.0)
+            ),
+            calls,
+        )
+        report("rainfall upsert", legacy, shared)
+
+        legacy = per_call_us(lambda i: legacy_get_setting(legacy_path, "threshold_mm"), calls)
+        shared = per_call_us(lambda i: settings_db.get("threshold_mm"), calls)
+        report("settings get", legacy, shared)
+
+        close_all()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
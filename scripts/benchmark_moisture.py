@@ -0,0 +1,116 @@
+"""
+Benchmark the batched moisture kernel against the original per-day path
+(one method call per day, settings re-read and re-cast on every call), and
+check the two agree to the stored two decimals on every day.
+
+    python scripts/benchmark_moisture.py [sizes...]
+"""
+import math
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.rainfall.moisture import MoistureEngine  # noqa: E402
+
+
+SETTINGS = {"threshold_mm": 10.0, "period_days": 5}
+NAN = float("nan")
+
+
+# ------------------------------------------------------------
+# Original per-day model (as RainFallTab used to run it)
+# ------------------------------------------------------------
+def legacy_delta(settings, eff_rain, watered_flag):
+    try:
+        threshold = float(settings.get("threshold_mm", 20.0))
+    except ValueError:
+        threshold = 20.0
+
+    try:
+        period_days = int(settings.get("period_days", 5))
+        if period_days <= 0:
+            period_days = 5
+    except ValueError:
+        period_days = 5
+
+    loss = threshold / period_days
+    watering_contribution = threshold if watered_flag == "Yes" else 0
+    rain_contribution = eff_rain if eff_rain is not None else 0
+    return rain_contribution + watering_contribution - loss
+
+
+def legacy_daily(settings, prev_moisture, eff_rain, watered_flag):
+    try:
+        threshold = float(settings.get("threshold_mm", 20.0))
+    except ValueError:
+        threshold = 20.0
+
+    moisture = prev_moisture + legacy_delta(settings, eff_rain, watered_flag)
+    moisture = max(0, moisture)
+    moisture = min(moisture, threshold)
+    return moisture
+
+
+def legacy_series(effs, flags):
+    out = []
+    prev = 0.0
+    for eff, flag in zip(effs, flags):
+        prev = legacy_daily(SETTINGS, prev, eff, flag)
+        out.append(f"{prev:.2f}")
+    return out
+
+
+# ------------------------------------------------------------
+# Synthetic history
+# ------------------------------------------------------------
+def synthetic(n, seed=42):
+    rng = random.Random(seed)
+    eff = array("d")
+    watered = array("b")
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.02:
+            eff.append(NAN)                       # no valid reading
+        elif r < 0.65:
+            eff.append(0.0)
+        else:
+            eff.append(round(rng.expovariate(1 / 6.0), 1))
+        watered.append(1 if rng.random() < 0.08 else 0)
+    return eff, watered
+
+
+def main() -> int:
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    engine = MoistureEngine.from_settings(SETTINGS)
+
+    for n in sizes:
+        eff, watered = synthetic(n)
+        effs = [None if math.isnan(e) else e for e in eff]
+        flags = ["Yes" if w else "No" for w in watered]
+
+        start = time.perf_counter()
+        legacy = legacy_series(effs, flags)
+        legacy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        series = engine.compute(eff, watered)
+        kernel_s = time.perf_counter() - start
+
+        mismatches = sum(1 for a, b in zip(legacy, series) if a != f"{b:.2f}")
+        print(
+            f"{n:>9} days   legacy {legacy_s * 1000:9.1f} ms   "
+            f"kernel {kernel_s * 1000:9.1f} ms   x{legacy_s / kernel_s:5.1f}   "
+            f"mismatches {mismatches}"
+        )
+        if mismatches:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
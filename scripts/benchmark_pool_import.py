@@ -0,0 +1,136 @@
+"""
+Benchmark the streaming pool test importer against the original
+migration loop (full load_workbook + one execute per row + single commit)
+on synthetic Swimming_Pool_Manager workbooks, using throwaway databases
+in a temp dir.
+
+    python scripts/benchmark_pool_import.py [rows...] [--no-legacy] [--memory]
+
+--memory reruns each import under tracemalloc and reports peak Python
+memory (slower, so it is timed separately).
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import pool_test_rows, write_pool_workbook  # noqa: E402
+from core.db_connection import close_all  # noqa: E402
+from core.migrations import ensure_schema  # noqa: E402
+from modules.pool.pool_import import SHEET_NAME, PoolWorkbookImporter  # noqa: E402
+
+
+DATE_FMT = "%Y-%m-%d"
+
+
+# ------------------------------------------------------------
+# Original migration loop
+# ------------------------------------------------------------
+def legacy_import(db_path, xlsx_path):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(xlsx_path, data_only=True)
+    ws = wb[SHEET_NAME]
+
+    def parse_float(val):
+        if val is None:
+            return None
+        try:
+            return float(val)
+        except Exception:
+            return None
+
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    for row in ws.iter_rows(min_row=2, values_only=True):
+        if all(v is None for v in row):
+            continue
+        (date_val, fc, cc, tc, salt, alk, ph, sun, hard, phos, copper,
+         clarity, actions, next_test) = row[:14]
+        test_date = date_val.strftime(DATE_FMT)
+        try:
+            next_test_date = next_test.strftime(DATE_FMT)
+        except Exception:
+            next_test_date = test_date
+        cur.execute("""
+            INSERT INTO pool_tests (
+                test_date, free_chlorine, combined_chlorine, total_chlorine,
+                salt_level, alkalinity, ph, sunscreen, hardness, phosphates,
+                copper, clarity_notes, actions_taken, next_test_date
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            test_date, parse_float(fc), parse_float(cc), parse_float(tc),
+            parse_float(salt), parse_float(alk), parse_float(ph), parse_float(sun),
+            parse_float(hard), parse_float(phos), parse_float(copper),
+            clarity or "", actions or "", next_test_date,
+        ))
+    conn.commit()
+    conn.close()
+
+
+def _fresh_db(tmp, name):
+    path = os.path.join(tmp, name)
+    ensure_schema(path)
+    close_all()
+    return path
+
+
+def _peak_mb(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> int:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    run_legacy = "--no-legacy" not in sys.argv
+    memory = "--memory" in sys.argv
+    sizes = [int(a) for a in args] or [20_000, 100_000]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            xlsx_path = os.path.join(tmp, f"pool_{n}.xlsx")
+            write_pool_workbook(xlsx_path, pool_test_rows(n), SHEET_NAME)
+            mb = os.path.getsize(xlsx_path) / 1e6
+            line = f"{n:>8} rows ({mb:5.1f} MB)"
+
+            if run_legacy:
+                db = _fresh_db(tmp, f"legacy_{n}.db")
+                start = time.perf_counter()
+                legacy_import(db, xlsx_path)
+                legacy_s = time.perf_counter() - start
+                line += f"   legacy {legacy_s:7.2f} s"
+                if memory:
+                    db = _fresh_db(tmp, f"legacy_mem_{n}.db")
+                    line += f" (peak {_peak_mb(lambda: legacy_import(db, xlsx_path)):6.1f} MB)"
+
+            db = _fresh_db(tmp, f"import_{n}.db")
+            start = time.perf_counter()
+            result = PoolWorkbookImporter(db).import_workbook(xlsx_path)
+            import_s = time.perf_counter() - start
+            line += f"   importer {import_s:7.2f} s"
+            if memory:
+                db_mem = _fresh_db(tmp, f"import_mem_{n}.db")
+                line += f" (peak {_peak_mb(lambda: PoolWorkbookImporter(db_mem).import_workbook(xlsx_path)):6.1f} MB)"
+            if run_legacy:
+                line += f"   x{legacy_s / import_s:4.1f}"
+            print(line)
+            close_all()
+
+            if result.inserted != n or result.skipped:
+                print(f"  unexpected result: {result.inserted} inserted, {result.skipped} skipped")
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
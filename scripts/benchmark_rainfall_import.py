@@ -0,0 +1,124 @@
+"""
+Benchmark the streaming rainfall importer against the original per-row
+migration loop (DictReader + one execute per row + single commit) on
+synthetic rain_data.csv files, using throwaway databases in a temp dir.
+
+    python scripts/benchmark_rainfall_import.py [rows...] [--no-legacy]
+"""
+import csv
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.db_connection import close_all  # noqa: E402
+from modules.rainfall.rainfall_db import RainfallDB  # noqa: E402
+from modules.rainfall.rainfall_import import RainfallImporter  # noqa: E402
+
+
+START = date(1, 1, 1).toordinal()  # 3M days still ends before 9999
+
+
+def write_csv(path, n, seed=42):
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Date", "Rain_mm", "BOM_mm", "Notes", "Watered", "Moisture"])
+        for i in range(n):
+            r = rng.random()
+            rain = "" if r < 0.05 else ("0" if r < 0.65 else f"{rng.expovariate(1 / 6.0):.1f}")
+            bom = f"{rng.expovariate(1 / 6.0):.1f}" if rng.random() < 0.3 else ""
+            w.writerow([
+                date.fromordinal(START + i).isoformat(),
+                rain,
+                bom,
+                "synthetic" if rng.random() < 0.01 else "",
+                "Yes" if rng.random() < 0.08 else "No",
+                "",
+            ])
+
+
+# ------------------------------------------------------------
+# Original migration loop
+# ------------------------------------------------------------
+def legacy_import(db_path, csv_path):
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            d_obj = datetime.strptime(row.get("Date", "").strip(), "%Y-%m-%d").date()
+
+            def parse_float(val):
+                try:
+                    if val.strip() == "":
+                        return None
+                    return float(val)
+                except Exception:
+                    return None
+
+            cur.execute("""
+                INSERT INTO rainfall (date, rain_mm, bom_mm, notes, watered, moisture)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(date) DO UPDATE SET
+                    rain_mm=excluded.rain_mm,
+                    bom_mm=excluded.bom_mm,
+                    notes=excluded.notes,
+                    watered=excluded.watered,
+                    moisture=excluded.moisture
+            """, (
+                d_obj.isoformat(),
+                parse_float(row.get("Rain_mm", "")),
+                parse_float(row.get("BOM_mm", "")),
+                row.get("Notes", ""),
+                "Yes" if row.get("Watered", "No") == "Yes" else "No",
+                parse_float(row.get("Moisture", "")),
+            ))
+    conn.commit()
+    conn.close()
+
+
+def main() -> int:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    run_legacy = "--no-legacy" not in sys.argv
+    sizes = [int(a) for a in args] or [1_000_000, 3_000_000]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            csv_path = os.path.join(tmp, f"rain_{n}.csv")
+            write_csv(csv_path, n)
+            mb = os.path.getsize(csv_path) / 1e6
+
+            line = f"{n:>9} rows ({mb:6.1f} MB)"
+            if run_legacy:
+                legacy_db = os.path.join(tmp, f"legacy_{n}.db")
+                RainfallDB(legacy_db)
+                close_all()
+                start = time.perf_counter()
+                legacy_import(legacy_db, csv_path)
+                legacy_s = time.perf_counter() - start
+                line += f"   legacy {legacy_s:7.2f} s ({n / legacy_s:9.0f} rows/s)"
+
+            db_path = os.path.join(tmp, f"import_{n}.db")
+            start = time.perf_counter()
+            result = RainfallImporter(db_path).run(csv_path)
+            import_s = time.perf_counter() - start
+            line += f"   importer {import_s:7.2f} s ({n / import_s:9.0f} rows/s)"
+            if run_legacy:
+                line += f"   x{legacy_s / import_s:4.1f}"
+            print(line + " (importer includes moisture recompute)")
+            close_all()
+
+            if result.upserted != n or result.skipped:
+                print(f"  unexpected result: {result.upserted} upserted, {result.skipped} skipped")
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
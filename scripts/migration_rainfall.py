@@ -1,10 +1,15 @@
-import csv
 import json
 import os
 import sqlite3
+import sys
 from datetime import datetime
 
-DATE_FMT = "%Y-%m-%d"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.db_connection import get_connection  # noqa: E402
+from core.migrations import ensure_schema  # noqa: E402
+from modules.rainfall.rainfall_import import RainfallImporter  # noqa: E402
+
 
 DB_PATH = "home_maintenance.db"
 SETTINGS_JSON = "settings.json"
@@ -15,48 +20,7 @@ DEFAULT_RAIN_CSV = r"E:\OneDrive\MyApps\Rainfall_Logger\rain_data.csv"
 # Ensure tables exist
 # ------------------------------------------------------------
 def ensure_tables():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-
-    # Rainfall table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS rainfall (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        date TEXT NOT NULL,
-        rain_mm REAL,
-        bom_mm REAL,
-        notes TEXT,
-        watered TEXT NOT NULL DEFAULT 'No',
-        moisture REAL
-    )
-    """)
-
-    cur.execute("""
-        UPDATE rainfall
-        SET watered='No'
-        WHERE watered IS NULL OR watered NOT IN ('Yes', 'No')
-    """)
-    cur.execute("""
-        DELETE FROM rainfall
-        WHERE id NOT IN (
-            SELECT MAX(id) FROM rainfall GROUP BY date
-        )
-    """)
-    cur.execute("""
-        CREATE UNIQUE INDEX IF NOT EXISTS ux_rainfall_date
-        ON rainfall(date)
-    """)
-
-    # Settings table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS settings (
-        key TEXT PRIMARY KEY,
-        value TEXT
-    )
-    """)
-
-    conn.commit()
-    conn.close()
+    ensure_schema(DB_PATH)
 
 
 # ------------------------------------------------------------
@@ -108,79 +72,34 @@ def migrate_rainfall(csv_path: str):
         print(f"CSV file not found: {csv_path} — skipping rainfall migration.")
         return
 
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-
-    upserted = 0
-    skipped = 0
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-
-        for row in reader:
-            d_str = row.get("Date", "").strip()
-            try:
-                d_obj = datetime.strptime(d_str, DATE_FMT).date()
-            except Exception:
-                print(f"Skipping invalid date row: {row}")
-                skipped += 1
-                continue
-
-            # Parse numeric fields safely
-            def parse_float(val):
-                try:
-                    if val.strip() == "":
-                        return None
-                    return float(val)
-                except Exception:
-                    return None
-
-            rain_val = parse_float(row.get("Rain_mm", ""))
-            bom_val = parse_float(row.get("BOM_mm", ""))
-            moisture_val = parse_float(row.get("Moisture", ""))
-
-            notes = row.get("Notes", "")
-            watered = "Yes" if row.get("Watered", "No") == "Yes" else "No"
-
-            cur.execute("""
-                INSERT INTO rainfall (date, rain_mm, bom_mm, notes, watered, moisture)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(date) DO UPDATE SET
-                    rain_mm=excluded.rain_mm,
-                    bom_mm=excluded.bom_mm,
-                    notes=excluded.notes,
-                    watered=excluded.watered,
-                    moisture=excluded.moisture
-            """, (
-                d_obj.isoformat(),
-                rain_val,
-                bom_val,
-                notes,
-                watered,
-                moisture_val,
-            ))
-            upserted += 1
+    def report(progress):
+        print(f"  {progress.rows_read} rows read, {progress.upserted} upserted...", end="\r")
 
-    migrated_at = datetime.now().isoformat(timespec="seconds")
-    cur.execute("""
-        INSERT INTO settings (key, value)
-        VALUES (?, ?)
-        ON CONFLICT(key) DO UPDATE SET value=excluded.value
-    """, ("rainfall_migration_source_csv", csv_path))
-    cur.execute("""
-        INSERT INTO settings (key, value)
-        VALUES (?, ?)
-        ON CONFLICT(key) DO UPDATE SET value=excluded.value
-    """, ("rainfall_migrated_at", migrated_at))
-    cur.execute("""
-        INSERT INTO settings (key, value)
-        VALUES (?, ?)
-        ON CONFLICT(key) DO UPDATE SET value=excluded.value
-    """, ("rainfall_migration_version", "2"))
+    importer = RainfallImporter(DB_PATH, progress=report)
+    result = importer.run(csv_path)
+    print()
 
-    conn.commit()
-    conn.close()
+    if result.resumed_from:
+        print(f"Resumed after row {result.resumed_from} of an interrupted import.")
+    for err in result.errors:
+        print(f"Skipping line {err.line}: {err.message}")
 
-    print(f"Rainfall records upserted: {upserted}. Skipped: {skipped}.")
+    migrated_at = datetime.now().isoformat(timespec="seconds")
+    with get_connection(DB_PATH) as conn:
+        conn.executemany("""
+            INSERT INTO settings (key, value)
+            VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value=excluded.value
+        """, [
+            ("rainfall_migration_source_csv", csv_path),
+            ("rainfall_migrated_at", migrated_at),
+            ("rainfall_migration_version", "3"),
+        ])
+
+    print(
+        f"Rainfall records upserted: {result.upserted}. Skipped: {result.skipped}. "
+        f"Moisture recomputed for {result.moisture_updated} days."
+    )
 
 
 def prompt_rainfall_csv_path() -> str: